@@ -3,8 +3,24 @@
 This package provides an MCP (Model Context Protocol) server for Google Drive
 integration, allowing AI assistants to search, read, and write Google Drive files.
 """
-from .client import GDriveClient
-from .auth import get_creds
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .client import GDriveClient
+    from .auth import get_creds
 
 __version__ = "0.2.0"
 __all__ = ["GDriveClient", "get_creds"]
+
+
+def __getattr__(name: str) -> Any:
+    """Import the public API on first access to keep package import cheap."""
+    if name == "GDriveClient":
+        from .client import GDriveClient
+
+        return GDriveClient
+    if name == "get_creds":
+        from .auth import get_creds
+
+        return get_creds
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
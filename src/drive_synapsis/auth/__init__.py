@@ -10,13 +10,19 @@ This package provides a production-grade OAuth 2.1 implementation with:
 
 from .scopes import SCOPES, DRIVE_SCOPES, DOCS_SCOPES, SHEETS_SCOPES
 from .credential_store import get_credential_store, CredentialStore
-from .oauth21_session_store import get_oauth21_session_store, OAuth21SessionStore
+from .oauth21_session_store import (
+    get_oauth21_session_store,
+    reset_oauth21_session_store,
+    OAuth21SessionStore,
+)
 from .google_auth import (
     get_credentials,
     get_creds,
     start_auth_flow,
     handle_auth_callback,
     check_client_secrets,
+    get_discovery_doc,
+    refresh_credentials,
     GoogleAuthenticationError,
 )
 
@@ -31,6 +37,7 @@ __all__ = [
     "CredentialStore",
     # Session Store
     "get_oauth21_session_store",
+    "reset_oauth21_session_store",
     "OAuth21SessionStore",
     # Auth Functions
     "get_credentials",
@@ -38,5 +45,7 @@ __all__ = [
     "start_auth_flow",
     "handle_auth_callback",
     "check_client_secrets",
+    "get_discovery_doc",
+    "refresh_credentials",
     "GoogleAuthenticationError",
 ]
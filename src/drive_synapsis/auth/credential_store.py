@@ -9,13 +9,90 @@ import os
 import json
 import logging
 import base64
+import binascii
+import functools
+import operator
+import tempfile
+import threading
+import orjson
 from abc import ABC, abstractmethod
-from typing import Optional, List
+from typing import Dict, Optional, List, Tuple
 from datetime import datetime
 from google.oauth2.credentials import Credentials
 
 logger = logging.getLogger(__name__)
 
+# Fields persisted verbatim and passed straight to the Credentials constructor
+_CREDENTIAL_FIELDS = (
+    "token",
+    "refresh_token",
+    "token_uri",
+    "client_id",
+    "client_secret",
+    "scopes",
+)
+# Reads the persisted fields plus expiry off a Credentials object in one call
+_get_credential_attrs = operator.attrgetter(*_CREDENTIAL_FIELDS, "expiry")
+
+
+@functools.lru_cache(maxsize=256)
+def _email_to_filename(user_email: str) -> str:
+    """
+    Convert email to a safe filename using hex encoding.
+
+    This ensures the transformation is reversible for any email address,
+    including those with underscores (e.g., john_doe@example.com).
+    """
+    return binascii.hexlify(user_email.encode("utf-8")).decode("ascii")
+
+
+@functools.lru_cache(maxsize=256)
+def _filename_to_email(filename: str) -> str:
+    """
+    Convert a filename back to the original email address.
+
+    Reverses the hex encoding from _email_to_filename.
+    """
+    return binascii.unhexlify(filename.encode("ascii")).decode("utf-8")
+
+
+def _legacy_filename_to_email(filename: str) -> str:
+    """
+    Decode a filename written by older versions using unpadded URL-safe base64.
+    """
+    padding = 4 - (len(filename) % 4)
+    if padding != 4:
+        filename += "=" * padding
+    return base64.urlsafe_b64decode(filename.encode("ascii")).decode("utf-8")
+
+
+def _parse_expiry(value: str) -> datetime:
+    """
+    Parse a stored expiry timestamp into a timezone-naive datetime.
+
+    Timestamps written by store_credential have the fixed layout
+    YYYY-MM-DDTHH:MM:SS[.ffffff], which is sliced directly. Anything else
+    goes through datetime.fromisoformat.
+    """
+    if value[10:11] == "T" and (
+        len(value) == 19 or (len(value) == 26 and value[19] == ".")
+    ):
+        return datetime(
+            int(value[0:4]),
+            int(value[5:7]),
+            int(value[8:10]),
+            int(value[11:13]),
+            int(value[14:16]),
+            int(value[17:19]),
+            int(value[20:26]) if len(value) == 26 else 0,
+        )
+
+    expiry = datetime.fromisoformat(value)
+    # Ensure timezone-naive datetime for Google auth library
+    if expiry.tzinfo is not None:
+        expiry = expiry.replace(tzinfo=None)
+    return expiry
+
 
 class CredentialStore(ABC):
     """Abstract base class for credential storage."""
@@ -63,146 +140,186 @@ class LocalDirectoryCredentialStore(CredentialStore):
                 )
 
         self.base_dir = base_dir
+        # Directory prefix with trailing separator for building file paths
+        self._prefix = os.path.join(base_dir, "")
+        # user_email -> (file mtime_ns, credentials) for warm lookups
+        self._cache: Dict[str, Tuple[int, Credentials]] = {}
+        self._cache_lock = threading.RLock()
         self._ensure_dir_exists()
-        logger.info(f"LocalDirectoryCredentialStore initialized: {base_dir}")
+        self._migrate_legacy_filenames()
+        logger.info("LocalDirectoryCredentialStore initialized: %s", base_dir)
 
     def _ensure_dir_exists(self) -> None:
         """Ensure the credentials directory exists."""
         if not os.path.exists(self.base_dir):
             os.makedirs(self.base_dir, exist_ok=True)
-            logger.info(f"Created credentials directory: {self.base_dir}")
-
-    def _email_to_filename(self, user_email: str) -> str:
-        """
-        Convert email to a safe filename using URL-safe base64 encoding.
-
-        This ensures the transformation is reversible for any email address,
-        including those with underscores (e.g., john_doe@example.com).
-        """
-        encoded = base64.urlsafe_b64encode(user_email.encode("utf-8")).decode("ascii")
-        # Remove padding for cleaner filenames
-        return encoded.rstrip("=")
-
-    def _filename_to_email(self, filename: str) -> str:
-        """
-        Convert a filename back to the original email address.
+            logger.info("Created credentials directory: %s", self.base_dir)
 
-        Reverses the URL-safe base64 encoding from _email_to_filename.
-        """
-        # Add back padding if needed
-        padding = 4 - (len(filename) % 4)
-        if padding != 4:
-            filename += "=" * padding
-        return base64.urlsafe_b64decode(filename.encode("ascii")).decode("utf-8")
+    def _migrate_legacy_filenames(self) -> None:
+        """Rename credential files from the old base64 naming to hex names."""
+        try:
+            with os.scandir(self.base_dir) as entries:
+                candidates = [
+                    entry
+                    for entry in entries
+                    if entry.name.endswith(".json") and entry.is_file()
+                ]
+        except OSError as e:
+            logger.error("Error scanning credential files for migration: %s", e)
+            return
+
+        for entry in candidates:
+            encoded_part = entry.name[:-5]
+            try:
+                if "@" in _filename_to_email(encoded_part):
+                    continue
+            except (ValueError, UnicodeDecodeError):
+                pass
+
+            try:
+                user_email = _legacy_filename_to_email(encoded_part)
+            except (ValueError, UnicodeDecodeError):
+                continue
+            if "@" not in user_email:
+                continue
+
+            target_path = self._get_credential_path(user_email)
+            try:
+                if os.path.exists(target_path):
+                    continue
+                os.replace(entry.path, target_path)
+                logger.info("Migrated credential file for %s", user_email)
+            except OSError as e:
+                logger.error("Error migrating credential file %s: %s", entry.name, e)
 
     def _get_credential_path(self, user_email: str) -> str:
         """Get the file path for a user's credentials."""
-        self._ensure_dir_exists()
-        safe_email = self._email_to_filename(user_email)
-        return os.path.join(self.base_dir, f"{safe_email}.json")
+        return f"{self._prefix}{_email_to_filename(user_email)}.json"
 
     def get_credential(self, user_email: str) -> Optional[Credentials]:
         """Get credentials from local JSON file."""
         creds_path = self._get_credential_path(user_email)
 
-        if not os.path.exists(creds_path):
-            logger.debug(f"No credential file found for {user_email}")
-            return None
-
         try:
-            with open(creds_path, "r") as f:
-                creds_data = json.load(f)
+            mtime_ns = os.stat(creds_path).st_mtime_ns
+            with self._cache_lock:
+                cached = self._cache.get(user_email)
+                if cached is not None and cached[0] == mtime_ns:
+                    return cached[1]
+
+            with open(creds_path, "rb") as f:
+                creds_data = orjson.loads(f.read())
 
             # Parse expiry if present
             expiry = None
             if creds_data.get("expiry"):
                 try:
-                    expiry = datetime.fromisoformat(creds_data["expiry"])
-                    # Ensure timezone-naive datetime for Google auth library
-                    if expiry.tzinfo is not None:
-                        expiry = expiry.replace(tzinfo=None)
+                    expiry = _parse_expiry(creds_data["expiry"])
                 except (ValueError, TypeError) as e:
-                    logger.warning(f"Could not parse expiry for {user_email}: {e}")
+                    logger.warning("Could not parse expiry for %s: %s", user_email, e)
 
+            get = creds_data.get
             credentials = Credentials(
-                token=creds_data.get("token"),
-                refresh_token=creds_data.get("refresh_token"),
-                token_uri=creds_data.get("token_uri"),
-                client_id=creds_data.get("client_id"),
-                client_secret=creds_data.get("client_secret"),
-                scopes=creds_data.get("scopes"),
+                **{field: get(field) for field in _CREDENTIAL_FIELDS},
                 expiry=expiry,
             )
 
-            logger.debug(f"Loaded credentials for {user_email}")
+            with self._cache_lock:
+                self._cache[user_email] = (mtime_ns, credentials)
+
+            logger.debug("Loaded credentials for %s", user_email)
             return credentials
 
-        except (IOError, json.JSONDecodeError, KeyError) as e:
-            logger.error(f"Error loading credentials for {user_email}: {e}")
+        except FileNotFoundError:
+            logger.debug("No credential file found for %s", user_email)
+            return None
+        except (IOError, json.JSONDecodeError, orjson.JSONDecodeError, KeyError) as e:
+            logger.error("Error loading credentials for %s: %s", user_email, e)
             return None
 
     def store_credential(self, user_email: str, credentials: Credentials) -> bool:
         """Store credentials to local JSON file."""
         creds_path = self._get_credential_path(user_email)
 
-        creds_data = {
-            "token": credentials.token,
-            "refresh_token": credentials.refresh_token,
-            "token_uri": credentials.token_uri,
-            "client_id": credentials.client_id,
-            "client_secret": credentials.client_secret,
-            "scopes": list(credentials.scopes) if credentials.scopes else None,
-            "expiry": credentials.expiry.isoformat() if credentials.expiry else None,
-        }
+        *values, scopes, expiry = _get_credential_attrs(credentials)
+        creds_data = dict(zip(_CREDENTIAL_FIELDS, values))
+        creds_data["scopes"] = list(scopes) if scopes else None
+        creds_data["expiry"] = expiry.isoformat() if expiry else None
+
+        with self._cache_lock:
+            self._cache.pop(user_email, None)
 
         try:
-            with open(creds_path, "w") as f:
-                json.dump(creds_data, f, indent=2)
-            logger.info(f"Stored credentials for {user_email}")
+            self._ensure_dir_exists()
+            payload = orjson.dumps(creds_data)
+            fd, temp_path = tempfile.mkstemp(dir=self.base_dir, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(payload)
+                os.replace(temp_path, creds_path)
+            except Exception:
+                if os.path.exists(temp_path):
+                    os.unlink(temp_path)
+                raise
+            logger.info("Stored credentials for %s", user_email)
             return True
         except IOError as e:
-            logger.error(f"Error storing credentials for {user_email}: {e}")
+            logger.error("Error storing credentials for %s: %s", user_email, e)
             return False
 
     def delete_credential(self, user_email: str) -> bool:
         """Delete credential file for a user."""
         creds_path = self._get_credential_path(user_email)
 
+        with self._cache_lock:
+            self._cache.pop(user_email, None)
+
         try:
-            if os.path.exists(creds_path):
-                os.remove(creds_path)
-                logger.info(f"Deleted credentials for {user_email}")
+            os.remove(creds_path)
+            logger.info("Deleted credentials for %s", user_email)
+            return True
+        except FileNotFoundError:
             return True
         except IOError as e:
-            logger.error(f"Error deleting credentials for {user_email}: {e}")
+            logger.error("Error deleting credentials for %s: %s", user_email, e)
             return False
 
     def list_users(self) -> List[str]:
         """List all users with credential files."""
-        if not os.path.exists(self.base_dir):
-            return []
-
         users = []
         try:
-            for filename in os.listdir(self.base_dir):
-                if filename.endswith(".json"):
+            with os.scandir(self.base_dir) as entries:
+                for entry in entries:
+                    filename = entry.name
+                    if (
+                        filename[0] == "."
+                        or not filename.endswith(".json")
+                        or not entry.is_file()
+                    ):
+                        continue
                     encoded_part = filename[:-5]
                     try:
-                        user_email = self._filename_to_email(encoded_part)
+                        user_email = _filename_to_email(encoded_part)
                         users.append(user_email)
                     except (ValueError, UnicodeDecodeError) as e:
                         logger.warning(
-                            f"Could not decode credential file {filename}: {e}"
+                            "Could not decode credential file %s: %s",
+                            filename,
+                            e,
                         )
-            logger.debug(f"Found {len(users)} users with credentials")
+            logger.debug("Found %d users with credentials", len(users))
+        except FileNotFoundError:
+            return []
         except OSError as e:
-            logger.error(f"Error listing credential files: {e}")
+            logger.error("Error listing credential files: %s", e)
 
-        return sorted(users)
+        users.sort()
+        return users
 
 
 # Global credential store instance
 _credential_store: Optional[CredentialStore] = None
+_credential_store_lock = threading.Lock()
 
 
 def get_credential_store() -> CredentialStore:
@@ -210,8 +327,13 @@ def get_credential_store() -> CredentialStore:
     global _credential_store
 
     if _credential_store is None:
-        _credential_store = LocalDirectoryCredentialStore()
-        logger.info(f"Initialized credential store: {type(_credential_store).__name__}")
+        with _credential_store_lock:
+            if _credential_store is None:
+                _credential_store = LocalDirectoryCredentialStore()
+                logger.info(
+                    "Initialized credential store: %s",
+                    type(_credential_store).__name__,
+                )
 
     return _credential_store
 
@@ -219,5 +341,6 @@ def get_credential_store() -> CredentialStore:
 def set_credential_store(store: CredentialStore) -> None:
     """Set the global credential store instance."""
     global _credential_store
-    _credential_store = store
-    logger.info(f"Set credential store: {type(store).__name__}")
+    with _credential_store_lock:
+        _credential_store = store
+    logger.info("Set credential store: %s", type(store).__name__)
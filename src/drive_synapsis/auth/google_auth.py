@@ -4,25 +4,99 @@ Core Google OAuth Logic for Drive Synapsis.
 This module provides the main OAuth 2.1 authentication flow with PKCE support.
 """
 
-import json
+import functools
 import logging
+import operator
 import os
-from typing import Dict, Any, List, Optional, Tuple, Union
-
+import secrets
+import tempfile
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from urllib.parse import parse_qsl
+
+import orjson
 from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import Flow
 from google.auth.transport.requests import Request
 from google.auth.exceptions import RefreshError
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
+
+if TYPE_CHECKING:
+    from google_auth_oauthlib.flow import Flow
 
 from .scopes import SCOPES, get_scopes
 from .oauth21_session_store import get_oauth21_session_store
-from .credential_store import get_credential_store
-from .oauth_config import get_oauth_config, get_oauth_redirect_uri, get_credentials_dir
+from .credential_store import CredentialStore, get_credential_store
+from .oauth_config import (
+    get_oauth_config,
+    get_oauth_redirect_uri,
+    get_credentials_dir,
+    get_env_secret,
+)
 
 logger = logging.getLogger(__name__)
 
+# (credentials, resolved user email) returned by the get_credentials lookups
+_LookupResult = Tuple[Optional[Credentials], Optional[str]]
+
+# Reads the fields handed to the session store off a Credentials object in one call
+_get_session_fields = operator.attrgetter(
+    "token",
+    "refresh_token",
+    "token_uri",
+    "client_id",
+    "client_secret",
+    "scopes",
+    "expiry",
+)
+
+# Default required scopes, hashed once for the scope check in get_credentials
+_SCOPES_SET = frozenset(SCOPES)
+
+# Valid tokens expiring within this window are refreshed in the background.
+# google-auth already reports tokens as expired REFRESH_THRESHOLD (3m45s)
+# before their expiry, so the window must be wider than that.
+_PREEMPTIVE_REFRESH_WINDOW = timedelta(minutes=10)
+
+_refresh_executor = ThreadPoolExecutor(
+    max_workers=2, thread_name_prefix="drive-synapsis-refresh"
+)
+# user_email -> running background refresh
+_refresh_futures: Dict[str, Future] = {}
+_refresh_futures_lock = threading.Lock()
+# user_email -> lock serialising blocking refreshes of expired credentials
+_refresh_locks: Dict[str, threading.Lock] = {}
+# user_email -> refreshed credentials waiting to be written to disk
+_pending_persists: Dict[str, Credentials] = {}
+_pending_persists_lock = threading.Lock()
+
+# Shared transport for token refreshes, created on first use
+_refresh_request: Optional[Request] = None
+_refresh_request_lock = threading.Lock()
+
+# client secrets path -> (st_mtime_ns, parsed client config section)
+_client_secrets_cache: Dict[str, Tuple[int, Dict[str, Any]]] = {}
+
+# (path, exists, monotonic timestamp) of the last client secrets file check
+_CLIENT_SECRETS_EXISTS_TTL = 30.0
+_client_secrets_exists_cache: Optional[Tuple[str, bool, float]] = None
+
+# (users, monotonic timestamp) of the last credential store listing
+_STORED_USERS_TTL = 5.0
+_stored_users_cache: Optional[Tuple[List[str], float]] = None
+
 
 class GoogleAuthenticationError(Exception):
     """Exception raised when Google authentication is required or fails."""
@@ -32,36 +106,61 @@ class GoogleAuthenticationError(Exception):
         self.auth_url = auth_url
 
 
+# ((client_id, client_secret), config) for the last env credentials seen
+_env_client_config: Optional[Tuple[Tuple[str, str], Dict[str, Any]]] = None
+
+
 def load_client_secrets_from_env() -> Optional[Dict[str, Any]]:
     """
     Load client secrets from environment variables.
 
+    GOOGLE_OAUTH_CLIENT_ID / GOOGLE_OAUTH_CLIENT_SECRET may also be supplied
+    as files via GOOGLE_OAUTH_CLIENT_ID_FILE / GOOGLE_OAUTH_CLIENT_SECRET_FILE.
+    The values are re-read on every call (files only when their mtime
+    changes), so rotated secrets are picked up; the config dict is rebuilt
+    only when they differ from the last call.
+
     Returns:
         Client secrets configuration dict or None if not set.
     """
-    client_id = os.getenv("GOOGLE_OAUTH_CLIENT_ID")
-    client_secret = os.getenv("GOOGLE_OAUTH_CLIENT_SECRET")
-
-    if client_id and client_secret:
-        config = {
-            "web": {
-                "client_id": client_id,
-                "client_secret": client_secret,
-                "auth_uri": "https://accounts.google.com/o/oauth2/auth",
-                "token_uri": "https://oauth2.googleapis.com/token",
-                "auth_provider_x509_cert_url": "https://www.googleapis.com/oauth2/v1/certs",
-            }
+    global _env_client_config
+    client_id = get_env_secret("GOOGLE_OAUTH_CLIENT_ID")
+    client_secret = get_env_secret("GOOGLE_OAUTH_CLIENT_SECRET")
+
+    if not (client_id and client_secret):
+        return None
+
+    key = (client_id, client_secret)
+    cached = _env_client_config
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    config = {
+        "web": {
+            "client_id": client_id,
+            "client_secret": client_secret,
+            "auth_uri": "https://accounts.google.com/o/oauth2/auth",
+            "token_uri": "https://oauth2.googleapis.com/token",
+            "auth_provider_x509_cert_url": "https://www.googleapis.com/oauth2/v1/certs",
         }
-        logger.info("Loaded OAuth credentials from environment variables")
-        return config
+    }
+    _env_client_config = (key, config)
+    logger.info("Loaded OAuth credentials from environment variables")
+    return config
 
-    return None
+
+def _invalidate_env_cache() -> None:
+    """Forget the cached environment client secrets (e.g. in tests)."""
+    global _env_client_config
+    _env_client_config = None
 
 
 def load_client_secrets(client_secrets_path: str) -> Dict[str, Any]:
     """
     Load client secrets from environment variables or file.
 
+    The parsed file is cached until its mtime changes.
+
     Args:
         client_secrets_path: Path to client secrets JSON file (fallback)
 
@@ -79,23 +178,53 @@ def load_client_secrets(client_secrets_path: str) -> Dict[str, Any]:
 
     # Fall back to file
     try:
-        with open(client_secrets_path, "r") as f:
-            client_config = json.load(f)
+        mtime_ns = os.stat(client_secrets_path).st_mtime_ns
+        cached = _client_secrets_cache.get(client_secrets_path)
+        if cached is not None and cached[0] == mtime_ns:
+            return cached[1]
+
+        with open(client_secrets_path, "rb") as f:
+            client_config = orjson.loads(f.read())
 
         if "web" in client_config:
-            logger.info(f"Loaded OAuth credentials from {client_secrets_path}")
-            return client_config["web"]
+            section = client_config["web"]
         elif "installed" in client_config:
-            logger.info(f"Loaded OAuth credentials from {client_secrets_path}")
-            return client_config["installed"]
+            section = client_config["installed"]
         else:
             raise ValueError("Invalid client secrets file format")
 
-    except (IOError, json.JSONDecodeError) as e:
+        _client_secrets_cache[client_secrets_path] = (mtime_ns, section)
+        logger.info(f"Loaded OAuth credentials from {client_secrets_path}")
+        return section
+
+    except (IOError, orjson.JSONDecodeError) as e:
         logger.error(f"Error loading client secrets from {client_secrets_path}: {e}")
         raise
 
 
+def _client_secrets_exists(client_secrets_path: str) -> bool:
+    """
+    Check whether the client secrets file exists.
+
+    The answer is reused for _CLIENT_SECRETS_EXISTS_TTL seconds so the auth
+    paths don't stat the file on every call.
+    """
+    global _client_secrets_exists_cache
+
+    now = time.monotonic()
+    cached = _client_secrets_exists_cache
+    if (
+        cached is not None
+        and cached[0] == client_secrets_path
+        and now - cached[2] < _CLIENT_SECRETS_EXISTS_TTL
+    ):
+        return cached[1]
+
+    exists = os.path.exists(client_secrets_path)
+    _client_secrets_exists_cache = (client_secrets_path, exists, now)
+    return exists
+
+
 def check_client_secrets() -> Optional[str]:
     """
     Check if OAuth client secrets are available.
@@ -109,7 +238,7 @@ def check_client_secrets() -> Optional[str]:
     if env_config:
         return None
 
-    if os.path.exists(config.client_secrets_path):
+    if _client_secrets_exists(config.client_secrets_path):
         return None
 
     return (
@@ -121,7 +250,7 @@ def check_client_secrets() -> Optional[str]:
 
 def create_oauth_flow(
     scopes: List[str], redirect_uri: str, state: Optional[str] = None
-) -> Flow:
+) -> "Flow":
     """
     Create an OAuth flow with PKCE enabled.
 
@@ -133,6 +262,8 @@ def create_oauth_flow(
     Returns:
         Configured OAuth Flow object
     """
+    from google_auth_oauthlib.flow import Flow
+
     config = get_oauth_config()
 
     # Try environment variables first
@@ -149,7 +280,7 @@ def create_oauth_flow(
         return flow
 
     # Fall back to file
-    if not os.path.exists(config.client_secrets_path):
+    if not _client_secrets_exists(config.client_secrets_path):
         raise FileNotFoundError(
             f"OAuth client secrets not found at {config.client_secrets_path}"
         )
@@ -165,6 +296,26 @@ def create_oauth_flow(
     return flow
 
 
+# Message returned by start_auth_flow, joined once at import time
+_AUTH_MESSAGE_TEMPLATE = "\n".join(
+    [
+        "**ACTION REQUIRED: Google Authentication Needed for {user_display}**\n",
+        "To proceed, authorize this application for {service_name} access.",
+        "",
+        "**Click this link to authenticate:**",
+        "[Authorize {service_name} Access]({auth_url})",
+        "",
+        "**Full URL (LLM: always print this for the user):**",
+        "```\n{auth_url}\n```",
+        "",
+        "**Instructions:**",
+        "1. Click the link above and complete authorization in your browser",
+        "2. After successful authorization, the browser will show a success message",
+        "3. Return here and retry your original command",
+    ]
+)
+
+
 def start_auth_flow(
     user_google_email: Optional[str] = None,
     service_name: str = "Google Drive",
@@ -197,13 +348,11 @@ def start_auth_flow(
 
     try:
         # Allow HTTP for localhost in development
-        if "OAUTHLIB_INSECURE_TRANSPORT" not in os.environ and (
-            "localhost" in redirect_uri or "127.0.0.1" in redirect_uri
-        ):
-            os.environ["OAUTHLIB_INSECURE_TRANSPORT"] = "1"
+        if "localhost" in redirect_uri or "127.0.0.1" in redirect_uri:
+            os.environ.setdefault("OAUTHLIB_INSECURE_TRANSPORT", "1")
 
         # Generate state for CSRF protection
-        oauth_state = os.urandom(16).hex()
+        oauth_state = secrets.token_hex(16)
 
         flow = create_oauth_flow(
             scopes=get_scopes(),
@@ -222,23 +371,11 @@ def start_auth_flow(
 
         logger.info(f"Auth flow started. State: {oauth_state[:8]}...")
 
-        message_lines = [
-            f"**ACTION REQUIRED: Google Authentication Needed for {user_display}**\n",
-            f"To proceed, authorize this application for {service_name} access.",
-            "",
-            "**Click this link to authenticate:**",
-            f"[Authorize {service_name} Access]({auth_url})",
-            "",
-            "**Full URL (LLM: always print this for the user):**",
-            f"```\n{auth_url}\n```",
-            "",
-            "**Instructions:**",
-            "1. Click the link above and complete authorization in your browser",
-            "2. After successful authorization, the browser will show a success message",
-            "3. Return here and retry your original command",
-        ]
-
-        return "\n".join(message_lines)
+        return _AUTH_MESSAGE_TEMPLATE.format(
+            user_display=user_display,
+            service_name=service_name,
+            auth_url=auth_url,
+        )
 
     except FileNotFoundError as e:
         error_text = f"OAuth client credentials not found: {e}"
@@ -273,16 +410,14 @@ def handle_auth_callback(
     """
     try:
         # Allow HTTP for localhost
-        if "OAUTHLIB_INSECURE_TRANSPORT" not in os.environ:
-            os.environ["OAUTHLIB_INSECURE_TRANSPORT"] = "1"
+        os.environ.setdefault("OAUTHLIB_INSECURE_TRANSPORT", "1")
 
         # Validate OAuth state
-        from urllib.parse import urlparse, parse_qs
-
         store = get_oauth21_session_store()
-        parsed_response = urlparse(authorization_response)
-        state_values = parse_qs(parsed_response.query).get("state")
-        state = state_values[0] if state_values else None
+        query = authorization_response.partition("?")[2].partition("#")[0]
+        state = next(
+            (value for key, value in parse_qsl(query) if key == "state"), None
+        )
 
         if not state:
             raise ValueError("Missing OAuth state parameter")
@@ -314,18 +449,19 @@ def handle_auth_callback(
         # Store credentials
         credential_store = get_credential_store()
         credential_store.store_credential(user_email, credentials)  # type: ignore[arg-type]
+        _bump_users_cache()
 
         # Store in session store
-        token = getattr(credentials, "token", None)
-        refresh_token = getattr(credentials, "refresh_token", None)
-        token_uri = (
-            getattr(credentials, "token_uri", None)
-            or "https://oauth2.googleapis.com/token"
-        )
-        client_id = getattr(credentials, "client_id", None)
-        client_secret = getattr(credentials, "client_secret", None)
-        cred_scopes = getattr(credentials, "scopes", None)
-        expiry = getattr(credentials, "expiry", None)
+        (
+            token,
+            refresh_token,
+            token_uri,
+            client_id,
+            client_secret,
+            cred_scopes,
+            expiry,
+        ) = _get_session_fields(credentials)
+        token_uri = token_uri or "https://oauth2.googleapis.com/token"
 
         if token:
             store.store_session(
@@ -347,6 +483,22 @@ def handle_auth_callback(
         raise
 
 
+@functools.lru_cache(maxsize=None)
+def get_discovery_doc(service_name: str, version: str) -> Dict[str, Any]:
+    """
+    Load and parse a bundled discovery document once per process.
+
+    build() re-reads and re-parses the static discovery JSON on every call;
+    building from the cached document skips that work.
+    """
+    from googleapiclient.discovery_cache import get_static_doc
+
+    doc = get_static_doc(service_name, version)
+    if doc is None:
+        raise ValueError(f"No bundled discovery document for {service_name} {version}")
+    return orjson.loads(doc)
+
+
 def get_user_info(credentials: Credentials) -> Optional[Dict[str, Any]]:
     """
     Fetch user profile information.
@@ -361,8 +513,15 @@ def get_user_info(credentials: Credentials) -> Optional[Dict[str, Any]]:
         logger.error("Cannot get user info: Invalid credentials")
         return None
 
+    # googleapiclient pulls in httplib2 and the discovery machinery; only
+    # pay for it when user info is actually fetched.
+    from googleapiclient.discovery import build_from_document
+    from googleapiclient.errors import HttpError
+
     try:
-        service = build("oauth2", "v2", credentials=credentials)
+        service = build_from_document(
+            get_discovery_doc("oauth2", "v2"), credentials=credentials
+        )
         user_info = service.userinfo().get().execute()
         logger.info(f"Fetched user info: {user_info.get('email')}")
         return user_info
@@ -374,9 +533,257 @@ def get_user_info(credentials: Credentials) -> Optional[Dict[str, Any]]:
         return None
 
 
+def _list_stored_users(credential_store: CredentialStore) -> List[str]:
+    """
+    List users in the credential store, reusing a recent listing.
+
+    Listings are reused for _STORED_USERS_TTL seconds so unauthenticated
+    requests don't rescan the credentials directory every time.
+    """
+    global _stored_users_cache
+
+    now = time.monotonic()
+    cached = _stored_users_cache
+    if cached is not None and now - cached[1] < _STORED_USERS_TTL:
+        return cached[0]
+
+    users = credential_store.list_users()
+    _stored_users_cache = (users, now)
+    return users
+
+
+def _bump_users_cache() -> None:
+    """Drop the cached user listing after credentials are added."""
+    global _stored_users_cache
+    _stored_users_cache = None
+
+
+def _is_stale(credentials: Credentials) -> bool:
+    """Check whether valid credentials are within the pre-emptive refresh window."""
+    expiry = credentials.expiry
+    if expiry is None:
+        return False
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    return expiry - _PREEMPTIVE_REFRESH_WINDOW <= now
+
+
+def _get_refresh_request() -> Request:
+    """
+    Get the shared transport used for token refreshes.
+
+    Reusing one requests.Session keeps the connection to the token endpoint
+    alive between refreshes instead of paying a new TLS handshake each time.
+    """
+    global _refresh_request
+    if _refresh_request is None:
+        with _refresh_request_lock:
+            if _refresh_request is None:
+                import requests
+
+                _refresh_request = Request(session=requests.Session())
+    return _refresh_request
+
+
+def refresh_credentials(credentials: Credentials) -> None:
+    """
+    Refresh credentials in place over the shared token endpoint session.
+
+    This blocks on the network, so async callers should run it in a thread.
+    """
+    credentials.refresh(_get_refresh_request())
+
+
+def _refresh_and_store(
+    credentials: Credentials,
+    user_email: Optional[str],
+    session_id: Optional[str],
+) -> Credentials:
+    """Refresh credentials and persist the new token to both stores."""
+    refresh_credentials(credentials)
+    logger.info("Credentials refreshed successfully")
+
+    # Update stored credentials
+    if user_email:
+        _persist_refreshed(credentials, user_email)
+        get_oauth21_session_store().store_session(
+            user_email=user_email,
+            access_token=credentials.token,
+            refresh_token=credentials.refresh_token,
+            token_uri=credentials.token_uri or "https://oauth2.googleapis.com/token",
+            client_id=credentials.client_id,
+            client_secret=credentials.client_secret,
+            scopes=list(credentials.scopes) if credentials.scopes else None,
+            expiry=credentials.expiry,
+            session_id=session_id,
+        )
+
+    return credentials
+
+
+def _persist_refreshed(credentials: Credentials, user_email: str) -> None:
+    """
+    Write refreshed credentials to the credential store in the background.
+
+    Writes for the same user are coalesced: while one is pending, newer
+    credentials replace it instead of queueing another file write.
+    """
+    with _pending_persists_lock:
+        already_pending = user_email in _pending_persists
+        _pending_persists[user_email] = credentials
+    if not already_pending:
+        _refresh_executor.submit(_flush_persist, user_email)
+
+
+def _flush_persist(user_email: str) -> None:
+    """Write the latest pending credentials for a user."""
+    with _pending_persists_lock:
+        credentials = _pending_persists.pop(user_email, None)
+    if credentials is not None:
+        get_credential_store().store_credential(user_email, credentials)
+
+
+def _get_inflight_refresh(user_email: Optional[str]) -> Optional[Future]:
+    """Return the running background refresh for a user, if any."""
+    if not user_email:
+        return None
+    with _refresh_futures_lock:
+        return _refresh_futures.get(user_email)
+
+
+def _get_refresh_lock(user_email: str) -> threading.Lock:
+    """Get the lock that serialises blocking refreshes for a user."""
+    with _refresh_futures_lock:
+        return _refresh_locks.setdefault(user_email, threading.Lock())
+
+
+def _refresh_expired(
+    credentials: Credentials, user_email: Optional[str], session_id: Optional[str]
+) -> Credentials:
+    """
+    Refresh expired credentials with at most one token request per user.
+
+    Callers that lose the race wait for the winner and then pick up the
+    refreshed token from the session store.
+    """
+    if not user_email:
+        return _refresh_and_store(credentials, user_email, session_id)
+
+    with _get_refresh_lock(user_email):
+        current = get_oauth21_session_store().get_credentials(user_email)
+        if current is not None and current.valid:
+            return current
+        return _refresh_and_store(credentials, user_email, session_id)
+
+
+def _schedule_refresh(
+    credentials: Credentials, user_email: str, session_id: Optional[str]
+) -> Future:
+    """Start a background refresh for a user unless one is already running."""
+    with _refresh_futures_lock:
+        future = _refresh_futures.get(user_email)
+        if future is not None:
+            return future
+        future = _refresh_executor.submit(
+            _refresh_and_store, credentials, user_email, session_id
+        )
+        _refresh_futures[user_email] = future
+
+    logger.info("Credentials close to expiry, refreshing in background")
+    future.add_done_callback(functools.partial(_finish_refresh, user_email))
+    return future
+
+
+def _finish_refresh(user_email: str, future: Future) -> None:
+    """Forget a completed background refresh and log any failure."""
+    with _refresh_futures_lock:
+        if _refresh_futures.get(user_email) is future:
+            del _refresh_futures[user_email]
+
+    error = future.exception()
+    if error is not None:
+        logger.warning(f"Background token refresh failed: {error}")
+
+
+def _lookup_by_session(
+    store: Any,
+    credential_store: CredentialStore,
+    user_email: Optional[str],
+    session_id: Optional[str],
+) -> _LookupResult:
+    """Look up credentials bound to the MCP session."""
+    if not session_id:
+        return None, None
+    credentials = store.get_credentials_by_session(session_id)
+    if credentials:
+        logger.debug(f"Found credentials for session {session_id}")
+    return credentials, user_email
+
+
+def _lookup_by_email(
+    store: Any,
+    credential_store: CredentialStore,
+    user_email: Optional[str],
+    session_id: Optional[str],
+) -> _LookupResult:
+    """Look up credentials for the requested user, session store first."""
+    if not user_email:
+        return None, None
+    credentials = store.get_credentials(user_email)
+    if not credentials:
+        credentials = credential_store.get_credential(user_email)
+    return credentials, user_email
+
+
+def _lookup_single_session_user(
+    store: Any,
+    credential_store: CredentialStore,
+    user_email: Optional[str],
+    session_id: Optional[str],
+) -> _LookupResult:
+    """Single user mode: the only user known to the in-memory session store."""
+    single_user = store.get_single_user_email()
+    if not single_user:
+        return None, None
+    credentials = store.get_credentials(single_user)
+    if not credentials:
+        credentials = credential_store.get_credential(single_user)
+    return credentials, single_user
+
+
+def _lookup_single_stored_user(
+    store: Any,
+    credential_store: CredentialStore,
+    user_email: Optional[str],
+    session_id: Optional[str],
+) -> _LookupResult:
+    """
+    Single user mode: the only user in the file-based credential store.
+
+    This handles the case where the server restarts and in-memory sessions
+    are empty.
+    """
+    stored_users = _list_stored_users(credential_store)
+    if len(stored_users) != 1:
+        return None, None
+    single_user = stored_users[0]
+    credentials = credential_store.get_credential(single_user)
+    if credentials:
+        logger.info(f"Loaded credentials for single stored user: {single_user}")
+    return credentials, single_user
+
+
+# Credential sources tried in order by get_credentials; the first hit wins
+_CREDENTIAL_LOOKUPS: Tuple[Callable[..., _LookupResult], ...] = (
+    _lookup_by_session,
+    _lookup_by_email,
+    _lookup_single_session_user,
+    _lookup_single_stored_user,
+)
+
+
 def get_credentials(
     user_email: Optional[str] = None,
-    required_scopes: Optional[List[str]] = None,
+    required_scopes: Optional[Sequence[str]] = None,
     session_id: Optional[str] = None,
 ) -> Optional[Credentials]:
     """
@@ -391,83 +798,45 @@ def get_credentials(
         Valid Credentials object or None
     """
     if required_scopes is None:
-        required_scopes = SCOPES
+        required_scopes = _SCOPES_SET
 
     store = get_oauth21_session_store()
     credential_store = get_credential_store()
-    credentials: Optional[Credentials] = None
 
-    # Try session store first
-    if session_id:
-        credentials = store.get_credentials_by_session(session_id)
+    for lookup in _CREDENTIAL_LOOKUPS:
+        credentials, found_email = lookup(
+            store, credential_store, user_email, session_id
+        )
         if credentials:
-            logger.debug(f"Found credentials for session {session_id}")
-
-    # Try by user email
-    if not credentials and user_email:
-        credentials = store.get_credentials(user_email)
-        if not credentials:
-            # Try file-based credential store
-            credentials = credential_store.get_credential(user_email)
-
-    # Try single user mode (in-memory session store)
-    if not credentials:
-        single_user = store.get_single_user_email()
-        if single_user:
-            credentials = store.get_credentials(single_user)
-            if not credentials:
-                credentials = credential_store.get_credential(single_user)
-            if credentials:
-                user_email = single_user
-
-    # Try single user mode (file-based credential store)
-    # This handles the case where server restarts and in-memory sessions are empty
-    if not credentials:
-        stored_users = credential_store.list_users()
-        if len(stored_users) == 1:
-            single_user = stored_users[0]
-            credentials = credential_store.get_credential(single_user)
-            if credentials:
-                user_email = single_user
-                logger.info(f"Loaded credentials for single stored user: {single_user}")
-
-    if not credentials:
+            user_email = found_email
+            break
+    else:
         logger.info("No credentials found")
         return None
 
     # Check scopes
     if credentials.scopes:
-        if not all(scope in credentials.scopes for scope in required_scopes):
+        if not frozenset(credentials.scopes).issuperset(required_scopes):
             logger.warning("Credentials lack required scopes")
             return None
 
     # Check validity and refresh if needed
     if credentials.valid:
+        # Close to expiry: keep serving the current token and refresh it in
+        # the background so callers don't block on the token endpoint.
+        if user_email and credentials.refresh_token and _is_stale(credentials):
+            _schedule_refresh(credentials, user_email, session_id)
         return credentials
 
     if credentials.expired and credentials.refresh_token:
         logger.info("Credentials expired, attempting refresh")
         try:
-            credentials.refresh(Request())
-            logger.info("Credentials refreshed successfully")
-
-            # Update stored credentials
-            if user_email:
-                credential_store.store_credential(user_email, credentials)
-                store.store_session(
-                    user_email=user_email,
-                    access_token=credentials.token,
-                    refresh_token=credentials.refresh_token,
-                    token_uri=credentials.token_uri
-                    or "https://oauth2.googleapis.com/token",
-                    client_id=credentials.client_id,
-                    client_secret=credentials.client_secret,
-                    scopes=list(credentials.scopes) if credentials.scopes else None,
-                    expiry=credentials.expiry,
-                    session_id=session_id,
-                )
+            in_flight = _get_inflight_refresh(user_email)
+            if in_flight is not None:
+                # A background refresh is already running; wait for it
+                return in_flight.result()
 
-            return credentials
+            return _refresh_expired(credentials, user_email, session_id)
 
         except RefreshError as e:
             logger.warning(f"Token refresh failed: {e}")
@@ -482,7 +851,7 @@ def get_credentials(
 
 def get_credentials_or_auth_url(
     user_email: Optional[str] = None,
-    required_scopes: Optional[List[str]] = None,
+    required_scopes: Optional[Sequence[str]] = None,
     session_id: Optional[str] = None,
 ) -> Tuple[Optional[Credentials], Optional[str]]:
     """
@@ -523,17 +892,86 @@ def get_credentials_or_auth_url(
     return None, auth_message
 
 
+def _credentials_to_dict(credentials: Credentials) -> Dict[str, Any]:
+    """
+    Build the authorized-user dict that Credentials.to_json() would emit.
+
+    Returns:
+        Dict accepted by Credentials.from_authorized_user_info()
+    """
+    data = {
+        "token": credentials.token,
+        "refresh_token": credentials.refresh_token,
+        "token_uri": credentials.token_uri,
+        "client_id": credentials.client_id,
+        "client_secret": credentials.client_secret,
+        "scopes": credentials.scopes,
+        "rapt_token": credentials.rapt_token,
+        "universe_domain": credentials.universe_domain,
+        "account": credentials.account,
+    }
+    if credentials.expiry:
+        data["expiry"] = credentials.expiry.isoformat() + "Z"
+    return {key: value for key, value in data.items() if value is not None}
+
+
+def _write_token_file(token_path: str, credentials: Credentials) -> None:
+    """
+    Atomically write credentials to a legacy token.json file.
+
+    The JSON is serialised compactly and moved into place with os.replace,
+    so an interrupted write never leaves a truncated token file behind.
+    """
+    payload = orjson.dumps(_credentials_to_dict(credentials))
+    fd, temp_path = tempfile.mkstemp(
+        dir=os.path.dirname(token_path) or ".", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+        os.replace(temp_path, token_path)
+    except Exception:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        raise
+
+
+# Credentials last returned by get_creds(), reused while still valid
+_cached_creds: Optional[Credentials] = None
+_cached_creds_lock = threading.Lock()
+
+
 # Legacy compatibility function
 def get_creds() -> Any:
     """
     Legacy function for backward compatibility.
 
+    Valid credentials from a previous call are returned without touching
+    the credential stores or token.json.
+
     Returns:
         Credentials object
 
     Raises:
         GoogleAuthenticationError: If authentication is required
     """
+    global _cached_creds
+
+    cached = _cached_creds
+    if cached is not None and cached.valid:
+        return cached
+
+    with _cached_creds_lock:
+        if _cached_creds is not None and _cached_creds.valid:
+            return _cached_creds
+
+        credentials = _load_creds()
+        _cached_creds = credentials
+        return credentials
+
+
+def _load_creds() -> Any:
+    """Resolve credentials for get_creds(), running the auth flow if needed."""
     credentials = get_credentials()
 
     if credentials and credentials.valid:
@@ -545,18 +983,17 @@ def get_creds() -> Any:
 
     if os.path.exists(legacy_token_path):
         try:
-            credentials = Credentials.from_authorized_user_file(
-                legacy_token_path, SCOPES
-            )
+            with open(legacy_token_path, "rb") as f:
+                token_info = orjson.loads(f.read())
+            credentials = Credentials.from_authorized_user_info(token_info, SCOPES)
 
             if credentials and credentials.valid:
                 return credentials
 
             if credentials and credentials.expired and credentials.refresh_token:
-                credentials.refresh(Request())
+                refresh_credentials(credentials)
                 # Save refreshed credentials
-                with open(legacy_token_path, "w") as token:
-                    token.write(credentials.to_json())
+                _write_token_file(legacy_token_path, credentials)
                 return credentials
 
         except Exception as e:
@@ -564,17 +1001,14 @@ def get_creds() -> Any:
 
     from google_auth_oauthlib.flow import InstalledAppFlow
 
-    config = get_oauth_config()
-
-    if os.path.exists(config.client_secrets_path):
+    if _client_secrets_exists(config.client_secrets_path):
         try:
             flow = InstalledAppFlow.from_client_secrets_file(
                 config.client_secrets_path, SCOPES
             )
             credentials = flow.run_local_server(port=0)
 
-            with open(legacy_token_path, "w") as token:
-                token.write(credentials.to_json())
+            _write_token_file(legacy_token_path, credentials)
 
             return credentials
         except (OSError, IOError, ConnectionError) as e:
@@ -5,36 +5,104 @@ This module provides session management with OAuth state persistence
 to survive server restarts during OAuth flows.
 """
 
-import json
+import atexit
+import functools
+import heapq
 import logging
+import mmap
 import os
-import tempfile
-from typing import Dict, Optional, Any
-from threading import RLock
+import sys
+from typing import BinaryIO, Dict, FrozenSet, List, Optional, Any, Tuple
+from threading import Lock, Timer
 from datetime import datetime, timedelta, timezone
 from dataclasses import dataclass, field
+from pathlib import Path
 
+import orjson
 from google.oauth2.credentials import Credentials
 
 logger = logging.getLogger(__name__)
 
-
-def _get_oauth_states_file_path() -> str:
-    """Get the file path for persisting OAuth states."""
-    env_dir = os.getenv("DRIVE_SYNAPSIS_CREDENTIALS_DIR")
+# Compact the OAuth state log into the snapshot file once it grows past this
+_WAL_COMPACT_THRESHOLD = 256
+
+# Buffered OAuth state changes are written to the log after this delay (seconds)
+_FLUSH_DELAY = 0.25
+
+# Default upper bound on expired states removed per cleanup pass
+_DEFAULT_EXPIRY_BATCH_SIZE = 4096
+
+
+def _get_expiry_batch_size() -> int:
+    """Read DRIVE_SYNAPSIS_EXPIRY_BATCH_SIZE, falling back to the default."""
+    raw = os.getenv("DRIVE_SYNAPSIS_EXPIRY_BATCH_SIZE")
+    if raw is None:
+        return _DEFAULT_EXPIRY_BATCH_SIZE
+    try:
+        value = int(raw)
+    except ValueError:
+        logger.warning(
+            "Invalid DRIVE_SYNAPSIS_EXPIRY_BATCH_SIZE %r, using %d",
+            raw,
+            _DEFAULT_EXPIRY_BATCH_SIZE,
+        )
+        return _DEFAULT_EXPIRY_BATCH_SIZE
+    # Zero or less would never remove expired states
+    return max(value, 1)
+
+
+@functools.lru_cache(maxsize=None)
+def _states_path(env_dir: Optional[str]) -> Path:
+    """Resolve and create the OAuth states directory once per configured dir."""
     if env_dir:
-        base_dir = env_dir
+        base_dir = Path(env_dir)
     else:
         home_dir = os.path.expanduser("~")
         if home_dir and home_dir != "~":
-            base_dir = os.path.join(home_dir, ".config", "drive-synapsis")
+            base_dir = Path(home_dir, ".config", "drive-synapsis")
         else:
-            base_dir = os.path.join(os.getcwd(), ".config", "drive-synapsis")
+            base_dir = Path.cwd() / ".config" / "drive-synapsis"
+
+    base_dir.mkdir(parents=True, exist_ok=True)
+    return base_dir / "oauth_states.json"
+
+
+def _get_oauth_states_file_path() -> str:
+    """Get the file path for persisting OAuth states."""
+    return str(_states_path(os.getenv("DRIVE_SYNAPSIS_CREDENTIALS_DIR")))
+
+
+_DEFAULT_TOKEN_URI = sys.intern("https://oauth2.googleapis.com/token")
+# frozenset of scopes -> canonical sorted tuple shared by every session with them
+_SCOPE_CACHE: Dict[FrozenSet[str], Tuple[str, ...]] = {}
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
 
-    if not os.path.exists(base_dir):
-        os.makedirs(base_dir, exist_ok=True)
 
-    return os.path.join(base_dir, "oauth_states.json")
+def _encode_timestamp(value: Any) -> int:
+    """
+    orjson default hook: persist datetimes as integer epoch microseconds.
+
+    Integers decode far cheaper than ISO 8601 strings and take fewer bytes.
+    """
+    if isinstance(value, datetime):
+        return (value - _EPOCH) // _MICROSECOND
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def _decode_timestamp(value: Any) -> datetime:
+    """Parse a persisted timestamp (epoch microseconds or legacy ISO 8601)."""
+    if isinstance(value, str):
+        return datetime.fromisoformat(value)
+    return _EPOCH + timedelta(microseconds=value)
+
+
+def _dumps_states(obj: Any) -> bytes:
+    """Serialize OAuth state data with timestamps as epoch microseconds."""
+    return orjson.dumps(
+        obj, default=_encode_timestamp, option=orjson.OPT_PASSTHROUGH_DATETIME
+    )
 
 
 def _normalize_expiry_to_naive_utc(expiry: Optional[Any]) -> Optional[datetime]:
@@ -72,6 +140,20 @@ class SessionContext:
     metadata: Dict[str, Any] = field(default_factory=dict)
 
 
+@dataclass(slots=True)
+class _SessionRow:
+    """OAuth tokens and metadata stored for one authenticated user."""
+
+    access_token: str
+    refresh_token: Optional[str]
+    token_uri: str
+    client_id: Optional[str]
+    client_secret: Optional[str]
+    scopes: Tuple[str, ...]
+    expiry: Optional[datetime]
+    session_id: Optional[str]
+
+
 class OAuth21SessionStore:
     """
     Session store for OAuth 2.1 authenticated sessions.
@@ -81,95 +163,269 @@ class OAuth21SessionStore:
     """
 
     def __init__(self) -> None:
-        self._sessions: Dict[str, Dict[str, Any]] = {}
+        self._sessions: Dict[str, _SessionRow] = {}
+        # user_email -> Credentials built from the current session row
+        self._credentials_cache: Dict[str, Credentials] = {}
         self._session_mapping: Dict[str, str] = {}  # session_id -> user_email
         self._oauth_states: Dict[str, Dict[str, Any]] = {}
-        self._lock = RLock()
+        # Min-heap of (expires_at, state); consumed states are skipped lazily
+        self._expiry_heap: List[Tuple[datetime, str]] = []
+        # Upper bound on expired states removed per cleanup pass
+        self._expiry_batch_size = _get_expiry_batch_size()
+        self._lock = Lock()
+        # Serialises disk writes; taken before self._lock, never after it
+        self._io_lock = Lock()
         self._states_file_path = _get_oauth_states_file_path()
+        # Append-only log of state changes since the last snapshot
+        self._wal_path = self._states_file_path + ".log"
+        self._wal_lines = 0
+        # Fixed per-process temp slot for atomic snapshot writes; the pid keeps
+        # concurrently running server instances from sharing it
+        self._tmp_path = f"{self._states_file_path}.{os.getpid()}.tmp"
+        # state -> log record not yet written; an add consumed before the
+        # flush cancels out and never reaches the disk
+        self._pending_wal: Dict[str, Dict[str, Any]] = {}
+        self._dirty = False
+        self._flush_timer: Optional[Timer] = None
 
         # Load persisted OAuth states on initialization
         self._load_oauth_states_from_disk()
+        self._wal_fh = self._open_wal()
+        atexit.register(self.flush)
+
+    def _open_wal(self) -> Optional[BinaryIO]:
+        """
+        Open the state log for appending.
+
+        Returns None if it cannot be opened; states then stay in memory only.
+        """
+        try:
+            # The directory may have been removed since _states_path created it
+            os.makedirs(os.path.dirname(self._wal_path), exist_ok=True)
+            # The log holds PKCE code verifiers, so it is private like the snapshot
+            fd = os.open(self._wal_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+            os.fchmod(fd, 0o600)
+            return os.fdopen(fd, "ab", buffering=0)
+        except OSError as e:
+            logger.error("Failed to open OAuth state log, keeping states in memory: %s", e)
+            return None
 
     def _cleanup_expired_oauth_states_locked(self) -> None:
-        """Remove expired OAuth state entries. Caller must hold lock."""
+        """
+        Remove expired OAuth state entries. Caller must hold lock.
+
+        At most DRIVE_SYNAPSIS_EXPIRY_BATCH_SIZE states are removed per call;
+        any left over go on the next pass.
+        """
         now = datetime.now(timezone.utc)
-        expired_states = [
-            state
-            for state, data in self._oauth_states.items()
-            if data.get("expires_at") and data["expires_at"] <= now
-        ]
-        for state in expired_states:
-            del self._oauth_states[state]
-            logger.debug("Removed expired OAuth state: %s...", state[:8])
+        heap = self._expiry_heap
+        batch_size = self._expiry_batch_size
+        expired_states = []
+        while heap and heap[0][0] <= now and len(expired_states) < batch_size:
+            expires_at, state = heapq.heappop(heap)
+            data = self._oauth_states.get(state)
+            # Skip heap entries for states already consumed or re-stored
+            if data is not None and data.get("expires_at") == expires_at:
+                expired_states.append(state)
+
+        if expired_states:
+            oauth_states = self._oauth_states
+            for state in expired_states:
+                del oauth_states[state]
+            logger.debug("Removed %d expired OAuth states", len(expired_states))
+
+    @staticmethod
+    def _deserialize_oauth_state(data: Dict[str, Any]) -> Dict[str, Any]:
+        """Parse the datetime fields of a persisted OAuth state entry in place."""
+        if "expires_at" in data and data["expires_at"]:
+            data["expires_at"] = _decode_timestamp(data["expires_at"])
+        if "created_at" in data and data["created_at"]:
+            data["created_at"] = _decode_timestamp(data["created_at"])
+        return data
 
     def _load_oauth_states_from_disk(self) -> None:
         """Load persisted OAuth states from disk on initialization."""
         try:
             if not os.path.exists(self._states_file_path):
                 logger.debug("No persisted OAuth states file found")
-                return
-
-            with open(self._states_file_path, "r") as f:
-                persisted_data = json.load(f)
+            else:
+                persisted_data = self._read_states_file()
 
-            if not isinstance(persisted_data, dict):
-                logger.warning("Invalid OAuth states file format, ignoring")
-                return
+                if not isinstance(persisted_data, dict):
+                    logger.warning("Invalid OAuth states file format, ignoring")
+                    persisted_data = {}
 
-            loaded_count = 0
-            for state, data in persisted_data.items():
-                try:
-                    if "expires_at" in data and data["expires_at"]:
-                        data["expires_at"] = datetime.fromisoformat(data["expires_at"])
-                    if "created_at" in data and data["created_at"]:
-                        data["created_at"] = datetime.fromisoformat(data["created_at"])
-                    self._oauth_states[state] = data
-                    loaded_count += 1
-                except (ValueError, TypeError) as e:
-                    logger.warning("Failed to parse OAuth state: %s", e)
+                for state, data in persisted_data.items():
+                    try:
+                        self._oauth_states[state] = self._deserialize_oauth_state(
+                            data
+                        )
+                    except (ValueError, TypeError) as e:
+                        logger.warning("Failed to parse OAuth state: %s", e)
 
-            self._cleanup_expired_oauth_states_locked()
-            logger.info(
-                "Loaded %d OAuth states from disk (%d after cleanup)",
-                loaded_count,
-                len(self._oauth_states),
-            )
-
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             logger.warning("Failed to parse OAuth states file: %s", e)
         except IOError as e:
             logger.warning("Failed to read OAuth states file: %s", e)
         except Exception as e:
             logger.error("Unexpected error loading OAuth states: %s", e)
 
-    def _save_oauth_states_to_disk(self) -> None:
-        """Persist OAuth states to disk atomically. Caller must hold lock."""
+        self._replay_wal()
+        self._expiry_heap = [
+            (data["expires_at"], state)
+            for state, data in self._oauth_states.items()
+            if data.get("expires_at")
+        ]
+        heapq.heapify(self._expiry_heap)
+        loaded_count = len(self._oauth_states)
+        self._cleanup_expired_oauth_states_locked()
+        logger.info(
+            "Loaded %d OAuth states from disk (%d after cleanup)",
+            loaded_count,
+            len(self._oauth_states),
+        )
+
+        # Fold any replayed log entries into a fresh snapshot
+        if self._wal_lines:
+            self._save_oauth_states_to_disk(self._oauth_states)
+            try:
+                os.truncate(self._wal_path, 0)
+                self._wal_lines = 0
+            except OSError as e:
+                logger.warning("Failed to truncate OAuth state log: %s", e)
+
+    def _read_states_file(self) -> Any:
+        """Parse the snapshot file straight from a read-only memory map."""
+        with open(self._states_file_path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                # mmap cannot map an empty file
+                return orjson.loads(b"")
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                with memoryview(mm) as view:
+                    return orjson.loads(view)
+
+    def _replay_wal(self) -> None:
+        """Apply logged OAuth state changes on top of the loaded snapshot."""
+        try:
+            with open(self._wal_path, "rb") as f:
+                lines = f.read().splitlines()
+        except FileNotFoundError:
+            return
+        except IOError as e:
+            logger.warning("Failed to read OAuth state log: %s", e)
+            return
+
+        for line in lines:
+            self._wal_lines += 1
+            try:
+                record = orjson.loads(line)
+                if record["op"] == "add":
+                    self._oauth_states[record["state"]] = (
+                        self._deserialize_oauth_state(record["data"])
+                    )
+                elif record["op"] == "del":
+                    self._oauth_states.pop(record["state"], None)
+            except (ValueError, TypeError, KeyError) as e:
+                # A torn final write leaves a partial line; skip it
+                logger.warning("Skipping unreadable OAuth state log entry: %s", e)
+
+    def _mark_dirty_locked(self, state: str, record: Dict[str, Any]) -> None:
+        """
+        Buffer a state change for the log and arm the flush timer.
+
+        Caller must hold lock.
+        """
+        pending = self._pending_wal.get(state)
+        if record["op"] == "del" and pending is not None and pending["op"] == "add":
+            # Added and consumed within one flush window: nothing to persist
+            del self._pending_wal[state]
+        else:
+            self._pending_wal[state] = record
+
+        self._dirty = bool(self._pending_wal)
+        if self._dirty and self._flush_timer is None:
+            self._flush_timer = Timer(_FLUSH_DELAY, self.flush)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+
+    def flush(self) -> None:
+        """Write buffered OAuth state changes to the log."""
+        with self._io_lock:
+            with self._lock:
+                if self._flush_timer is not None:
+                    self._flush_timer.cancel()
+                    self._flush_timer = None
+                if not self._dirty:
+                    return
+                records = list(self._pending_wal.values())
+                self._pending_wal.clear()
+                self._dirty = False
+
+                snapshot = None
+                if self._wal_lines + len(records) > _WAL_COMPACT_THRESHOLD:
+                    # Entries are replaced, never mutated, so a shallow copy
+                    # is a consistent snapshot
+                    snapshot = dict(self._oauth_states)
+
+            if self._wal_fh is None:
+                return
+
+            # Disk I/O happens outside the data lock so credential lookups
+            # never wait on it; the I/O lock keeps log writes in order.
+            try:
+                self._wal_fh.write(
+                    b"".join(_dumps_states(record) + b"\n" for record in records)
+                )
+                self._wal_lines += len(records)
+            except (IOError, TypeError, ValueError) as e:
+                logger.error("Failed to append to OAuth state log: %s", e)
+                return
+
+            if snapshot is not None:
+                self._compact(snapshot)
+
+    def close(self) -> None:
+        """Flush pending changes and release the log file and exit hook."""
+        self.flush()
+        with self._io_lock:
+            if self._wal_fh is not None:
+                self._wal_fh.close()
+        atexit.unregister(self.flush)
+
+    def _compact(self, snapshot: Dict[str, Dict[str, Any]]) -> None:
+        """
+        Rewrite the snapshot file and truncate the log.
+
+        Caller must hold the I/O lock.
+        """
+        self._save_oauth_states_to_disk(snapshot)
+        if self._wal_fh is None:
+            return
         try:
-            serializable_data = {}
-            for state, data in self._oauth_states.items():
-                serializable_data[state] = {
-                    "session_id": data.get("session_id"),
-                    "expires_at": data["expires_at"].isoformat()
-                    if data.get("expires_at")
-                    else None,
-                    "created_at": data["created_at"].isoformat()
-                    if data.get("created_at")
-                    else None,
-                    "code_verifier": data.get("code_verifier"),
-                }
-
-            target_dir = os.path.dirname(self._states_file_path)
-            fd, temp_path = tempfile.mkstemp(dir=target_dir, suffix=".tmp")
+            self._wal_fh.truncate(0)
+            self._wal_lines = 0
+        except IOError as e:
+            logger.error("Failed to truncate OAuth state log: %s", e)
+
+    def _save_oauth_states_to_disk(self, states: Dict[str, Dict[str, Any]]) -> None:
+        """Persist OAuth states to disk atomically. Caller must hold the I/O lock."""
+        try:
+            payload = _dumps_states(states)
+            fd = os.open(
+                self._tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600
+            )
             try:
-                with os.fdopen(fd, "w") as f:
-                    json.dump(serializable_data, f, indent=2)
-                os.replace(temp_path, self._states_file_path)
+                with os.fdopen(fd, "wb") as f:
+                    f.write(payload)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(self._tmp_path, self._states_file_path)
             except Exception:
-                if os.path.exists(temp_path):
-                    os.unlink(temp_path)
+                if os.path.exists(self._tmp_path):
+                    os.unlink(self._tmp_path)
                 raise
 
-            logger.debug("Persisted %d OAuth states to disk", len(serializable_data))
+            logger.debug("Persisted %d OAuth states to disk", len(states))
 
         except IOError as e:
             logger.error("Failed to persist OAuth states to disk: %s", e)
@@ -187,6 +443,9 @@ class OAuth21SessionStore:
         Persist an OAuth state value for later validation.
 
         States are stored both in memory and on disk to survive server restarts.
+        Each change is appended to a log rather than rewriting every pending
+        state; the log is folded into the snapshot file periodically. Changes
+        are buffered briefly so a state consumed right away is never written.
 
         Args:
             state: The OAuth state parameter
@@ -203,14 +462,18 @@ class OAuth21SessionStore:
             self._cleanup_expired_oauth_states_locked()
             now = datetime.now(timezone.utc)
             expiry = now + timedelta(seconds=expires_in_seconds)
-            self._oauth_states[state] = {
+            state_info = {
                 "session_id": session_id,
                 "expires_at": expiry,
                 "created_at": now,
                 "code_verifier": code_verifier,
             }
+            self._oauth_states[state] = state_info
+            heapq.heappush(self._expiry_heap, (expiry, state))
 
-            self._save_oauth_states_to_disk()
+            self._mark_dirty_locked(
+                state, {"op": "add", "state": state, "data": state_info}
+            )
 
             logger.debug(
                 "Stored OAuth state %s... (expires at %s)",
@@ -243,6 +506,11 @@ class OAuth21SessionStore:
             self._cleanup_expired_oauth_states_locked()
             state_info = self._oauth_states.get(state)
 
+            # Expired states may outlive a batch-limited cleanup pass
+            expires_at = state_info.get("expires_at") if state_info else None
+            if expires_at and expires_at <= datetime.now(timezone.utc):
+                state_info = None
+
             if not state_info:
                 logger.error("OAuth callback received unknown or expired state")
                 raise ValueError("Invalid or expired OAuth state parameter")
@@ -250,7 +518,7 @@ class OAuth21SessionStore:
             bound_session = state_info.get("session_id")
             if bound_session and session_id and bound_session != session_id:
                 del self._oauth_states[state]
-                self._save_oauth_states_to_disk()
+                self._mark_dirty_locked(state, {"op": "del", "state": state})
                 logger.error(
                     "OAuth state session mismatch (expected %s, got %s)",
                     bound_session,
@@ -260,7 +528,7 @@ class OAuth21SessionStore:
 
             # State is valid - consume it to prevent reuse
             del self._oauth_states[state]
-            self._save_oauth_states_to_disk()
+            self._mark_dirty_locked(state, {"op": "del", "state": state})
             logger.debug("Validated OAuth state %s...", state[:8])
             return state_info
 
@@ -269,7 +537,7 @@ class OAuth21SessionStore:
         user_email: str,
         access_token: str,
         refresh_token: Optional[str] = None,
-        token_uri: str = "https://oauth2.googleapis.com/token",
+        token_uri: str = _DEFAULT_TOKEN_URI,
         client_id: Optional[str] = None,
         client_secret: Optional[str] = None,
         scopes: Optional[list] = None,
@@ -292,18 +560,26 @@ class OAuth21SessionStore:
         """
         with self._lock:
             normalized_expiry = _normalize_expiry_to_naive_utc(expiry)
-            session_info = {
-                "access_token": access_token,
-                "refresh_token": refresh_token,
-                "token_uri": token_uri,
-                "client_id": client_id,
-                "client_secret": client_secret,
-                "scopes": scopes or [],
-                "expiry": normalized_expiry,
-                "session_id": session_id,
-            }
+            # Sessions share one interned token URI and one tuple per scope set
+            scope_key = frozenset(scopes or ())
+            shared_scopes = _SCOPE_CACHE.get(scope_key)
+            if shared_scopes is None:
+                shared_scopes = _SCOPE_CACHE.setdefault(
+                    scope_key, tuple(sorted(scope_key))
+                )
+            session_info = _SessionRow(
+                access_token=access_token,
+                refresh_token=refresh_token,
+                token_uri=sys.intern(token_uri) if token_uri else _DEFAULT_TOKEN_URI,
+                client_id=client_id,
+                client_secret=client_secret,
+                scopes=shared_scopes,
+                expiry=normalized_expiry,
+                session_id=session_id,
+            )
 
             self._sessions[user_email] = session_info
+            self._credentials_cache.pop(user_email, None)
 
             if session_id:
                 self._session_mapping[session_id] = user_email
@@ -317,6 +593,10 @@ class OAuth21SessionStore:
         """
         Get Google credentials for a user from OAuth session.
 
+        The Credentials object is built once per stored session and reused;
+        google-auth refreshes it in place. store_session and remove_session
+        drop the cached object.
+
         Args:
             user_email: User's email address
 
@@ -324,28 +604,37 @@ class OAuth21SessionStore:
             Google Credentials object or None
         """
         with self._lock:
-            session_info = self._sessions.get(user_email)
-            if not session_info:
-                logger.debug(f"No OAuth session found for {user_email}")
-                return None
+            return self._get_credentials_locked(user_email)
 
-            try:
-                credentials = Credentials(
-                    token=session_info["access_token"],
-                    refresh_token=session_info.get("refresh_token"),
-                    token_uri=session_info["token_uri"],
-                    client_id=session_info.get("client_id"),
-                    client_secret=session_info.get("client_secret"),
-                    scopes=session_info.get("scopes", []),
-                    expiry=session_info.get("expiry"),
-                )
+    def _get_credentials_locked(self, user_email: str) -> Optional[Credentials]:
+        """Build or reuse the Credentials for a user. Caller must hold lock."""
+        credentials = self._credentials_cache.get(user_email)
+        if credentials is not None:
+            return credentials
+
+        session_info = self._sessions.get(user_email)
+        if not session_info:
+            logger.debug(f"No OAuth session found for {user_email}")
+            return None
 
-                logger.debug(f"Retrieved OAuth credentials for {user_email}")
-                return credentials
+        try:
+            credentials = Credentials(
+                token=session_info.access_token,
+                refresh_token=session_info.refresh_token,
+                token_uri=session_info.token_uri,
+                client_id=session_info.client_id,
+                client_secret=session_info.client_secret,
+                scopes=session_info.scopes,
+                expiry=session_info.expiry,
+            )
 
-            except Exception as e:
-                logger.error(f"Failed to create credentials for {user_email}: {e}")
-                return None
+            self._credentials_cache[user_email] = credentials
+            logger.debug(f"Retrieved OAuth credentials for {user_email}")
+            return credentials
+
+        except Exception as e:
+            logger.error(f"Failed to create credentials for {user_email}: {e}")
+            return None
 
     def get_credentials_by_session(self, session_id: str) -> Optional[Credentials]:
         """
@@ -363,7 +652,7 @@ class OAuth21SessionStore:
                 logger.debug(f"No user mapping found for session {session_id}")
                 return None
 
-            return self.get_credentials(user_email)
+            return self._get_credentials_locked(user_email)
 
     def get_user_by_session(self, session_id: str) -> Optional[str]:
         """Get user email by session ID."""
@@ -373,11 +662,10 @@ class OAuth21SessionStore:
     def remove_session(self, user_email: str) -> None:
         """Remove session for a user."""
         with self._lock:
-            if user_email in self._sessions:
-                session_info = self._sessions.get(user_email, {})
-                session_id = session_info.get("session_id")
-
-                del self._sessions[user_email]
+            session_info = self._sessions.pop(user_email, None)
+            self._credentials_cache.pop(user_email, None)
+            if session_info is not None:
+                session_id = session_info.session_id
 
                 if session_id and session_id in self._session_mapping:
                     del self._session_mapping[session_id]
@@ -417,3 +705,11 @@ def get_oauth21_session_store() -> OAuth21SessionStore:
     if _global_store is None:
         _global_store = OAuth21SessionStore()
     return _global_store
+
+
+def reset_oauth21_session_store() -> None:
+    """Close the global session store so the next lookup builds a new one."""
+    global _global_store
+    store, _global_store = _global_store, None
+    if store is not None:
+        store.close()
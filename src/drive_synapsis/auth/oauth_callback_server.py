@@ -9,16 +9,18 @@ MCP server instances run simultaneously.
 """
 
 import asyncio
+import html
 import logging
 import random
 import threading
-import time
 import socket
 from typing import Optional, Tuple
 
 import uvicorn
-from fastapi import FastAPI, Request
-from fastapi.responses import HTMLResponse
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import HTMLResponse
+from starlette.routing import Route
 
 from .scopes import get_scopes
 from .oauth21_session_store import get_oauth21_session_store
@@ -53,15 +55,14 @@ def find_available_port(
     return None
 
 
-def _create_success_html(user_email: str) -> str:
-    """Create a success HTML page after OAuth completion."""
-    return f"""
+# Static response pages; only the placeholder is substituted per request
+_SUCCESS_TEMPLATE = """
     <!DOCTYPE html>
     <html>
     <head>
         <title>Authentication Successful</title>
         <style>
-            body {{
+            body {
                 font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
                 display: flex;
                 justify-content: center;
@@ -69,31 +70,31 @@ def _create_success_html(user_email: str) -> str:
                 min-height: 100vh;
                 margin: 0;
                 background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            }}
-            .container {{
+            }
+            .container {
                 background: white;
                 padding: 40px;
                 border-radius: 12px;
                 box-shadow: 0 10px 40px rgba(0,0,0,0.2);
                 text-align: center;
                 max-width: 400px;
-            }}
-            .success-icon {{
+            }
+            .success-icon {
                 font-size: 64px;
                 margin-bottom: 20px;
-            }}
-            h1 {{
+            }
+            h1 {
                 color: #333;
                 margin-bottom: 10px;
-            }}
-            .email {{
+            }
+            .email {
                 color: #667eea;
                 font-weight: bold;
-            }}
-            p {{
+            }
+            p {
                 color: #666;
                 line-height: 1.6;
-            }}
+            }
         </style>
     </head>
     <body>
@@ -101,23 +102,20 @@ def _create_success_html(user_email: str) -> str:
             <div class="success-icon">&#10004;</div>
             <h1>Authentication Successful!</h1>
             <p>You have successfully authenticated as:</p>
-            <p class="email">{user_email}</p>
+            <p class="email">{EMAIL}</p>
             <p>You can close this window and return to your application.</p>
         </div>
     </body>
     </html>
     """
 
-
-def _create_error_html(error_message: str) -> str:
-    """Create an error HTML page."""
-    return f"""
+_ERROR_TEMPLATE = """
     <!DOCTYPE html>
     <html>
     <head>
         <title>Authentication Failed</title>
         <style>
-            body {{
+            body {
                 font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
                 display: flex;
                 justify-content: center;
@@ -125,37 +123,37 @@ def _create_error_html(error_message: str) -> str:
                 min-height: 100vh;
                 margin: 0;
                 background: linear-gradient(135deg, #ff6b6b 0%, #ee5a5a 100%);
-            }}
-            .container {{
+            }
+            .container {
                 background: white;
                 padding: 40px;
                 border-radius: 12px;
                 box-shadow: 0 10px 40px rgba(0,0,0,0.2);
                 text-align: center;
                 max-width: 400px;
-            }}
-            .error-icon {{
+            }
+            .error-icon {
                 font-size: 64px;
                 margin-bottom: 20px;
-            }}
-            h1 {{
+            }
+            h1 {
                 color: #333;
                 margin-bottom: 10px;
-            }}
-            .error-message {{
+            }
+            .error-message {
                 color: #ee5a5a;
                 background: #fff5f5;
                 padding: 15px;
                 border-radius: 8px;
                 margin: 20px 0;
-            }}
+            }
         </style>
     </head>
     <body>
         <div class="container">
             <div class="error-icon">&#10060;</div>
             <h1>Authentication Failed</h1>
-            <div class="error-message">{error_message}</div>
+            <div class="error-message">{ERROR}</div>
             <p>Please try again or contact support if the issue persists.</p>
         </div>
     </body>
@@ -163,6 +161,28 @@ def _create_error_html(error_message: str) -> str:
     """
 
 
+def _create_success_html(user_email: str) -> str:
+    """Create a success HTML page after OAuth completion."""
+    return _SUCCESS_TEMPLATE.replace("{EMAIL}", html.escape(user_email))
+
+
+def _create_error_html(error_message: str) -> str:
+    """Create an error HTML page."""
+    return _ERROR_TEMPLATE.replace("{ERROR}", html.escape(error_message))
+
+
+class _NotifyingServer(uvicorn.Server):
+    """uvicorn server that signals an event once it is accepting connections."""
+
+    def __init__(self, config: uvicorn.Config, started: threading.Event) -> None:
+        super().__init__(config)
+        self._started_event = started
+
+    async def startup(self, sockets: Optional[list] = None) -> None:
+        await super().startup(sockets=sockets)
+        self._started_event.set()
+
+
 class MinimalOAuthServer:
     """
     Minimal HTTP server for OAuth callbacks in stdio mode.
@@ -173,62 +193,61 @@ class MinimalOAuthServer:
         self.port = port
         self.base_uri = base_uri
         self.redirect_uri = f"{base_uri}:{port}/oauth2callback"
-        self.app = FastAPI()
+        self.app = Starlette(
+            routes=[Route("/oauth2callback", self._oauth_callback, methods=["GET"])]
+        )
         self.server: Optional[uvicorn.Server] = None
         self.server_thread: Optional[threading.Thread] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
         self.is_running = False
         self._auth_completed = False
 
-        self._setup_callback_route()
+    async def _oauth_callback(self, request: Request) -> HTMLResponse:
+        """Handle the OAuth redirect from Google."""
+        from .google_auth import handle_auth_callback
+
+        query_params = request.query_params
+        state = query_params.get("state")
+        code = query_params.get("code")
+        error = query_params.get("error")
+
+        if error:
+            error_message = f"Google returned an error: {error}"
+            logger.error(error_message)
+            return HTMLResponse(
+                content=_create_error_html(error_message), status_code=400
+            )
+
+        if not code:
+            error_message = "No authorization code received from Google"
+            logger.error(error_message)
+            return HTMLResponse(
+                content=_create_error_html(error_message), status_code=400
+            )
 
-    def _setup_callback_route(self) -> None:
-        server_instance = self
-
-        @self.app.get("/oauth2callback")
-        async def oauth_callback(request: Request) -> HTMLResponse:
-            from .google_auth import handle_auth_callback
-
-            state = request.query_params.get("state")
-            code = request.query_params.get("code")
-            error = request.query_params.get("error")
-
-            if error:
-                error_message = f"Google returned an error: {error}"
-                logger.error(error_message)
-                return HTMLResponse(
-                    content=_create_error_html(error_message), status_code=400
-                )
-
-            if not code:
-                error_message = "No authorization code received from Google"
-                logger.error(error_message)
-                return HTMLResponse(
-                    content=_create_error_html(error_message), status_code=400
-                )
+        try:
+            logger.info(f"OAuth callback: Received code (state: {state})")
 
-            try:
-                logger.info(f"OAuth callback: Received code (state: {state})")
+            user_email, credentials = handle_auth_callback(
+                scopes=get_scopes(),
+                authorization_response=str(request.url),
+                redirect_uri=self.redirect_uri,
+                session_id=None,
+            )
 
-                user_email, credentials = handle_auth_callback(
-                    scopes=get_scopes(),
-                    authorization_response=str(request.url),
-                    redirect_uri=server_instance.redirect_uri,
-                    session_id=None,
-                )
+            logger.info(f"OAuth callback: Successfully authenticated {user_email}")
+            self._auth_completed = True
 
-                logger.info(f"OAuth callback: Successfully authenticated {user_email}")
-                server_instance._auth_completed = True
+            asyncio.get_event_loop().call_later(2.0, self.stop)
 
-                asyncio.get_event_loop().call_later(2.0, server_instance.stop)
+            return HTMLResponse(content=_create_success_html(user_email))
 
-                return HTMLResponse(content=_create_success_html(user_email))
-
-            except Exception as e:
-                error_message = f"Error processing OAuth callback: {str(e)}"
-                logger.error(error_message, exc_info=True)
-                return HTMLResponse(
-                    content=_create_error_html(error_message), status_code=500
-                )
+        except Exception as e:
+            error_message = f"Error processing OAuth callback: {str(e)}"
+            logger.error(error_message, exc_info=True)
+            return HTMLResponse(
+                content=_create_error_html(error_message), status_code=500
+            )
 
     def start(self) -> Tuple[bool, str]:
         """
@@ -250,15 +269,19 @@ class MinimalOAuthServer:
         except Exception:
             hostname = "localhost"
 
-        # Check if port is available
+        # Check if port is available (uvicorn binds with SO_REUSEADDR as well,
+        # so a socket lingering in TIME_WAIT does not count as in use)
         try:
             with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+                s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
                 s.bind((hostname, self.port))
         except OSError:
             error_msg = f"Port {self.port} is already in use"
             logger.error(error_msg)
             return False, error_msg
 
+        started = threading.Event()
+
         def run_server() -> None:
             """Run the server in a separate thread."""
             try:
@@ -269,32 +292,33 @@ class MinimalOAuthServer:
                     log_level="warning",
                     access_log=False,
                 )
-                self.server = uvicorn.Server(config)
-                asyncio.run(self.server.serve())
-            except Exception as e:
+                self.server = _NotifyingServer(config, started)
+                loop = asyncio.new_event_loop()
+                asyncio.set_event_loop(loop)
+                self._loop = loop
+                try:
+                    loop.run_until_complete(self.server.serve())
+                finally:
+                    self._loop = None
+                    loop.close()
+            except BaseException as e:
+                # uvicorn exits via SystemExit when it cannot bind
                 logger.error(f"Minimal OAuth server error: {e}", exc_info=True)
                 self.is_running = False
+            finally:
+                # Unblock start() right away if startup never completed
+                started.set()
 
         # Start server in background thread
         self.server_thread = threading.Thread(target=run_server, daemon=True)
         self.server_thread.start()
 
-        # Wait for server to start
-        max_wait = 3.0
-        start_time = time.time()
-        while time.time() - start_time < max_wait:
-            try:
-                with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-                    result = s.connect_ex((hostname, self.port))
-                    if result == 0:
-                        self.is_running = True
-                        logger.info(
-                            f"Minimal OAuth server started on {hostname}:{self.port}"
-                        )
-                        return True, ""
-            except Exception:
-                pass
-            time.sleep(0.1)
+        # Wait for uvicorn to report that it is listening
+        started.wait(timeout=3.0)
+        if self.server is not None and self.server.started:
+            self.is_running = True
+            logger.info(f"Minimal OAuth server started on {hostname}:{self.port}")
+            return True, ""
 
         error_msg = f"Failed to start OAuth server on {hostname}:{self.port}"
         logger.error(error_msg)
@@ -306,10 +330,23 @@ class MinimalOAuthServer:
             return
 
         try:
-            if self.server and hasattr(self.server, "should_exit"):
-                self.server.should_exit = True
-
-            if self.server_thread and self.server_thread.is_alive():
+            loop = self._loop
+            if self.server is not None and loop is not None:
+                # Publish the exit flag from the server's own loop thread
+                try:
+                    loop.call_soon_threadsafe(
+                        setattr, self.server, "should_exit", True
+                    )
+                except RuntimeError:
+                    pass  # Loop already closed; the server has exited
+
+            # stop() is also scheduled on the server loop after a successful
+            # callback; the thread cannot join itself
+            if (
+                self.server_thread
+                and self.server_thread.is_alive()
+                and self.server_thread is not threading.current_thread()
+            ):
                 self.server_thread.join(timeout=3.0)
 
             self.is_running = False
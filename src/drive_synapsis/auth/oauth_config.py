@@ -6,7 +6,42 @@ Supports OAuth 2.1 with PKCE enforcement.
 """
 
 import os
-from typing import List, Optional, Dict, Any
+import threading
+from typing import List, Optional, Dict, Any, Tuple
+
+# secret file path -> (st_mtime_ns, stripped contents)
+_secret_file_cache: Dict[str, Tuple[int, str]] = {}
+
+
+def get_env_secret(name: str) -> Optional[str]:
+    """
+    Read a secret from the environment, supporting ``*_FILE`` indirection.
+
+    ``NAME`` takes precedence. Otherwise, if ``NAME_FILE`` points at a file
+    (e.g. a mounted Docker/Kubernetes secret), its stripped contents are
+    returned. File contents are cached until the file's mtime changes.
+    """
+    value = os.getenv(name)
+    if value:
+        return value
+
+    path = os.getenv(f"{name}_FILE")
+    if not path:
+        return None
+
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+        cached = _secret_file_cache.get(path)
+        if cached is not None and cached[0] == mtime_ns:
+            return cached[1]
+
+        with open(path, "r") as f:
+            value = f.read().strip()
+    except OSError:
+        return None
+
+    _secret_file_cache[path] = (mtime_ns, value)
+    return value or None
 
 
 class OAuthConfig:
@@ -16,6 +51,24 @@ class OAuthConfig:
     Provides a single source of truth for all OAuth-related configuration values.
     """
 
+    __slots__ = (
+        "base_uri",
+        "port",
+        "base_url",
+        "external_url",
+        "credentials_dir",
+        "client_id",
+        "client_secret",
+        "client_secrets_path",
+        "pkce_required",
+        "supported_code_challenge_methods",
+        "_transport_mode",
+        "redirect_uri",
+        "_redirect_uris",
+        "_client_secrets_found",
+        "_credentials_dir_ready",
+    )
+
     def __init__(self) -> None:
         # Base server configuration
         self.base_uri = os.getenv("DRIVE_SYNAPSIS_BASE_URI", "http://localhost")
@@ -31,8 +84,8 @@ class OAuthConfig:
         )
 
         # OAuth client configuration (from environment or client_secret.json)
-        self.client_id = os.getenv("GOOGLE_OAUTH_CLIENT_ID")
-        self.client_secret = os.getenv("GOOGLE_OAUTH_CLIENT_SECRET")
+        self.client_id = get_env_secret("GOOGLE_OAUTH_CLIENT_ID")
+        self.client_secret = get_env_secret("GOOGLE_OAUTH_CLIENT_SECRET")
 
         # Client secrets file path
         self.client_secrets_path = os.path.join(
@@ -48,6 +101,12 @@ class OAuthConfig:
 
         # Redirect URI configuration
         self.redirect_uri = self._get_redirect_uri()
+        self._redirect_uris = self._get_redirect_uris()
+
+        # Filesystem checks that only ever flip one way are remembered so
+        # accessors on the request path skip the stat() once they succeed.
+        self._client_secrets_found = False
+        self._credentials_dir_ready = False
 
     def _get_redirect_uri(self) -> str:
         """Get the OAuth redirect URI."""
@@ -67,8 +126,8 @@ class OAuthConfig:
             return self.external_url
         return self.base_url
 
-    def get_redirect_uris(self) -> List[str]:
-        """Get all valid OAuth redirect URIs."""
+    def _get_redirect_uris(self) -> Tuple[str, ...]:
+        """Collect the primary and custom redirect URIs, de-duplicated."""
         uris = [self.redirect_uri]
 
         # Custom redirect URIs from environment
@@ -76,14 +135,29 @@ class OAuthConfig:
         if custom_uris:
             uris.extend([uri.strip() for uri in custom_uris.split(",")])
 
-        return list(dict.fromkeys(uris))
+        return tuple(dict.fromkeys(uris))
+
+    def get_redirect_uris(self) -> List[str]:
+        """Get all valid OAuth redirect URIs."""
+        return list(self._redirect_uris)
 
     def is_configured(self) -> bool:
         """Check if OAuth is properly configured."""
         # Either environment variables or client_secret.json must exist
         if self.client_id and self.client_secret:
             return True
-        return os.path.exists(self.client_secrets_path)
+        # A missing file is re-checked each call so one dropped in after
+        # startup is picked up; a found one is not stat()ed again.
+        if not self._client_secrets_found:
+            self._client_secrets_found = os.path.exists(self.client_secrets_path)
+        return self._client_secrets_found
+
+    def ensure_credentials_dir(self) -> str:
+        """Create the credentials directory on first use and return it."""
+        if not self._credentials_dir_ready:
+            os.makedirs(self.credentials_dir, exist_ok=True)
+            self._credentials_dir_ready = True
+        return self.credentials_dir
 
     def set_transport_mode(self, mode: str) -> None:
         """Set the current transport mode."""
@@ -109,21 +183,27 @@ class OAuthConfig:
 
 # Global configuration instance
 _oauth_config: Optional[OAuthConfig] = None
+_oauth_config_lock = threading.Lock()
 
 
 def get_oauth_config() -> OAuthConfig:
     """Get the global OAuth configuration instance."""
     global _oauth_config
-    if _oauth_config is None:
-        _oauth_config = OAuthConfig()
-    return _oauth_config
+    config = _oauth_config
+    if config is None:
+        with _oauth_config_lock:
+            config = _oauth_config
+            if config is None:
+                config = _oauth_config = OAuthConfig()
+    return config
 
 
 def reload_oauth_config() -> OAuthConfig:
     """Reload the OAuth configuration from environment variables."""
     global _oauth_config
-    _oauth_config = OAuthConfig()
-    return _oauth_config
+    with _oauth_config_lock:
+        config = _oauth_config = OAuthConfig()
+    return config
 
 
 # Convenience functions
@@ -144,7 +224,4 @@ def is_oauth_configured() -> bool:
 
 def get_credentials_dir() -> str:
     """Get the credentials directory path."""
-    config = get_oauth_config()
-    if not os.path.exists(config.credentials_dir):
-        os.makedirs(config.credentials_dir, exist_ok=True)
-    return config.credentials_dir
+    return get_oauth_config().ensure_credentials_dir()
@@ -5,7 +5,7 @@ This module defines the OAuth scopes required for Google Drive, Docs, and Sheets
 """
 
 import logging
-from typing import List
+from typing import List, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -36,12 +36,24 @@ SHEETS_WRITE_SCOPE = "https://www.googleapis.com/auth/spreadsheets"
 SHEETS_SCOPES = [SHEETS_READONLY_SCOPE, SHEETS_WRITE_SCOPE]
 
 # Combined scopes for Drive Synapsis
-# We use the full access scopes for simplicity
-SCOPES = [
+# We use the full access scopes for simplicity. Kept as a tuple so callers
+# sharing the default cannot mutate it.
+SCOPES: Tuple[str, ...] = (
     DRIVE_SCOPE,  # Full Drive access
     DOCS_WRITE_SCOPE,  # Full Docs access
     SHEETS_WRITE_SCOPE,  # Full Sheets access
-] + BASE_SCOPES
+    *BASE_SCOPES,
+)
+
+# De-duplicated once at import; dict.fromkeys keeps the declared order.
+_UNIQUE_SCOPES: Tuple[str, ...] = tuple(dict.fromkeys(SCOPES))
+
+_MINIMAL_SCOPES: Tuple[str, ...] = (
+    DRIVE_READONLY_SCOPE,
+    DOCS_READONLY_SCOPE,
+    SHEETS_READONLY_SCOPE,
+    *BASE_SCOPES,
+)
 
 
 def get_scopes() -> List[str]:
@@ -49,9 +61,9 @@ def get_scopes() -> List[str]:
     Get the list of OAuth scopes required for Drive Synapsis.
 
     Returns:
-        List of unique OAuth scopes.
+        List of unique OAuth scopes, in declaration order.
     """
-    return list(set(SCOPES))
+    return list(_UNIQUE_SCOPES)
 
 
 def get_minimal_scopes() -> List[str]:
@@ -61,8 +73,4 @@ def get_minimal_scopes() -> List[str]:
     Returns:
         List of read-only OAuth scopes.
     """
-    return [
-        DRIVE_READONLY_SCOPE,
-        DOCS_READONLY_SCOPE,
-        SHEETS_READONLY_SCOPE,
-    ] + BASE_SCOPES
+    return list(_MINIMAL_SCOPES)
@@ -26,7 +26,7 @@ class GDriveClient(
     Combines all mixins to provide complete Google Drive, Docs, and Sheets
     functionality through a unified interface.
     """
-    pass
+    __slots__ = ()
 
 
 __all__ = ['GDriveClient']
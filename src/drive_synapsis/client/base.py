@@ -1,16 +1,61 @@
 """Base client with Google API service initialization."""
 
-from googleapiclient.discovery import build
+import os
+
+import httplib2
+from google_auth_httplib2 import AuthorizedHttp
+from googleapiclient.discovery import build_from_document
+from googleapiclient.http import build_http
 from google.oauth2.credentials import Credentials
-from typing import Any, Optional
+from typing import Any, Callable, Optional
+
+from ..auth.google_auth import (
+    get_creds,
+    get_credentials,
+    get_discovery_doc,
+    GoogleAuthenticationError,
+)
 
-from ..auth.google_auth import get_creds, get_credentials, GoogleAuthenticationError
+
+# Maximum number of calls per batch HTTP request (Drive's documented limit)
+BATCH_REQUEST_LIMIT = 100
 
 
 class GDriveClientBase:
     """Base class with Google API services."""
 
-    def __init__(self, credentials: Optional[Credentials] = None) -> None:
+    # Mixins declare empty __slots__ too, so client instances carry no
+    # per-instance __dict__.
+    __slots__ = (
+        "creds",
+        "_http_cache_dir",
+        "_drive_service",
+        "_docs_service",
+        "_sheets_service",
+        "_doc_cache",
+        "_section_starts",
+        "_folder_ids",
+        "_permission_ids",
+    )
+
+    def __init__(
+        self,
+        credentials: Optional[Credentials] = None,
+        cache_dir: Optional[str] = None,
+    ) -> None:
+        """Create a client.
+
+        Args:
+            credentials: Credentials to use instead of the stored ones.
+            cache_dir: Directory for httplib2's HTTP cache. Defaults to
+                DRIVE_SYNAPSIS_HTTP_CACHE_DIR; caching is off when neither is
+                set. Entries are keyed by URL only, so the directory must not
+                be shared between users. httplib2 drops the entry for a URL
+                after a write to it and revalidates stale entries with their
+                ETag; clear the directory to evict everything.
+        """
+        self._http_cache_dir = cache_dir or os.getenv("DRIVE_SYNAPSIS_HTTP_CACHE_DIR")
+
         if credentials:
             self.creds = credentials
         else:
@@ -18,9 +63,51 @@ class GDriveClientBase:
             if not self.creds:
                 self.creds = get_creds()
 
-        self.drive_service = build("drive", "v3", credentials=self.creds)
-        self.docs_service = build("docs", "v1", credentials=self.creds)
-        self.sheets_service = build("sheets", "v4", credentials=self.creds)
+        self._drive_service = None
+        self._docs_service = None
+        self._sheets_service = None
+
+        # file_id -> (Drive version, Docs API document resource)
+        self._doc_cache: dict[str, tuple[int, dict[str, Any]]] = {}
+        # file_id -> (body content list, startIndex of each item)
+        self._section_starts: dict[str, tuple[list, list[int]]] = {}
+        # folder name -> folder ID, for get_folder_id()
+        self._folder_ids: dict[str, str] = {}
+        # (file_id, email) -> permission ID, for revoke_access()
+        self._permission_ids: dict[tuple[str, str], str] = {}
+
+    # Services are built on first use from the discovery documents bundled
+    # with googleapiclient, parsed once per process; most callers only ever
+    # touch one API.
+    @property
+    def drive_service(self) -> Any:
+        service = self._drive_service
+        if service is None:
+            service = self._drive_service = self._build_service("drive", "v3")
+        return service
+
+    @property
+    def docs_service(self) -> Any:
+        service = self._docs_service
+        if service is None:
+            service = self._docs_service = self._build_service("docs", "v1")
+        return service
+
+    @property
+    def sheets_service(self) -> Any:
+        service = self._sheets_service
+        if service is None:
+            service = self._sheets_service = self._build_service("sheets", "v4")
+        return service
+
+    def _build_service(self, name: str, version: str) -> Any:
+        doc = get_discovery_doc(name, version)
+        if not self._http_cache_dir:
+            return build_from_document(doc, credentials=self.creds)
+
+        http = build_http()
+        http.cache = httplib2.FileCache(self._http_cache_dir)
+        return build_from_document(doc, http=AuthorizedHttp(self.creds, http=http))
 
     def get_file_version(self, file_id: str) -> int:
         file_meta = (
@@ -37,3 +124,14 @@ class GDriveClientBase:
             )
             .execute()
         )
+
+    @staticmethod
+    def _execute_batched(
+        service: Any, requests: list[tuple[str, Any]], callback: Callable
+    ) -> None:
+        """Execute (request_id, request) pairs in batches of BATCH_REQUEST_LIMIT."""
+        for start in range(0, len(requests), BATCH_REQUEST_LIMIT):
+            batch = service.new_batch_http_request(callback=callback)
+            for request_id, request in requests[start : start + BATCH_REQUEST_LIMIT]:
+                batch.add(request, request_id=request_id)
+            batch.execute()
@@ -5,6 +5,8 @@ from typing import Optional, Any
 class CommentsMixin:
     """Mixin providing comment-related operations."""
     
+    __slots__ = ()
+    
     def get_file_comments(self, file_id: str) -> list[dict[str, Any]]:
         """Fetch all comments for a file.
         
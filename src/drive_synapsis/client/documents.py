@@ -1,25 +1,75 @@
 """Document operations mixin for GDriveClient."""
-from googleapiclient.http import MediaIoBaseDownload, MediaIoBaseUpload
+from googleapiclient.http import MediaIoBaseUpload
 from ..html_converter import convert_html_to_markdown
 from ..utils.constants import DEFAULT_SHEET_RANGE, EXPORT_MIME_TYPES
 from typing import Any, Optional
+import bisect
 import io
-import json
+
+import orjson
+
+
+# Maximum number of document structures kept per client
+DOC_CACHE_SIZE = 128
+
+# Docs namedStyleType -> outline level
+_HEADING_LEVELS = {f'HEADING_{level}': level for level in range(1, 7)}
 
 
 class DocumentsMixin:
     """Mixin providing document-related operations."""
     
+    __slots__ = ()
+    
     def get_doc_structure(self, file_id: str) -> dict[str, Any]:
         """Fetch the full document structure including tabs.
         
+        The structure is cached per Drive file version, so repeated reads of
+        an unchanged document cost a metadata request instead of a full
+        document download.
+        
         Args:
             file_id: The document ID.
             
         Returns:
             Raw JSON resource from Docs API.
         """
-        return self.docs_service.documents().get(documentId=file_id).execute()
+        version = self.get_file_version(file_id)
+        cached = self._doc_cache.get(file_id)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        
+        doc = self.docs_service.documents().get(documentId=file_id).execute()
+        
+        self.invalidate_doc_cache(file_id)
+        if len(self._doc_cache) >= DOC_CACHE_SIZE:
+            # Evict the least recently stored entry
+            self.invalidate_doc_cache(next(iter(self._doc_cache)))
+        self._doc_cache[file_id] = (version, doc)
+        return doc
+
+    def invalidate_doc_cache(self, file_id: str) -> None:
+        """Drop the cached structure of a document after modifying it.
+        
+        Args:
+            file_id: The document ID.
+        """
+        self._doc_cache.pop(file_id, None)
+        self._section_starts.pop(file_id, None)
+
+    def _content_starts(self, file_id: str, content_list: list) -> list[int]:
+        """Return the start indices of ``content_list``, cached per document.
+        
+        Entries are keyed by file ID and tied to the content list they were
+        built from, so a refetched structure gets a fresh index.
+        """
+        cached = self._section_starts.get(file_id)
+        if cached is not None and cached[0] is content_list:
+            return cached[1]
+        
+        starts = [item.get('startIndex', 0) for item in content_list]
+        self._section_starts[file_id] = (content_list, starts)
+        return starts
 
     def extract_text_from_element(self, element: list) -> str:
         """Recursively extract text from a Google Doc Content Element List.
@@ -30,20 +80,23 @@ class DocumentsMixin:
         Returns:
             Extracted text string.
         """
-        text = ""
+        parts: list[str] = []
+        self._extract_text_into(element, parts)
+        return "".join(parts)
+
+    def _extract_text_into(self, element: list, parts: list[str]) -> None:
+        """Append the text of a content element list to ``parts``."""
         for item in element:
             if 'paragraph' in item:
                 for elem in item['paragraph']['elements']:
                     if 'textRun' in elem:
-                        text += elem['textRun']['content']
+                        parts.append(elem['textRun']['content'])
             elif 'table' in item:
                 for row in item['table']['tableRows']:
                     for cell in row['tableCells']:
-                        text += self.extract_text_from_element(cell['content']) + " | "
-                    text += "\n"
-            elif 'sectionBreak' in item:
-                pass
-        return text
+                        self._extract_text_into(cell['content'], parts)
+                        parts.append(" | ")
+                    parts.append("\n")
 
     def get_document_outline(self, file_id: str) -> list[dict[str, Any]]:
         """Extract the document outline (headings H1-H6).
@@ -63,21 +116,22 @@ class DocumentsMixin:
         else:
             content_list = doc.get('body', {}).get('content', [])
         
+        heading_levels = _HEADING_LEVELS
         for item in content_list:
             if 'paragraph' in item:
                 para = item['paragraph']
-                style = para.get('paragraphStyle', {})
-                heading_id = style.get('namedStyleType', '')
+                heading_id = para.get('paragraphStyle', {}).get('namedStyleType', '')
+                
+                level = heading_levels.get(heading_id)
+                if level is None and heading_id.startswith('HEADING_'):
+                    level = 0
                 
-                if heading_id.startswith('HEADING_'):
-                    level = int(heading_id.split('_')[1]) if heading_id.split('_')[1].isdigit() else 0
-                    
-                    text = ""
-                    for elem in para.get('elements', []):
-                        if 'textRun' in elem:
-                            text += elem['textRun']['content']
-                    
-                    text = text.strip()
+                if level is not None:
+                    text = "".join(
+                        elem['textRun']['content']
+                        for elem in para.get('elements', [])
+                        if 'textRun' in elem
+                    ).strip()
                     if text:
                         outline.append({
                             'level': level,
@@ -107,12 +161,16 @@ class DocumentsMixin:
         else:
             content_list = doc.get('body', {}).get('content', [])
         
-        section_items = []
-        for item in content_list:
-            item_start = item.get('startIndex', 0)
-            item_end = item.get('endIndex', 0)
-            if item_start < end_index and item_end > start_index:
-                section_items.append(item)
+        # Body content is ordered by startIndex, so only items from the one
+        # containing start_index up to end_index can overlap the section.
+        starts = self._content_starts(file_id, content_list)
+        first = max(bisect.bisect_right(starts, start_index) - 1, 0)
+        last = bisect.bisect_left(starts, end_index, first)
+        
+        section_items = [
+            item for item in content_list[first:last]
+            if item.get('endIndex', 0) > start_index
+        ]
         
         return self.extract_text_from_element(section_items)
 
@@ -128,26 +186,10 @@ class DocumentsMixin:
         file_meta = self.drive_service.files().get(fileId=file_id, fields="id, name, mimeType").execute()
         mime_type = file_meta.get('mimeType')
         
-        content = None
-        
         if mime_type == 'application/vnd.google-apps.document':
-            request = self.drive_service.files().export_media(fileId=file_id, mimeType='text/markdown')
-            fh = io.BytesIO()
-            downloader = MediaIoBaseDownload(fh, request)
-            done = False
-            while done is False:
-                status, done = downloader.next_chunk()
-            content = fh.getvalue().decode('utf-8')
-            
+            content = self._download_media(file_id, 'text/markdown', 'utf-8')
         elif mime_type == 'application/vnd.google-apps.spreadsheet':
-            request = self.drive_service.files().export_media(fileId=file_id, mimeType='text/csv')
-            fh = io.BytesIO()
-            downloader = MediaIoBaseDownload(fh, request)
-            done = False
-            while done is False:
-                status, done = downloader.next_chunk()
-            content = fh.getvalue().decode('utf-8')
-            
+            content = self._download_media(file_id, 'text/csv', 'utf-8')
         else:
             return f"[UNSUPPORTED MIME TYPE: {mime_type}]"
 
@@ -167,19 +209,15 @@ class DocumentsMixin:
             'name': title,
             'mimeType': 'application/vnd.google-apps.document'
         }
-        file = self.drive_service.files().create(body=file_metadata, fields='id').execute()
-        file_id = file.get('id')
-        
-        requests = [{
-            'insertText': {
-                'location': {'index': 1},
-                'text': text
-            }
-        }]
-        
-        self.docs_service.documents().batchUpdate(
-            documentId=file_id, body={'requests': requests}
+        # Upload the text as the file body and let Drive convert it, so the
+        # document is created with its content in one multipart request.
+        media = MediaIoBaseUpload(
+            io.BytesIO(text.encode('utf-8')), mimetype='text/plain', resumable=False
+        )
+        file = self.drive_service.files().create(
+            body=file_metadata, media_body=media, fields='id'
         ).execute()
+        file_id = file.get('id')
             
         return f"Document created successfully. ID: {file_id}"
 
@@ -199,6 +237,7 @@ class DocumentsMixin:
             body=body,
             media_body=media,
         ).execute()
+        self.invalidate_doc_cache(file_id)
 
     def update_tab_content(self, file_id: str, tab_id: str, text: str) -> str:
         """Replace the content of a specific tab with plain text.
@@ -211,7 +250,7 @@ class DocumentsMixin:
         Returns:
             Success message.
         """
-        doc = self.docs_service.documents().get(documentId=file_id).execute()
+        doc = self.get_doc_structure(file_id)
         
         tabs = doc.get('tabs', [])
         target_tab = next((t for t in tabs if t['tabProperties']['tabId'] == tab_id), None)
@@ -249,6 +288,7 @@ class DocumentsMixin:
         self.docs_service.documents().batchUpdate(
             documentId=file_id, body={'requests': requests}
         ).execute()
+        self.invalidate_doc_cache(file_id)
         
         return f"Updated tab {tab_id} in document {file_id}"
 
@@ -262,13 +302,11 @@ class DocumentsMixin:
         Returns:
             Success message.
         """
-        doc = self.docs_service.documents().get(documentId=file_id).execute()
-        content_list = doc.get('body').get('content')
-        end_index = content_list[-1].get('endIndex') - 1
-
+        # endOfSegmentLocation lets the API resolve the end of the body, so
+        # the document does not need to be fetched first.
         requests = [{
             'insertText': {
-                'location': {'index': end_index},
+                'endOfSegmentLocation': {},
                 'text': text
             }
         }]
@@ -276,6 +314,7 @@ class DocumentsMixin:
         self.docs_service.documents().batchUpdate(
             documentId=file_id, body={'requests': requests}
         ).execute()
+        self.invalidate_doc_cache(file_id)
         
         return f"Appended text to document {file_id}"
 
@@ -291,19 +330,59 @@ class DocumentsMixin:
         Returns:
             Message with replacement count.
         """
-        requests = [{
-            'replaceAllText': {
-                'containsText': {'text': find, 'matchCase': match_case},
-                'replaceText': replace
-            }
-        }]
+        replacements = self._replace_all_text(file_id, {find: replace}, match_case)[0]
+        return f"Replaced {replacements} occurrence(s) of '{find}' with '{replace}'"
+
+    def replace_texts_in_doc(self, file_id: str, replacements: dict[str, str], match_case: bool = False) -> str:
+        """Apply several find/replace pairs to a Google Doc in one request.
+        
+        Args:
+            file_id: The document ID.
+            replacements: Dict of text to find -> replacement text.
+            match_case: Whether search is case-sensitive.
+            
+        Returns:
+            Message with the total replacement count.
+        """
+        if not replacements:
+            return "No replacements given"
+        
+        total = sum(self._replace_all_text(file_id, replacements, match_case))
+        return f"Replaced {total} occurrence(s) across {len(replacements)} search term(s)"
+
+    def _replace_all_text(self, file_id: str, replacements: dict[str, str], match_case: bool) -> list[int]:
+        """Send one replaceAllText request per pair in a single batchUpdate.
+        
+        Args:
+            file_id: The document ID.
+            replacements: Dict of text to find -> replacement text.
+            match_case: Whether search is case-sensitive.
+            
+        Returns:
+            Number of occurrences changed for each pair, in order.
+        """
+        requests = self._replace_all_requests(replacements, match_case)
         
         result = self.docs_service.documents().batchUpdate(
             documentId=file_id, body={'requests': requests}
         ).execute()
+        self.invalidate_doc_cache(file_id)
         
-        replacements = result.get('replies', [{}])[0].get('replaceAllText', {}).get('occurrencesChanged', 0)
-        return f"Replaced {replacements} occurrence(s) of '{find}' with '{replace}'"
+        replies = result.get('replies', [])
+        return [
+            reply.get('replaceAllText', {}).get('occurrencesChanged', 0)
+            for reply in replies
+        ] or [0] * len(requests)
+
+    @staticmethod
+    def _replace_all_requests(replacements: dict[str, str], match_case: bool) -> list[dict[str, Any]]:
+        """Build one replaceAllText request per find/replace pair."""
+        return [{
+            'replaceAllText': {
+                'containsText': {'text': find, 'matchCase': match_case},
+                'replaceText': replace
+            }
+        } for find, replace in replacements.items()]
 
     def insert_table(self, file_id: str, rows: int, cols: int, index: int = 1) -> str:
         """Insert a table into a Google Doc.
@@ -328,6 +407,7 @@ class DocumentsMixin:
         self.docs_service.documents().batchUpdate(
             documentId=file_id, body={'requests': requests}
         ).execute()
+        self.invalidate_doc_cache(file_id)
         
         return f"Inserted {rows}x{cols} table at index {index}"
 
@@ -346,25 +426,75 @@ class DocumentsMixin:
         new_file = self.drive_service.files().copy(fileId=template_id, body=copy_body).execute()
         new_file_id = new_file.get('id')
 
-        requests = []
-        for key, value in replacements.items():
-            requests.append({
-                'replaceAllText': {
-                    'containsText': {'text': key, 'matchCase': True},
-                    'replaceText': value
-                }
-            })
-            
-        if requests:
-            self.docs_service.documents().batchUpdate(
-                documentId=new_file_id, body={'requests': requests}
-            ).execute()
+        if replacements:
+            self._replace_all_text(new_file_id, replacements, match_case=True)
                 
         return f"Created document '{title}' from template. ID: {new_file_id}"
 
+    def create_from_template_many(self, template_id: str, jobs: list[tuple[str, dict]]) -> list[str]:
+        """Create several docs from one template using batched requests.
+        
+        All copies are sent in batch HTTP requests first, then all
+        replacements, so N documents cost about two round-trips instead
+        of 2N. A failure only affects its own job.
+        
+        Args:
+            template_id: The template document ID.
+            jobs: List of (title, replacements) pairs, one per new document.
+            
+        Returns:
+            One result message per job, in order.
+        """
+        new_ids: dict[str, str] = {}
+        errors: dict[str, Exception] = {}
+        
+        def on_copy(request_id, response, exception):
+            if exception is not None:
+                errors[request_id] = exception
+            else:
+                new_ids[request_id] = response['id']
+        
+        def on_update(request_id, response, exception):
+            if exception is not None:
+                errors[request_id] = exception
+        
+        copies = [
+            (str(i), self.drive_service.files().copy(fileId=template_id, body={'name': title}))
+            for i, (title, _) in enumerate(jobs)
+        ]
+        self._execute_batched(self.drive_service, copies, on_copy)
+        
+        updates = [
+            (request_id, self.docs_service.documents().batchUpdate(
+                documentId=new_ids[request_id],
+                body={'requests': self._replace_all_requests(jobs[int(request_id)][1], True)}
+            ))
+            for request_id in new_ids
+            if jobs[int(request_id)][1]
+        ]
+        self._execute_batched(self.docs_service, updates, on_update)
+        
+        results = []
+        for i, (title, _) in enumerate(jobs):
+            request_id = str(i)
+            new_file_id = new_ids.get(request_id)
+            if request_id not in errors:
+                results.append(f"Created document '{title}' from template. ID: {new_file_id}")
+            elif new_file_id:
+                results.append(
+                    f"Created document '{title}' (ID: {new_file_id}) but replacements failed: {errors[request_id]}"
+                )
+            else:
+                results.append(f"Failed to create document '{title}': {errors[request_id]}")
+        return results
+
     def _download_media(self, file_id: str, mime_type: str, encoding: Optional[str] = None):
         """Helper for media download.
         
+        Exports are fetched with a single GET: Drive caps export size at
+        10 MB, so a chunked MediaIoBaseDownload loop only adds round-trips
+        and an intermediate buffer copy.
+        
         Args:
             file_id: The file ID.
             mime_type: Target MIME type.
@@ -374,15 +504,11 @@ class DocumentsMixin:
             Bytes or decoded string.
         """
         request = self.drive_service.files().export_media(fileId=file_id, mimeType=mime_type)
-        fh = io.BytesIO()
-        downloader = MediaIoBaseDownload(fh, request)
-        done = False
-        while done is False:
-            status, done = downloader.next_chunk()
+        content = request.execute()
             
         if encoding:
-            return fh.getvalue().decode(encoding)
-        return fh.getvalue()
+            return content.decode(encoding)
+        return content
 
     def download_doc(self, file_id: str, format_type: str = 'markdown') -> str:
         """Download Google Doc/Sheet content in specified format.
@@ -394,19 +520,8 @@ class DocumentsMixin:
         Returns:
             Content in requested format.
         """
-        mime_map = {
-            'pdf': 'application/pdf',
-            'docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
-            'html': 'text/html',
-            'rtf': 'application/rtf',
-            'odt': 'application/vnd.oasis.opendocument.text',
-            'markdown': 'text/markdown',
-            'csv': 'text/csv',
-            'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-            'json': 'application/json'
-        }
-
-        target_mime = mime_map.get(format_type.lower())
+        format_key = format_type.lower()
+        target_mime = EXPORT_MIME_TYPES.get(format_key)
         if not target_mime:
             raise ValueError(f"Unsupported format: {format_type}")
         
@@ -414,14 +529,14 @@ class DocumentsMixin:
         source_mime = file_meta.get('mimeType')
 
         # Special Case: Markdown via HTML
-        if format_type == 'markdown' and source_mime == 'application/vnd.google-apps.document':
+        if format_key == 'markdown' and source_mime == 'application/vnd.google-apps.document':
             html_content = self._download_media(file_id, 'text/html', 'utf-8')
             if not html_content:
                 return ""
             return convert_html_to_markdown(html_content)
 
         # Special Case: JSON for Sheets
-        if format_type == 'json' and source_mime == 'application/vnd.google-apps.spreadsheet':
+        if format_key == 'json' and source_mime == 'application/vnd.google-apps.spreadsheet':
             result = self.sheets_service.spreadsheets().values().get(
                 spreadsheetId=file_id, range=DEFAULT_SHEET_RANGE
             ).execute()
@@ -429,10 +544,14 @@ class DocumentsMixin:
             if not values:
                 return "[]"
             headers = values[0]
+            width = len(headers)
             data = []
             for row in values[1:]:
-                item = {h: (row[i] if i < len(row) else "") for i, h in enumerate(headers)}
+                item = dict(zip(headers, row))
+                # The API omits trailing empty cells; pad them back in.
+                if len(row) < width:
+                    item.update(dict.fromkeys(headers[len(row):], ""))
                 data.append(item)
-            return json.dumps(data, indent=2)
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode('utf-8')
 
         return self._download_media(file_id, target_mime, encoding='utf-8')
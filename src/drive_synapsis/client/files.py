@@ -1,24 +1,41 @@
 """File management mixin for GDriveClient."""
 from googleapiclient.http import MediaFileUpload
 from typing import Optional, Any
+import mimetypes
 import os
 
+from ..utils.constants import DEFAULT_UPLOAD_CHUNK_SIZE, RESUMABLE_UPLOAD_THRESHOLD
+
+
+def _media_upload(local_path: str, chunksize: int) -> MediaFileUpload:
+    """Build the upload for a local file, resumable only when it is large."""
+    mimetype = mimetypes.guess_type(local_path)[0]
+    if os.path.getsize(local_path) < RESUMABLE_UPLOAD_THRESHOLD:
+        return MediaFileUpload(local_path, mimetype=mimetype, resumable=False)
+    return MediaFileUpload(local_path, mimetype=mimetype, chunksize=chunksize, resumable=True)
+
 
 class FilesMixin:
     """Mixin providing file management operations."""
     
-    def move_file(self, file_id: str, new_folder_id: str) -> str:
+    __slots__ = ()
+    
+    def move_file(self, file_id: str, new_folder_id: str, previous_parents: Optional[list[str]] = None) -> str:
         """Move a file to a different folder.
         
         Args:
             file_id: The file ID.
             new_folder_id: Destination folder ID.
+            previous_parents: Current parent IDs, if already known (e.g. from
+                a search result). Saves the request that looks them up.
             
         Returns:
             Success message.
         """
-        file = self.drive_service.files().get(fileId=file_id, fields='parents').execute()
-        previous_parents = ",".join(file.get('parents', []))
+        if previous_parents is None:
+            file = self.drive_service.files().get(fileId=file_id, fields='parents').execute()
+            previous_parents = file.get('parents', [])
+        previous_parents = ",".join(previous_parents)
         
         self.drive_service.files().update(
             fileId=file_id,
@@ -43,6 +60,7 @@ class FilesMixin:
             fileId=file_id,
             body={'name': new_name}
         ).execute()
+        self.invalidate_folder_cache(file_id)
         
         return f"Renamed to '{new_name}'"
 
@@ -56,6 +74,7 @@ class FilesMixin:
         Returns:
             Success message.
         """
+        self.invalidate_folder_cache(file_id)
         if permanent:
             self.drive_service.files().delete(fileId=file_id).execute()
             return "Permanently deleted"
@@ -123,12 +142,21 @@ class FilesMixin:
         
         return "Updated description"
 
-    def upload_file(self, local_path: str, parent_id: Optional[str] = None) -> dict[str, Any]:
+    def upload_file(
+        self,
+        local_path: str,
+        parent_id: Optional[str] = None,
+        chunksize: int = DEFAULT_UPLOAD_CHUNK_SIZE
+    ) -> dict[str, Any]:
         """Upload any file to Drive.
         
+        Files under RESUMABLE_UPLOAD_THRESHOLD are sent in one request;
+        larger files use a resumable upload.
+        
         Args:
             local_path: Path to local file.
             parent_id: Optional parent folder ID.
+            chunksize: Bytes per request for resumable uploads.
             
         Returns:
             File metadata dictionary.
@@ -138,7 +166,7 @@ class FilesMixin:
         if parent_id:
             file_metadata['parents'] = [parent_id]
             
-        media = MediaFileUpload(local_path, resumable=True)
+        media = _media_upload(local_path, chunksize)
         
         file = self.drive_service.files().create(
             body=file_metadata,
@@ -148,14 +176,20 @@ class FilesMixin:
         
         return file
 
-    def update_file_media(self, file_id: str, local_path: str) -> None:
+    def update_file_media(
+        self,
+        file_id: str,
+        local_path: str,
+        chunksize: int = DEFAULT_UPLOAD_CHUNK_SIZE
+    ) -> None:
         """Update the content of an existing file.
         
         Args:
             file_id: The file ID.
             local_path: Path to local file with new content.
+            chunksize: Bytes per request for resumable uploads.
         """
-        media = MediaFileUpload(local_path, resumable=True)
+        media = _media_upload(local_path, chunksize)
         
         self.drive_service.files().update(
             fileId=file_id,
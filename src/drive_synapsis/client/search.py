@@ -1,12 +1,100 @@
 """Search operations mixin for GDriveClient."""
-from typing import Optional, Any
-from ..utils.constants import DEFAULT_SNIPPET_LENGTH, DEFAULT_MAX_WORKERS, GOOGLE_MIME_TYPES
+from types import MappingProxyType
+from typing import Iterator, Optional, Any
+from ..auth.google_auth import refresh_credentials
+from ..utils.constants import DEFAULT_SNIPPET_LENGTH, DEFAULT_SNIPPET_CONCURRENCY, GOOGLE_MIME_TYPES
+import asyncio
 import concurrent.futures
 
 
+# Maximum number of folder name lookups remembered per client
+FOLDER_CACHE_SIZE = 256
+
+# search_files_advanced() file_type -> query clause, built once
+_MIME_FILTERS = MappingProxyType({
+    file_type: (
+        f"mimeType contains '{mime}'" if file_type == 'image' else f"mimeType = '{mime}'"
+    )
+    for file_type, mime in GOOGLE_MIME_TYPES.items()
+})
+
+
+# Fields returned for search hits; parents feeds SearchManager's cache
+_LIST_FIELDS = "nextPageToken, files(id, name, mimeType, webViewLink, modifiedTime, parents)"
+
+
+def _escape_drive_literal(value: str) -> str:
+    """Escape a value for use inside a quoted Drive query string."""
+    return value.replace('\\', '\\\\').replace("'", "\\'")
+
+
+def _build_query(
+    text: Optional[str] = None,
+    name: Optional[str] = None,
+    parent: Optional[str] = None,
+    mime_filter: Optional[str] = None,
+    modified_after: Optional[str] = None,
+    owner: Optional[str] = None
+) -> str:
+    """Build a Drive query for non-trashed files from escaped user values.
+    
+    Clauses always appear in the same order, so equal filters produce
+    byte-identical queries.
+    
+    Args:
+        text: Match against file names and full text.
+        name: Exact file name.
+        parent: Parent folder ID.
+        mime_filter: A prebuilt mimeType clause from _MIME_FILTERS.
+        modified_after: ISO date; only files modified after it.
+        owner: Owner to require, e.g. 'me'.
+    """
+    clauses = []
+    if parent is not None:
+        clauses.append(f"'{_escape_drive_literal(parent)}' in parents")
+    if name is not None:
+        clauses.append(f"name = '{_escape_drive_literal(name)}'")
+    if text is not None:
+        text = _escape_drive_literal(text)
+        clauses.append(f"(name contains '{text}' or fullText contains '{text}')")
+    if mime_filter:
+        clauses.append(mime_filter)
+    if modified_after:
+        clauses.append(f"modifiedTime > '{_escape_drive_literal(modified_after)}T00:00:00'")
+    if owner is not None:
+        clauses.append(f"'{_escape_drive_literal(owner)}' in owners")
+    clauses.append("trashed = false")
+    return ' and '.join(clauses)
+
+
+DRIVE_FILES_URL = 'https://www.googleapis.com/drive/v3/files'
+
+# Export format used for snippets, matching read_file()
+_SNIPPET_EXPORT_TYPES = {
+    GOOGLE_MIME_TYPES['doc']: 'text/markdown',
+    GOOGLE_MIME_TYPES['sheet']: 'text/csv',
+}
+
+# Line breaks and tabs become spaces. These bytes never occur inside a
+# multi-byte UTF-8 sequence, so the raw export can be translated before
+# decoding.
+_SNIPPET_WHITESPACE = bytes.maketrans(b'\n\r\t', b'   ')
+
+
+def _snippet_byte_limit(length: int) -> int:
+    """Bytes of an export that cover a snippet of ``length`` characters.
+    
+    A UTF-8 character is at most 4 bytes, so this many bytes always decode
+    to more than ``length`` characters when the export is longer.
+    """
+    return 4 * (length + 1)
+
+
 class SearchMixin:
     """Mixin providing search-related operations."""
     
+    __slots__ = ()
+    
     def search_files(self, query: str, limit: int = 10) -> list[dict[str, Any]]:
         """Search for files using Drive Query Language.
         
@@ -17,12 +105,12 @@ class SearchMixin:
         Returns:
             List of file metadata dictionaries.
         """
-        drive_query = f"(name contains '{query}' or fullText contains '{query}') and trashed = false"
+        drive_query = _build_query(text=query)
         
         results = self.drive_service.files().list(
             q=drive_query,
             pageSize=limit,
-            fields="nextPageToken, files(id, name, mimeType, webViewLink, modifiedTime, parents)"
+            fields=_LIST_FIELDS
         ).execute()
         
         return results.get('files', [])
@@ -39,7 +127,8 @@ class SearchMixin:
         
         Args:
             query: Search query.
-            file_type: 'doc', 'sheet', 'folder', 'pdf', etc.
+            file_type: A GOOGLE_MIME_TYPES key: 'doc', 'sheet', 'folder',
+                'presentation', 'form', 'pdf' or 'image'.
             modified_after: ISO date string (e.g. '2024-01-01').
             owner: 'me' or 'anyone'.
             limit: Max results.
@@ -47,36 +136,17 @@ class SearchMixin:
         Returns:
             List of file metadata dictionaries.
         """
-        query_parts = [f"(name contains '{query}' or fullText contains '{query}')"]
-        query_parts.append("trashed = false")
-        
-        if file_type:
-            mime_map = {
-                'doc': 'application/vnd.google-apps.document',
-                'sheet': 'application/vnd.google-apps.spreadsheet',
-                'folder': 'application/vnd.google-apps.folder',
-                'pdf': 'application/pdf',
-                'image': 'image/',
-            }
-            if file_type in mime_map:
-                mime = mime_map[file_type]
-                if file_type == 'image':
-                    query_parts.append(f"mimeType contains '{mime}'")
-                else:
-                    query_parts.append(f"mimeType = '{mime}'")
-        
-        if modified_after:
-            query_parts.append(f"modifiedTime > '{modified_after}T00:00:00'")
-        
-        if owner == 'me':
-            query_parts.append("'me' in owners")
-        
-        drive_query = ' and '.join(query_parts)
+        drive_query = _build_query(
+            text=query,
+            mime_filter=_MIME_FILTERS.get(file_type) if file_type else None,
+            modified_after=modified_after,
+            owner='me' if owner == 'me' else None
+        )
         
         results = self.drive_service.files().list(
             q=drive_query,
             pageSize=limit,
-            fields="nextPageToken, files(id, name, mimeType, webViewLink, modifiedTime, parents)"
+            fields=_LIST_FIELDS
         ).execute()
         
         return results.get('files', [])
@@ -92,7 +162,7 @@ class SearchMixin:
         Returns:
             List of file metadata dictionaries.
         """
-        drive_query = f"'{folder_id}' in parents and (name contains '{query}' or fullText contains '{query}') and trashed = false"
+        drive_query = _build_query(text=query, parent=folder_id)
         
         results = self.drive_service.files().list(
             q=drive_query,
@@ -111,84 +181,215 @@ class SearchMixin:
         Returns:
             The folder ID or None if not found.
         """
-        drive_query = f"name = '{folder_name}' and mimeType = 'application/vnd.google-apps.folder' and trashed = false"
+        folder_id = self._folder_ids.get(folder_name)
+        if folder_id is not None:
+            return folder_id
+        
+        drive_query = _build_query(name=folder_name, mime_filter=_MIME_FILTERS['folder'])
         results = self.drive_service.files().list(q=drive_query, fields="files(id)").execute()
         files = results.get('files', [])
-        return files[0]['id'] if files else None
+        if not files:
+            # Misses are not cached: the folder may be created later.
+            return None
+        
+        folder_id = files[0]['id']
+        if len(self._folder_ids) >= FOLDER_CACHE_SIZE:
+            del self._folder_ids[next(iter(self._folder_ids))]
+        self._folder_ids[folder_name] = folder_id
+        return folder_id
 
-    def list_folder_contents(self, folder_id: str) -> list[dict[str, Any]]:
+    def invalidate_folder_cache(self, file_id: str) -> None:
+        """Forget any folder name lookups that resolved to a file.
+        
+        Args:
+            file_id: The ID of a renamed, trashed or deleted file.
+        """
+        stale = [name for name, folder_id in self._folder_ids.items() if folder_id == file_id]
+        for name in stale:
+            del self._folder_ids[name]
+
+    def list_folder_contents(self, folder_id: str, fields: str = 'id, name, mimeType') -> list[dict[str, Any]]:
         """List all children of a folder (non-recursive).
         
         Args:
             folder_id: The folder ID.
+            fields: File fields to return for each child.
             
         Returns:
             List of file metadata dictionaries.
         """
-        drive_query = f"'{folder_id}' in parents and trashed = false"
-        all_files = []
+        return list(self.iter_folder_contents(folder_id, fields))
+
+    def iter_folder_contents(self, folder_id: str, fields: str = 'id, name, mimeType') -> Iterator[dict[str, Any]]:
+        """Yield the children of a folder page by page (non-recursive).
+        
+        Pages are requested at the API's maximum size of 1000, so callers
+        that stop early also skip the remaining pages.
+        
+        Args:
+            folder_id: The folder ID.
+            fields: File fields to return for each child.
+            
+        Yields:
+            File metadata dictionaries.
+        """
+        drive_query = _build_query(parent=folder_id)
         page_token = None
         
         while True:
             results = self.drive_service.files().list(
                 q=drive_query,
-                pageSize=100,
-                fields="nextPageToken, files(id, name, mimeType)",
+                pageSize=1000,
+                fields=f"nextPageToken, files({fields})",
                 pageToken=page_token
             ).execute()
-            all_files.extend(results.get('files', []))
+            yield from results.get('files', [])
             page_token = results.get('nextPageToken')
             if not page_token:
                 break
-                
-        return all_files
 
     def get_file_snippet(self, file_id: str, length: int = DEFAULT_SNIPPET_LENGTH) -> str:
         """Get a short snippet of the file content.
         
+        Uses the sync Drive service; batch_get_snippets() is the concurrent
+        path for many files.
+        
         Args:
             file_id: The file ID.
             length: Maximum snippet length.
             
         Returns:
-            Truncated content string.
+            Truncated content string ('' if it could not be fetched).
         """
         try:
-            content = self.read_file(file_id)
-            if content.startswith("# File:"):
-                parts = content.split('\n\n', 1)
-                if len(parts) > 1:
-                    content = parts[1]
+            file_meta = self.drive_service.files().get(fileId=file_id, fields='mimeType').execute()
+            mime_type = file_meta.get('mimeType')
+            export_type = _SNIPPET_EXPORT_TYPES.get(mime_type)
+            if export_type is None:
+                return self._format_snippet(f"[UNSUPPORTED MIME TYPE: {mime_type}]", length)
             
-            snippet = content[:length].replace('\n', ' ').strip()
-            if len(content) > length:
-                snippet += "..."
-            return snippet
+            data = self.drive_service.files().export_media(fileId=file_id, mimeType=export_type).execute()
+            return self._snippet_from_bytes(data, length)
         except Exception:
             return ""
 
-    def batch_get_snippets(self, files: list, max_workers: int = DEFAULT_MAX_WORKERS) -> dict[str, str]:
-        """Fetch snippets for multiple files in parallel.
+    @staticmethod
+    def _format_snippet(content: str, length: int) -> str:
+        """Truncate single-line file content for display."""
+        snippet = content[:length].strip()
+        if len(content) > length:
+            snippet += "..."
+        return snippet
+
+    @classmethod
+    def _snippet_from_bytes(cls, data: bytes, length: int) -> str:
+        """Decode only the prefix of an export needed for its snippet."""
+        limit = _snippet_byte_limit(length)
+        if len(data) < limit:
+            content = data.translate(_SNIPPET_WHITESPACE).decode('utf-8')
+        else:
+            # The cut may split a multi-byte character; drop the fragment.
+            content = data[:limit].translate(_SNIPPET_WHITESPACE).decode('utf-8', errors='ignore')
+        return cls._format_snippet(content, length)
+
+    def batch_get_snippets(
+        self,
+        files: list,
+        max_workers: int = DEFAULT_SNIPPET_CONCURRENCY,
+        length: int = DEFAULT_SNIPPET_LENGTH
+    ) -> dict[str, str]:
+        """Fetch snippets for multiple files concurrently.
+        
+        Runs batch_get_snippets_async() to completion. When called from a
+        thread that already runs an event loop, it is driven from a helper
+        thread instead.
         
         Args:
             files: List of file dictionaries with 'id' key.
-            max_workers: Number of parallel workers.
+            max_workers: Maximum number of concurrent downloads.
+            length: Maximum snippet length.
             
         Returns:
             Dict mapping file_id to snippet.
         """
-        snippets = {}
-        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-            future_to_id = {
-                executor.submit(self.get_file_snippet, f['id']): f['id'] 
-                for f in files
-            }
+        # Refresh here, before the event loop exists, so the blocking token
+        # request never runs inside it.
+        if not self.creds.valid:
+            refresh_credentials(self.creds)
+        coro = self.batch_get_snippets_async(files, length, max_concurrency=max_workers)
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(coro)
+        
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, coro).result()
+
+    async def batch_get_snippets_async(
+        self,
+        files: list,
+        length: int = DEFAULT_SNIPPET_LENGTH,
+        max_concurrency: int = DEFAULT_SNIPPET_CONCURRENCY
+    ) -> dict[str, str]:
+        """Fetch snippets for multiple files over one async HTTP connection pool.
+        
+        Exports are requested directly from the Drive REST API with the
+        client's bearer token, so concurrency is bounded by max_concurrency
+        rather than by a pool of threads sharing one httplib2 connection.
+        
+        Args:
+            files: List of file dictionaries with 'id' and, ideally,
+                'mimeType' keys (as returned by search).
+            length: Maximum snippet length.
+            max_concurrency: Maximum number of requests in flight.
+            
+        Returns:
+            Dict mapping file_id to snippet ('' if it could not be fetched).
+        """
+        # httpx is only needed for snippet fan-out; keep it off the import path.
+        import httpx
+        
+        if not self.creds.valid:
+            await asyncio.to_thread(refresh_credentials, self.creds)
+        headers = {'Authorization': f'Bearer {self.creds.token}'}
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async with httpx.AsyncClient(headers=headers, timeout=60.0) as session:
+            async def fetch(file: dict) -> tuple[str, str]:
+                async with semaphore:
+                    try:
+                        return file['id'], await self._fetch_snippet(session, file, length)
+                    except Exception:
+                        return file['id'], ""
             
-            for future in concurrent.futures.as_completed(future_to_id):
-                file_id = future_to_id[future]
-                try:
-                    snippets[file_id] = future.result()
-                except Exception:
-                    snippets[file_id] = ""
-                    
-        return snippets
+            results = await asyncio.gather(*(fetch(f) for f in files))
+        
+        return dict(results)
+
+    async def _fetch_snippet(self, session: Any, file: dict, length: int) -> str:
+        """Export one file through ``session`` and format its snippet."""
+        file_id = file['id']
+        mime_type = file.get('mimeType')
+        if mime_type is None:
+            response = await session.get(f"{DRIVE_FILES_URL}/{file_id}", params={'fields': 'mimeType'})
+            response.raise_for_status()
+            mime_type = response.json().get('mimeType')
+        
+        export_type = _SNIPPET_EXPORT_TYPES.get(mime_type)
+        if export_type is None:
+            return self._format_snippet(f"[UNSUPPORTED MIME TYPE: {mime_type}]", length)
+        
+        # Reading stops once the prefix is covered instead of downloading
+        # the whole export.
+        limit = _snippet_byte_limit(length)
+        buf = bytearray()
+        async with session.stream(
+            'GET', f"{DRIVE_FILES_URL}/{file_id}/export", params={'mimeType': export_type}
+        ) as response:
+            response.raise_for_status()
+            async for chunk in response.aiter_bytes():
+                buf += chunk
+                if len(buf) >= limit:
+                    break
+        
+        return self._snippet_from_bytes(buf, length)
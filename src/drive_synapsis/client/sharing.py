@@ -1,10 +1,13 @@
 """Sharing and permissions mixin for GDriveClient."""
-from typing import Any
+from googleapiclient.errors import HttpError
+from typing import Any, Optional
 
 
 class SharingMixin:
     """Mixin providing sharing and permission operations."""
     
+    __slots__ = ()
+    
     def share_file(self, file_id: str, email: str, role: str = 'reader') -> str:
         """Share a file with a user via email.
         
@@ -22,11 +25,12 @@ class SharingMixin:
             'emailAddress': email
         }
         
-        self.drive_service.permissions().create(
+        created = self.drive_service.permissions().create(
             fileId=file_id,
             body=permission,
             sendNotificationEmail=True
         ).execute()
+        self._permission_ids[(file_id, email)] = created['id']
         
         return f"Shared with {email} as {role}"
 
@@ -43,22 +47,123 @@ class SharingMixin:
             'type': 'anyone',
             'role': 'reader'
         }
+        responses: dict[str, Any] = {}
         
-        self.drive_service.permissions().create(
-            fileId=file_id,
-            body=permission
-        ).execute()
+        def on_response(request_id, response, exception):
+            if exception is not None:
+                raise exception
+            responses[request_id] = response
         
-        file_meta = self.drive_service.files().get(
-            fileId=file_id,
-            fields='webViewLink'
-        ).execute()
+        # The link does not depend on the new permission, so both calls can
+        # share one batch request.
+        self._execute_batched(self.drive_service, [
+            ('permission', self.drive_service.permissions().create(
+                fileId=file_id,
+                body=permission
+            )),
+            ('file', self.drive_service.files().get(
+                fileId=file_id,
+                fields='webViewLink'
+            )),
+        ], on_response)
+        
+        return f"Public link: {responses['file'].get('webViewLink')}"
+
+    def share_files_bulk(self, file_ids: list[str], email: str, role: str = 'reader') -> list[Optional[Exception]]:
+        """Share several files with a user using batched requests.
+        
+        Args:
+            file_ids: The file IDs.
+            email: Email address of the user.
+            role: 'reader', 'writer', or 'commenter'.
+            
+        Returns:
+            One entry per file ID, in order: None on success, otherwise
+            the exception raised for that file.
+        """
+        permission = {
+            'type': 'user',
+            'role': role,
+            'emailAddress': email
+        }
+        errors: list[Optional[Exception]] = [None] * len(file_ids)
+        
+        def on_response(request_id, response, exception):
+            index = int(request_id)
+            errors[index] = exception
+            if exception is None:
+                self._permission_ids[(file_ids[index], email)] = response['id']
+        
+        self._execute_batched(self.drive_service, [
+            (str(i), self.drive_service.permissions().create(
+                fileId=file_id,
+                body=permission,
+                sendNotificationEmail=True
+            ))
+            for i, file_id in enumerate(file_ids)
+        ], on_response)
         
-        return f"Public link: {file_meta.get('webViewLink')}"
+        return errors
+
+    def revoke_access_bulk(self, file_ids: list[str], email: str) -> list[Optional[Exception]]:
+        """Remove a user's access to several files using batched requests.
+        
+        Permissions are listed for all files in one set of batches, then
+        the matching ones are deleted in another.
+        
+        Args:
+            file_ids: The file IDs.
+            email: Email address of the user.
+            
+        Returns:
+            One entry per file ID, in order: None on success, otherwise
+            the exception raised for that file. A file the user had no
+            permission on is reported as a LookupError.
+        """
+        errors: list[Optional[Exception]] = [None] * len(file_ids)
+        permission_ids: dict[int, str] = {}
+        
+        def on_list(request_id, response, exception):
+            index = int(request_id)
+            if exception is not None:
+                errors[index] = exception
+                return
+            for perm in response.get('permissions', []):
+                if perm.get('emailAddress') == email:
+                    permission_ids[index] = perm['id']
+                    return
+            errors[index] = LookupError(f"No permission found for {email}")
+        
+        def on_delete(request_id, response, exception):
+            index = int(request_id)
+            errors[index] = exception
+            if exception is None:
+                self._permission_ids.pop((file_ids[index], email), None)
+        
+        self._execute_batched(self.drive_service, [
+            (str(i), self.drive_service.permissions().list(
+                fileId=file_id,
+                fields='permissions(id, emailAddress)'
+            ))
+            for i, file_id in enumerate(file_ids)
+        ], on_list)
+        
+        self._execute_batched(self.drive_service, [
+            (str(i), self.drive_service.permissions().delete(
+                fileId=file_ids[i],
+                permissionId=permission_id
+            ))
+            for i, permission_id in permission_ids.items()
+        ], on_delete)
+        
+        return errors
 
     def revoke_access(self, file_id: str, email: str) -> str:
         """Remove a user's access to a file.
         
+        Uses the permission ID remembered from share_file() or
+        list_permissions() when there is one, and otherwise looks it up.
+        
         Args:
             file_id: The file ID.
             email: Email address of the user.
@@ -66,20 +171,45 @@ class SharingMixin:
         Returns:
             Success or not found message.
         """
-        permissions = self.drive_service.permissions().list(
-            fileId=file_id,
-            fields='permissions(id, emailAddress)'
-        ).execute()
-        
-        for perm in permissions.get('permissions', []):
-            if perm.get('emailAddress') == email:
+        permission_id = self._permission_ids.pop((file_id, email), None)
+        if permission_id is not None:
+            try:
                 self.drive_service.permissions().delete(
                     fileId=file_id,
-                    permissionId=perm['id']
+                    permissionId=permission_id
                 ).execute()
                 return f"Revoked access for {email}"
+            except HttpError as e:
+                # Removed or changed elsewhere since it was cached
+                if e.resp.status != 404:
+                    raise
+        
+        permission_id = self._find_permission_id(file_id, email)
+        if permission_id is None:
+            return f"No permission found for {email}"
         
-        return f"No permission found for {email}"
+        self.drive_service.permissions().delete(
+            fileId=file_id,
+            permissionId=permission_id
+        ).execute()
+        return f"Revoked access for {email}"
+
+    def _find_permission_id(self, file_id: str, email: str) -> Optional[str]:
+        """Page through a file's permissions until one for ``email`` turns up."""
+        page_token = None
+        while True:
+            result = self.drive_service.permissions().list(
+                fileId=file_id,
+                pageSize=100,
+                pageToken=page_token,
+                fields='nextPageToken, permissions(id, emailAddress)'
+            ).execute()
+            for perm in result.get('permissions', []):
+                if perm.get('emailAddress') == email:
+                    return perm['id']
+            page_token = result.get('nextPageToken')
+            if not page_token:
+                return None
 
     def list_permissions(self, file_id: str) -> list[dict[str, Any]]:
         """List all users who have access to a file.
@@ -95,4 +225,8 @@ class SharingMixin:
             fields='permissions(id, emailAddress, role, type)'
         ).execute()
         
-        return result.get('permissions', [])
+        permissions = result.get('permissions', [])
+        for perm in permissions:
+            if perm.get('emailAddress'):
+                self._permission_ids[(file_id, perm['emailAddress'])] = perm['id']
+        return permissions
@@ -1,13 +1,101 @@
 """Spreadsheet operations mixin for GDriveClient."""
-from typing import Optional
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional, Union
+
+# Channel byte -> the 0..1 float the Sheets API expects
+_HEX_TO_FLOAT = tuple(i / 255.0 for i in range(256))
+
+
+def _parse_hex_color(color: str) -> tuple[float, float, float]:
+    """Convert '#RRGGBB' to Sheets RGB floats."""
+    color_hex = color.lstrip('#')
+    if len(color_hex) != 6:
+        raise ValueError(f"Expected a color like '#FF0000', got {color!r}")
+    value = int(color_hex, 16)
+    return (
+        _HEX_TO_FLOAT[(value >> 16) & 0xff],
+        _HEX_TO_FLOAT[(value >> 8) & 0xff],
+        _HEX_TO_FLOAT[value & 0xff],
+    )
+
+
+class SheetsBatch:
+    """Requests queued for one spreadsheets.batchUpdate call.
+    
+    Created by SheetsMixin.sheets_batch(). After the block exits,
+    ``replies`` holds one reply per queued request, in order.
+    """
+    
+    __slots__ = ("spreadsheet_id", "requests", "replies")
+    
+    def __init__(self, spreadsheet_id: str) -> None:
+        self.spreadsheet_id = spreadsheet_id
+        self.requests: list[dict[str, Any]] = []
+        self.replies: list[dict[str, Any]] = []
+    
+    def add(self, request: dict[str, Any]) -> int:
+        """Queue a request and return the index of its reply."""
+        self.requests.append(request)
+        return len(self.requests) - 1
 
 
 class SheetsMixin:
     """Mixin providing spreadsheet-related operations."""
     
+    __slots__ = ()
+    
+    @contextmanager
+    def sheets_batch(self, spreadsheet_id: str) -> Iterator[SheetsBatch]:
+        """Collect sheet edits and send them as one batchUpdate on exit.
+        
+        Pass the yielded batch as ``batch`` to insert_sheet_rows,
+        add_sheet_tab, format_sheet_range or protect_sheet_range. Nothing
+        is sent if the block raises.
+        
+        Args:
+            spreadsheet_id: The spreadsheet every queued request targets.
+        """
+        batch = SheetsBatch(spreadsheet_id)
+        yield batch
+        if batch.requests:
+            result = self.sheets_service.spreadsheets().batchUpdate(
+                spreadsheetId=spreadsheet_id,
+                body={'requests': batch.requests}
+            ).execute()
+            batch.replies = result.get('replies', [])
+    
+    def _send_sheet_request(
+        self,
+        spreadsheet_id: str,
+        request: dict[str, Any],
+        batch: Optional[SheetsBatch]
+    ) -> Optional[dict[str, Any]]:
+        """Send one batchUpdate request, or queue it on ``batch``.
+        
+        Returns:
+            The request's reply, or None when it was queued.
+        """
+        if batch is not None:
+            if batch.spreadsheet_id != spreadsheet_id:
+                raise ValueError(
+                    f"Batch is for spreadsheet {batch.spreadsheet_id}, not {spreadsheet_id}"
+                )
+            batch.add(request)
+            return None
+        
+        result = self.sheets_service.spreadsheets().batchUpdate(
+            spreadsheetId=spreadsheet_id,
+            body={'requests': [request]}
+        ).execute()
+        return result['replies'][0]
+    
     def create_sheet(self, title: str, data: list[list[str]]) -> str:
         """Create a sheet and upload initial data.
         
+        The spreadsheet is created directly through the Sheets API, and the
+        rows are written with USER_ENTERED so Sheets parses numbers, dates,
+        formulas and the like as if typed.
+        
         Args:
             title: Sheet title.
             data: Initial data as list of lists.
@@ -15,20 +103,19 @@ class SheetsMixin:
         Returns:
             Success message with sheet ID.
         """
-        file_metadata = {
-            'name': title,
-            'mimeType': 'application/vnd.google-apps.spreadsheet'
-        }
-        file = self.drive_service.files().create(body=file_metadata, fields='id').execute()
-        file_id = file.get('id')
-        
-        body = {'values': data}
-        self.sheets_service.spreadsheets().values().update(
-            spreadsheetId=file_id, range="A1",
-            valueInputOption="USER_ENTERED", body=body
+        result = self.sheets_service.spreadsheets().create(
+            body={'properties': {'title': title}},
+            fields='spreadsheetId'
         ).execute()
-            
-        return f"Sheet created successfully. ID: {file_id}"
+        spreadsheet_id = result['spreadsheetId']
+        
+        if data:
+            self.sheets_service.spreadsheets().values().update(
+                spreadsheetId=spreadsheet_id, range="A1",
+                valueInputOption="USER_ENTERED", body={'values': data}
+            ).execute()
+        
+        return f"Sheet created successfully. ID: {spreadsheet_id}"
 
     def update_sheet_values(self, spreadsheet_id: str, range_name: str, values: list[list[str]]) -> str:
         """Update values in a Google Sheet.
@@ -83,7 +170,14 @@ class SheetsMixin:
         ).execute()
         return f"Appended {result.get('updates', {}).get('updatedRows', 0)} rows."
 
-    def insert_sheet_rows(self, spreadsheet_id: str, sheet_id: int, start_index: int, row_count: int) -> str:
+    def insert_sheet_rows(
+        self,
+        spreadsheet_id: str,
+        sheet_id: int,
+        start_index: int,
+        row_count: int,
+        batch: Optional[SheetsBatch] = None
+    ) -> str:
         """Insert blank rows at a specific position.
         
         Args:
@@ -91,11 +185,12 @@ class SheetsMixin:
             sheet_id: The sheet/tab ID.
             start_index: Starting row index.
             row_count: Number of rows to insert.
+            batch: Queue the change on this sheets_batch() instead.
             
         Returns:
             Success message.
         """
-        requests = [{
+        request = {
             'insertDimension': {
                 'range': {
                     'sheetId': sheet_id,
@@ -104,33 +199,36 @@ class SheetsMixin:
                     'endIndex': start_index + row_count
                 }
             }
-        }]
-        self.sheets_service.spreadsheets().batchUpdate(
-            spreadsheetId=spreadsheet_id,
-            body={'requests': requests}
-        ).execute()
+        }
+        self._send_sheet_request(spreadsheet_id, request, batch)
         return f"Inserted {row_count} rows at index {start_index}."
 
-    def add_sheet_tab(self, spreadsheet_id: str, tab_name: str) -> str:
+    def add_sheet_tab(
+        self,
+        spreadsheet_id: str,
+        tab_name: str,
+        batch: Optional[SheetsBatch] = None
+    ) -> str:
         """Add a new tab to an existing spreadsheet.
         
         Args:
             spreadsheet_id: The spreadsheet ID.
             tab_name: Name for the new tab.
+            batch: Queue the change on this sheets_batch() instead. The
+                tab ID is then in the batch's replies once it is sent.
             
         Returns:
             Success message with tab ID.
         """
-        requests = [{
+        request = {
             'addSheet': {
                 'properties': {'title': tab_name}
             }
-        }]
-        result = self.sheets_service.spreadsheets().batchUpdate(
-            spreadsheetId=spreadsheet_id,
-            body={'requests': requests}
-        ).execute()
-        new_sheet_id = result['replies'][0]['addSheet']['properties']['sheetId']
+        }
+        reply = self._send_sheet_request(spreadsheet_id, request, batch)
+        if reply is None:
+            return f"Queued tab '{tab_name}'."
+        new_sheet_id = reply['addSheet']['properties']['sheetId']
         return f"Added tab '{tab_name}' (Sheet ID: {new_sheet_id})."
 
     def format_sheet_range(
@@ -142,7 +240,8 @@ class SheetsMixin:
         start_col: int,
         end_col: int,
         bold: bool = False,
-        background_color: Optional[str] = None
+        background_color: Optional[Union[str, tuple[float, float, float]]] = None,
+        batch: Optional[SheetsBatch] = None
     ) -> str:
         """Apply formatting to a range in a spreadsheet.
         
@@ -152,7 +251,9 @@ class SheetsMixin:
             start_row, end_row: Row range (0-indexed).
             start_col, end_col: Column range (0-indexed).
             bold: Make text bold.
-            background_color: Hex color like '#FF0000'.
+            background_color: Hex color like '#FF0000', or an already
+                converted (red, green, blue) tuple of floats in 0..1.
+            batch: Queue the change on this sheets_batch() instead.
             
         Returns:
             Success message.
@@ -161,13 +262,13 @@ class SheetsMixin:
         if bold:
             cell_format['textFormat'] = {'bold': True}
         if background_color:
-            color_hex = background_color.lstrip('#')
-            r = int(color_hex[0:2], 16) / 255.0
-            g = int(color_hex[2:4], 16) / 255.0
-            b = int(color_hex[4:6], 16) / 255.0
+            if isinstance(background_color, str):
+                r, g, b = _parse_hex_color(background_color)
+            else:
+                r, g, b = background_color
             cell_format['backgroundColor'] = {'red': r, 'green': g, 'blue': b}
         
-        requests = [{
+        request = {
             'repeatCell': {
                 'range': {
                     'sheetId': sheet_id,
@@ -179,12 +280,9 @@ class SheetsMixin:
                 'cell': {'userEnteredFormat': cell_format},
                 'fields': 'userEnteredFormat(textFormat,backgroundColor)'
             }
-        }]
+        }
         
-        self.sheets_service.spreadsheets().batchUpdate(
-            spreadsheetId=spreadsheet_id,
-            body={'requests': requests}
-        ).execute()
+        self._send_sheet_request(spreadsheet_id, request, batch)
         
         return f"Formatted range (rows {start_row}-{end_row}, cols {start_col}-{end_col})"
 
@@ -196,7 +294,8 @@ class SheetsMixin:
         end_row: int,
         start_col: int,
         end_col: int,
-        description: str = 'Protected range'
+        description: str = 'Protected range',
+        batch: Optional[SheetsBatch] = None
     ) -> str:
         """Protect a range from editing.
         
@@ -205,11 +304,12 @@ class SheetsMixin:
             sheet_id: The sheet/tab ID.
             start_row, end_row, start_col, end_col: Range (0-indexed).
             description: Reason for protection.
+            batch: Queue the change on this sheets_batch() instead.
             
         Returns:
             Success message.
         """
-        requests = [{
+        request = {
             'addProtectedRange': {
                 'protectedRange': {
                     'range': {
@@ -223,11 +323,8 @@ class SheetsMixin:
                     'warningOnly': True
                 }
             }
-        }]
+        }
         
-        self.sheets_service.spreadsheets().batchUpdate(
-            spreadsheetId=spreadsheet_id,
-            body={'requests': requests}
-        ).execute()
+        self._send_sheet_request(spreadsheet_id, request, batch)
         
         return f"Protected range: {description}"
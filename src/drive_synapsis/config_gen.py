@@ -1,5 +1,6 @@
 """Interactive Configuration Wizard for Drive Synapsis MCP Server."""
 
+import functools
 import json
 import os
 import shutil
@@ -11,16 +12,12 @@ from typing import Dict, Any, List, Optional
 try:
     from drive_synapsis.auth import get_creds
     from drive_synapsis.auth.oauth_config import get_credentials_dir
-
-    CREDENTIALS_DIR = get_credentials_dir()
 except ImportError:
     # Fallback for direct execution if package not installed
     sys.path.append(str(Path(__file__).parent.parent))
     from drive_synapsis.auth import get_creds
     from drive_synapsis.auth.oauth_config import get_credentials_dir
 
-    CREDENTIALS_DIR = get_credentials_dir()
-
 
 # ANSI Colors
 class Colors:
@@ -73,6 +70,7 @@ def confirm(prompt: str, default: bool = True) -> bool:
     return response.startswith("y")
 
 
+@functools.lru_cache(maxsize=1)
 def get_uv_path() -> str:
     """Find the uv executable path."""
     uv_path = shutil.which("uv")
@@ -92,9 +90,12 @@ def get_uv_path() -> str:
     return "uv"
 
 
+_PROJECT_ROOT = str(Path(__file__).parent.parent.parent.resolve())
+
+
 def get_project_root() -> str:
     """Get absolute path to project root."""
-    return str(Path(__file__).parent.parent.parent.resolve())
+    return _PROJECT_ROOT
 
 
 def load_json(path: Path) -> Dict[str, Any]:
@@ -121,9 +122,9 @@ def save_json(path: Path, data: Dict[str, Any]):
 def setup_credentials():
     print_header("1. Credential Setup")
 
-    # Ensure dir exists (it should via auth.py import, but double check)
-    creds_dir = Path(CREDENTIALS_DIR)
-    creds_dir.mkdir(parents=True, exist_ok=True)
+    # Resolved here rather than at import so the directory reflects the
+    # environment at run time; get_credentials_dir() also creates it.
+    creds_dir = Path(get_credentials_dir())
 
     client_secret = creds_dir / "client_secret.json"
     token_file = creds_dir / "token.json"
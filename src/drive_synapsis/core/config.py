@@ -17,6 +17,9 @@ CREDENTIALS_DIR = os.path.expanduser(
     os.getenv("DRIVE_SYNAPSIS_CREDENTIALS_DIR", "~/.config/drive-synapsis")
 )
 
+# Set once get_credentials_dir() has created CREDENTIALS_DIR
+_credentials_dir_ready: bool = False
+
 # Transport mode (stdio or streamable-http)
 _transport_mode: str = "stdio"
 
@@ -65,6 +68,8 @@ def get_credentials_dir() -> str:
     Returns:
         Path to the credentials directory.
     """
-    if not os.path.exists(CREDENTIALS_DIR):
+    global _credentials_dir_ready
+    if not _credentials_dir_ready:
         os.makedirs(CREDENTIALS_DIR, exist_ok=True)
+        _credentials_dir_ready = True
     return CREDENTIALS_DIR
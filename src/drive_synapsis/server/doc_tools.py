@@ -102,6 +102,30 @@ def replace_doc_text(
         return f"Replace text failed: Unexpected error ({type(e).__name__}: {e})"
 
 
+@mcp.tool()
+def replace_doc_texts(file_id: str, replacements: str, match_case: bool = False) -> str:
+    """
+    Apply several find/replace pairs to a Google Doc in a single request.
+    Prefer this over calling replace_doc_text repeatedly.
+    Args:
+        file_id: The ID of the doc or its search alias.
+        replacements: A JSON string mapping text to find to its replacement, e.g. '{"TODO": "DONE", "2023": "2024"}'.
+        match_case: If True, search is case-sensitive.
+    """
+    try:
+        real_id = search_manager.resolve_alias(file_id)
+        replacements_dict = json.loads(replacements)
+        return get_client().replace_texts_in_doc(real_id, replacements_dict, match_case)
+    except json.JSONDecodeError:
+        return "Replace text failed: Invalid JSON for replacements."
+    except HttpError as e:
+        return format_error("Replace text", handle_http_error(e, file_id))
+    except GDriveError as e:
+        return format_error("Replace text", e)
+    except Exception as e:
+        return f"Replace text failed: Unexpected error ({type(e).__name__}: {e})"
+
+
 @mcp.tool()
 def insert_doc_table(file_id: str, rows: int, cols: int, index: int = 1) -> str:
     """
@@ -260,3 +284,30 @@ def create_doc_from_template(
         return (
             f"Create from template failed: Unexpected error ({type(e).__name__}: {e})"
         )
+
+
+@mcp.tool()
+def create_docs_from_template(template_id: str, documents: str) -> str:
+    """
+    Create several Google Docs from one template in batched requests.
+    Prefer this over calling create_doc_from_template repeatedly.
+    Args:
+        template_id: The ID of the template file or its search alias (e.g. "A").
+        documents: A JSON list of {"title": ..., "replacements": {...}} objects, e.g. '[{"title": "Alice", "replacements": {"{{name}}": "Alice"}}]'.
+    """
+    try:
+        real_id = search_manager.resolve_alias(template_id)
+        jobs = [
+            (job["title"], job.get("replacements", {})) for job in json.loads(documents)
+        ]
+        return "\n".join(get_client().create_from_template_many(real_id, jobs))
+    except (json.JSONDecodeError, KeyError, TypeError, AttributeError):
+        return "Create from template failed: Invalid JSON for documents."
+    except HttpError as e:
+        return format_error("Create from template", handle_http_error(e, template_id))
+    except GDriveError as e:
+        return format_error("Create from template", e)
+    except Exception as e:
+        return (
+            f"Create from template failed: Unexpected error ({type(e).__name__}: {e})"
+        )
@@ -14,6 +14,25 @@ except ImportError:
     HttpError = Exception
 
 
+def _move_aliased_file(file_id: str, real_id: str, real_folder: str) -> str:
+    """Move a file using the parents remembered from its search result.
+    
+    The file may have moved since that search. If Drive rejects the move
+    with the cached parents, it is retried once with a fresh lookup.
+    """
+    client = get_client()
+    parents = search_manager.get_parents(file_id)
+    try:
+        result = client.move_file(real_id, real_folder, parents)
+    except HttpError as e:
+        status = getattr(getattr(e, 'resp', None), 'status', None)
+        if parents is None or status not in (400, 403):
+            raise
+        result = client.move_file(real_id, real_folder)
+    search_manager.set_parents(file_id, [real_folder])
+    return result
+
+
 @mcp.tool()
 def upload_file(local_path: str, folder_id: str = None) -> str:
     """
@@ -51,7 +70,7 @@ def move_file(file_id: str, folder_id: str) -> str:
     try:
         real_id = search_manager.resolve_alias(file_id)
         real_folder = search_manager.resolve_alias(folder_id)
-        return get_client().move_file(real_id, real_folder)
+        return _move_aliased_file(file_id, real_id, real_folder)
     except HttpError as e:
         return format_error("Move file", handle_http_error(e, file_id))
     except GDriveError as e:
@@ -241,7 +260,7 @@ def bulk_move_files(file_ids: str, folder_id: str) -> str:
         for fid in ids:
             try:
                 real_id = search_manager.resolve_alias(fid)
-                get_client().move_file(real_id, real_folder)
+                _move_aliased_file(fid, real_id, real_folder)
                 success += 1
             except HttpError as e:
                 err = handle_http_error(e, fid)
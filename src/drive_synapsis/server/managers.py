@@ -25,6 +25,7 @@ class CachedFile:
         mime_type: The MIME type of the file.
         snippet: Preview text from the file content.
         score: Relevance score (0-100).
+        parents: Parent folder IDs, if the search returned them.
     """
     id: str
     name: str
@@ -32,6 +33,7 @@ class CachedFile:
     mime_type: str = ""
     snippet: str = ""
     score: int = 0
+    parents: list[str] = field(default_factory=list)
 
 
 @dataclass
@@ -102,7 +104,8 @@ class SearchManager:
                     alias=alias,
                     mime_type=file.get('mimeType', ''),
                     snippet=file.get('snippet', ''),
-                    score=file.get('score', 0)
+                    score=file.get('score', 0),
+                    parents=list(file.get('parents', ()))
                 )
                 self._cache[alias] = cached
                 
@@ -138,6 +141,31 @@ class SearchManager:
         """
         return self._cache.get(alias.upper())
 
+    def get_parents(self, query: str) -> Optional[list[str]]:
+        """Get the known parent folders of an aliased file.
+        
+        Args:
+            query: Either a single letter alias or file ID.
+            
+        Returns:
+            Parent folder IDs, or None if they are not known.
+        """
+        cached = self._cache.get(query.upper()) if len(query) == 1 else None
+        if cached is None or not cached.parents:
+            return None
+        return list(cached.parents)
+
+    def set_parents(self, query: str, parents: list[str]) -> None:
+        """Record new parent folders for an aliased file after a move.
+        
+        Args:
+            query: Either a single letter alias or file ID.
+            parents: The file's parent folder IDs.
+        """
+        cached = self._cache.get(query.upper()) if len(query) == 1 else None
+        if cached is not None:
+            cached.parents = list(parents)
+
 
 # ============================================================================
 # Sync Manager
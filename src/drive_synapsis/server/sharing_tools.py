@@ -113,19 +113,10 @@ def bulk_share_files(file_ids: str, email: str, role: str = 'reader') -> str:
     """
     try:
         ids = json.loads(file_ids)
-        success = 0
-        errors = []
-        
-        for fid in ids:
-            try:
-                real_id = search_manager.resolve_alias(fid)
-                get_client().share_file(real_id, email, role)
-                success += 1
-            except HttpError as e:
-                err = handle_http_error(e, fid)
-                errors.append(f"{fid}: {err.message}")
-            except Exception as e:
-                errors.append(f"{fid}: {str(e)}")
+        aliases, real_ids, errors = _resolve_bulk_ids(ids)
+        results = get_client().share_files_bulk(real_ids, email, role)
+        errors += _format_bulk_errors(aliases, results)
+        success = len(ids) - len(errors)
         
         result = f"Shared {success}/{len(ids)} files with {email} as {role}."
         if errors:
@@ -135,3 +126,60 @@ def bulk_share_files(file_ids: str, email: str, role: str = 'reader') -> str:
         return "Bulk share failed: Invalid JSON array format."
     except Exception as e:
         return f"Bulk share failed: Unexpected error ({type(e).__name__}: {e})"
+
+
+@mcp.tool()
+def bulk_revoke_file_access(file_ids: str, email: str) -> str:
+    """
+    Remove a user's access to multiple files.
+    Args:
+        file_ids: JSON array of file IDs.
+        email: Email address of the user whose access to revoke.
+    """
+    try:
+        ids = json.loads(file_ids)
+        aliases, real_ids, errors = _resolve_bulk_ids(ids)
+        results = get_client().revoke_access_bulk(real_ids, email)
+        errors += _format_bulk_errors(aliases, results)
+        success = len(ids) - len(errors)
+        
+        result = f"Revoked access for {email} on {success}/{len(ids)} files."
+        if errors:
+            result += f"\nErrors:\n" + "\n".join(errors)
+        return result
+    except json.JSONDecodeError:
+        return "Bulk revoke failed: Invalid JSON array format."
+    except Exception as e:
+        return f"Bulk revoke failed: Unexpected error ({type(e).__name__}: {e})"
+
+
+def _resolve_bulk_ids(ids: list) -> tuple[list, list[str], list[str]]:
+    """Resolve aliases one by one so a bad entry only fails itself.
+    
+    Returns:
+        The entries that resolved and their file IDs, in input order, plus
+        an error line for each entry that could not be resolved.
+    """
+    aliases = []
+    real_ids = []
+    errors = []
+    for fid in ids:
+        try:
+            real_ids.append(search_manager.resolve_alias(fid))
+            aliases.append(fid)
+        except Exception as e:
+            errors.append(f"{fid}: {str(e)}")
+    return aliases, real_ids, errors
+
+
+def _format_bulk_errors(ids: list, results: list) -> list[str]:
+    """Format per-file failures from a batched sharing call."""
+    errors = []
+    for fid, error in zip(ids, results):
+        if error is None:
+            continue
+        if isinstance(error, HttpError):
+            errors.append(f"{fid}: {handle_http_error(error, fid).message}")
+        else:
+            errors.append(f"{fid}: {str(error)}")
+    return errors
@@ -1,7 +1,9 @@
 """Centralized constants for Google Drive MCP server."""
 
-# MIME Types - Google Apps
-GOOGLE_MIME_TYPES = {
+from types import MappingProxyType
+
+# MIME Types - Google Apps (read-only)
+GOOGLE_MIME_TYPES = MappingProxyType({
     'doc': 'application/vnd.google-apps.document',
     'sheet': 'application/vnd.google-apps.spreadsheet',
     'folder': 'application/vnd.google-apps.folder',
@@ -9,10 +11,10 @@ GOOGLE_MIME_TYPES = {
     'form': 'application/vnd.google-apps.form',
     'pdf': 'application/pdf',
     'image': 'image/',  # Prefix match
-}
+})
 
-# MIME Types - Export Formats
-EXPORT_MIME_TYPES = {
+# MIME Types - Export Formats (read-only: shared by every download)
+EXPORT_MIME_TYPES = MappingProxyType({
     'pdf': 'application/pdf',
     'docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
     'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
@@ -22,15 +24,21 @@ EXPORT_MIME_TYPES = {
     'odt': 'application/vnd.oasis.opendocument.text',
     'csv': 'text/csv',
     'json': 'application/json',
-}
+})
 
 # Default Values
 DEFAULT_SEARCH_LIMIT = 10
 DEFAULT_SNIPPET_LENGTH = 200
 DEFAULT_COMMENT_PAGE_SIZE = 100
 DEFAULT_MAX_WORKERS = 5
+DEFAULT_SNIPPET_CONCURRENCY = 32
 DEFAULT_SHEET_RANGE = "A1:Z1000"
 
+# Uploads: files below the threshold go up in a single request; larger ones
+# are resumable, sent in chunks (Drive requires multiples of 256 KiB)
+RESUMABLE_UPLOAD_THRESHOLD = 5 * 1024 * 1024
+DEFAULT_UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+
 # Scoring Weights (for search ranking)
 SCORE_TITLE_MATCH = 50
 SCORE_CONTENT_MATCH = 30
@@ -0,0 +1,876 @@
+"""Unit tests for GDriveClient mixins with mocked Google API services."""
+
+import asyncio
+import sys
+import os
+import inspect
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+from google.auth.credentials import AnonymousCredentials
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../src"))
+
+from drive_synapsis.client import GDriveClient
+
+
+def make_client() -> GDriveClient:
+    """Build a client around mock services without touching credentials."""
+    client = GDriveClient.__new__(GDriveClient)
+    client.creds = MagicMock()
+    client._http_cache_dir = None
+    client._drive_service = MagicMock()
+    client._docs_service = MagicMock()
+    client._sheets_service = MagicMock()
+    client._doc_cache = {}
+    client._section_starts = {}
+    client._folder_ids = {}
+    client._permission_ids = {}
+    return client
+
+
+class TestDocStructureCache:
+    """Tests for the version-keyed document structure cache."""
+
+    def setup_method(self):
+        self.client = make_client()
+        self.files = self.client.drive_service.files.return_value
+        self.documents = self.client.docs_service.documents.return_value
+        self.files.get.return_value.execute.return_value = {"version": "3"}
+        self.documents.get.return_value.execute.return_value = {"title": "Doc"}
+
+    def test_unchanged_document_is_fetched_once(self):
+        """Repeated reads of the same version reuse the cached structure."""
+        first = self.client.get_doc_structure("doc-1")
+        second = self.client.get_doc_structure("doc-1")
+
+        assert first is second
+        assert self.documents.get.call_count == 1
+
+    def test_new_version_is_refetched(self):
+        """A changed Drive version bypasses the cache."""
+        self.client.get_doc_structure("doc-1")
+        self.files.get.return_value.execute.return_value = {"version": "4"}
+
+        self.client.get_doc_structure("doc-1")
+
+        assert self.documents.get.call_count == 2
+
+    def test_edits_invalidate_the_cache(self):
+        """Writing through the client drops the cached structure."""
+        self.client.get_doc_structure("doc-1")
+
+        self.client.insert_table("doc-1", rows=2, cols=2)
+        self.client.get_doc_structure("doc-1")
+
+        assert self.documents.get.call_count == 2
+
+
+class TestReadFile:
+    """Tests for exporting Workspace files as text."""
+
+    def test_doc_is_exported_in_one_request(self):
+        """Docs are exported as markdown with a single execute() call."""
+        client = make_client()
+        files = client.drive_service.files.return_value
+        files.get.return_value.execute.return_value = {
+            "name": "Notes",
+            "mimeType": "application/vnd.google-apps.document",
+        }
+        files.export_media.return_value.execute.return_value = b"# Heading"
+
+        result = client.read_file("doc-1")
+
+        assert result == "# File: Notes\n\n# Heading"
+        files.export_media.assert_called_once_with(
+            fileId="doc-1", mimeType="text/markdown"
+        )
+
+
+class TestLazyServices:
+    """Tests for on-demand construction of API service clients."""
+
+    def test_constructor_accepts_credentials(self):
+        """Callers can inject credentials instead of triggering the auth flow."""
+        parameters = inspect.signature(GDriveClient.__init__).parameters
+
+        assert parameters["credentials"].default is None
+
+    def test_services_are_built_on_first_use(self):
+        """Only the services a caller touches are built, and only once."""
+        with patch("drive_synapsis.client.base.build_from_document") as build:
+            client = GDriveClient(credentials=MagicMock())
+
+            assert build.call_count == 0
+            assert client.drive_service is client.drive_service
+
+        build.assert_called_once()
+        assert build.call_args.args[0]["name"] == "drive"
+
+    def test_cache_dir_enables_http_cache(self, tmp_path):
+        """With a cache directory, services share an httplib2 file cache."""
+        with patch("drive_synapsis.client.base.build_from_document") as build:
+            client = GDriveClient(credentials=MagicMock(), cache_dir=str(tmp_path))
+            client.sheets_service
+
+        http = build.call_args.kwargs["http"]
+        assert http.http.cache.cache == str(tmp_path)
+
+    def test_requests_ask_for_gzip(self):
+        """Requests advertise gzip so Drive compresses JSON responses."""
+        client = make_client()
+        client.creds = AnonymousCredentials()
+
+        request = client._build_service("drive", "v3").files().list()
+
+        assert "gzip" in request.headers["accept-encoding"]
+        assert "(gzip)" in request.headers["user-agent"]
+
+
+class TestDownloadSheetJson:
+    """Tests for converting sheet values to JSON records."""
+
+    def test_short_rows_are_padded_and_long_rows_truncated(self):
+        """Rows are keyed by header, with missing trailing cells as ''."""
+        client = make_client()
+        client.drive_service.files.return_value.get.return_value.execute.return_value = {
+            "mimeType": "application/vnd.google-apps.spreadsheet",
+            "name": "Sheet",
+        }
+        values = client.sheets_service.spreadsheets.return_value.values.return_value
+        values.get.return_value.execute.return_value = {
+            "values": [["a", "b", "c"], ["1"], ["1", "2", "3", "4"]]
+        }
+
+        result = json.loads(client.download_doc("sheet-1", "json"))
+
+        assert result == [
+            {"a": "1", "b": "", "c": ""},
+            {"a": "1", "b": "2", "c": "3"},
+        ]
+
+
+class TestExtractText:
+    """Tests for flattening Docs content elements to text."""
+
+    def test_paragraphs_and_tables_are_flattened(self):
+        """Table cells are separated by ' | ' and rows by newlines."""
+        def para(text):
+            return {"paragraph": {"elements": [{"textRun": {"content": text}}]}}
+
+        content = [
+            para("Intro\n"),
+            {"sectionBreak": {}},
+            {
+                "table": {
+                    "tableRows": [
+                        {"tableCells": [{"content": [para("a")]}, {"content": [para("b")]}]}
+                    ]
+                }
+            },
+        ]
+
+        text = make_client().extract_text_from_element(content)
+
+        assert text == "Intro\na | b | \n"
+
+
+class TestReadDocumentSection:
+    """Tests for reading a slice of a document by index."""
+
+    def setup_method(self):
+        def para(start, text):
+            return {
+                "startIndex": start,
+                "endIndex": start + len(text),
+                "paragraph": {"elements": [{"textRun": {"content": text}}]},
+            }
+
+        self.client = make_client()
+        self.client.drive_service.files.return_value.get.return_value.execute.return_value = {
+            "version": "1"
+        }
+        documents = self.client.docs_service.documents.return_value
+        documents.get.return_value.execute.return_value = {
+            "body": {
+                "content": [
+                    {"endIndex": 1, "sectionBreak": {}},
+                    para(1, "one\n"),
+                    para(5, "two\n"),
+                    para(9, "three\n"),
+                ]
+            }
+        }
+
+    def test_overlapping_items_are_returned(self):
+        """Items partially covered by the range are included."""
+        assert self.client.read_document_section("doc-1", 6, 10) == "two\nthree\n"
+
+    def test_range_ending_at_item_start_excludes_it(self):
+        """The end index is exclusive."""
+        assert self.client.read_document_section("doc-1", 0, 5) == "one\n"
+
+
+class TestDocumentOutline:
+    """Tests for extracting heading outlines."""
+
+    def test_headings_are_listed_with_levels(self):
+        """Heading paragraphs are returned; body text and titles are not."""
+        def para(style, text):
+            return {
+                "startIndex": 1,
+                "endIndex": 2,
+                "paragraph": {
+                    "paragraphStyle": {"namedStyleType": style},
+                    "elements": [{"textRun": {"content": text}}],
+                },
+            }
+
+        client = make_client()
+        client.drive_service.files.return_value.get.return_value.execute.return_value = {
+            "version": "1"
+        }
+        client.docs_service.documents.return_value.get.return_value.execute.return_value = {
+            "body": {
+                "content": [
+                    para("TITLE", "Title\n"),
+                    para("HEADING_1", "Intro\n"),
+                    para("NORMAL_TEXT", "Body\n"),
+                    para("HEADING_3", "Detail\n"),
+                ]
+            }
+        }
+
+        outline = client.get_document_outline("doc-1")
+
+        assert [(h["level"], h["text"]) for h in outline] == [(1, "Intro"), (3, "Detail")]
+
+
+class TestReplaceTexts:
+    """Tests for batched find/replace."""
+
+    def test_pairs_are_sent_in_one_batch_update(self):
+        """All pairs go out in one batchUpdate and their counts are summed."""
+        client = make_client()
+        batch_update = client.docs_service.documents.return_value.batchUpdate
+        batch_update.return_value.execute.return_value = {
+            "replies": [
+                {"replaceAllText": {"occurrencesChanged": 2}},
+                {"replaceAllText": {}},
+            ]
+        }
+
+        result = client.replace_texts_in_doc("doc-1", {"TODO": "DONE", "x": "y"})
+
+        assert result == "Replaced 2 occurrence(s) across 2 search term(s)"
+        batch_update.assert_called_once()
+        requests = batch_update.call_args.kwargs["body"]["requests"]
+        assert [r["replaceAllText"]["replaceText"] for r in requests] == ["DONE", "y"]
+
+
+class TestAppendText:
+    """Tests for appending text to a document."""
+
+    def test_append_does_not_fetch_the_document(self):
+        """Appending targets the end of the body without reading it first."""
+        client = make_client()
+        documents = client.docs_service.documents.return_value
+
+        client.append_text_to_doc("doc-1", "more")
+
+        documents.get.assert_not_called()
+        requests = documents.batchUpdate.call_args.kwargs["body"]["requests"]
+        assert requests == [{"insertText": {"endOfSegmentLocation": {}, "text": "more"}}]
+
+
+class TestCreateDoc:
+    """Tests for creating documents."""
+
+    def test_content_is_uploaded_with_the_create_request(self):
+        """The initial text is sent as the media body of files.create."""
+        client = make_client()
+        create = client.drive_service.files.return_value.create
+        create.return_value.execute.return_value = {"id": "doc-1"}
+
+        result = client.create_doc("Notes", "hello")
+
+        assert result == "Document created successfully. ID: doc-1"
+        media = create.call_args.kwargs["media_body"]
+        assert media.mimetype() == "text/plain"
+        assert not media.resumable()
+        client.docs_service.documents.return_value.batchUpdate.assert_not_called()
+
+
+class FakeBatch:
+    """Stand-in for BatchHttpRequest that answers each call via a responder."""
+
+    def __init__(self, callback, responder):
+        self.callback = callback
+        self.responder = responder
+        self.requests = []
+
+    def add(self, request, request_id):
+        self.requests.append((request_id, request))
+
+    def execute(self):
+        for request_id, request in self.requests:
+            try:
+                self.callback(request_id, self.responder(request), None)
+            except Exception as e:
+                self.callback(request_id, None, e)
+
+
+class TestCreateFromTemplateMany:
+    """Tests for batched creation of documents from a template."""
+
+    def test_copies_and_replacements_are_batched(self):
+        """Each phase runs as one batch; failures are reported per job."""
+        client = make_client()
+        batches = []
+
+        def copy_response(request):
+            if request == "copy-Bad":
+                raise RuntimeError("quota")
+            return {"id": f"id-{request[5:]}"}
+
+        def make_batch(service, responder):
+            def new_batch(callback):
+                batches.append(FakeBatch(callback, responder))
+                return batches[-1]
+            service.new_batch_http_request.side_effect = new_batch
+
+        make_batch(client.drive_service, copy_response)
+        make_batch(client.docs_service, lambda request: {})
+        client.drive_service.files.return_value.copy.side_effect = (
+            lambda fileId, body: f"copy-{body['name']}"
+        )
+
+        results = client.create_from_template_many(
+            "tpl", [("A", {"{{x}}": "1"}), ("Bad", {}), ("C", {})]
+        )
+
+        assert results == [
+            "Created document 'A' from template. ID: id-A",
+            "Failed to create document 'Bad': quota",
+            "Created document 'C' from template. ID: id-C",
+        ]
+        assert [len(batch.requests) for batch in batches] == [3, 1]
+
+
+class TestFolderIdCache:
+    """Tests for remembering folder name lookups."""
+
+    def setup_method(self):
+        self.client = make_client()
+        self.files = self.client.drive_service.files.return_value
+        self.files.list.return_value.execute.return_value = {"files": [{"id": "f-1"}]}
+
+    def test_repeated_lookups_hit_the_cache(self):
+        """A resolved folder name is not queried again."""
+        assert self.client.get_folder_id("Reports") == "f-1"
+        assert self.client.get_folder_id("Reports") == "f-1"
+
+        assert self.files.list.call_count == 1
+
+    def test_misses_are_not_cached(self):
+        """A folder that does not exist yet is looked up again next time."""
+        self.files.list.return_value.execute.return_value = {"files": []}
+        assert self.client.get_folder_id("New") is None
+
+        self.files.list.return_value.execute.return_value = {"files": [{"id": "f-2"}]}
+        assert self.client.get_folder_id("New") == "f-2"
+
+    def test_renaming_a_folder_invalidates_its_lookup(self):
+        """Renaming a cached folder forces a fresh lookup."""
+        self.client.get_folder_id("Reports")
+
+        self.client.rename_file("f-1", "Archive")
+        self.client.get_folder_id("Reports")
+
+        assert self.files.list.call_count == 2
+
+
+class TestMoveFile:
+    """Tests for moving files between folders."""
+
+    def test_known_parents_skip_the_lookup(self):
+        """Passing the current parents moves the file in one request."""
+        client = make_client()
+        files = client.drive_service.files.return_value
+
+        client.move_file("file-1", "dest", previous_parents=["src-a", "src-b"])
+
+        files.get.assert_not_called()
+        assert files.update.call_args.kwargs["removeParents"] == "src-a,src-b"
+
+    def test_unknown_parents_are_looked_up(self):
+        """Without parents, the current ones are fetched first."""
+        client = make_client()
+        files = client.drive_service.files.return_value
+        files.get.return_value.execute.return_value = {"parents": ["src"]}
+
+        client.move_file("file-1", "dest")
+
+        assert files.update.call_args.kwargs["removeParents"] == "src"
+
+
+class TestCreateSheet:
+    """Tests for creating a spreadsheet with initial data."""
+
+    def setup_method(self):
+        self.client = make_client()
+        self.spreadsheets = self.client.sheets_service.spreadsheets.return_value
+        self.spreadsheets.create.return_value.execute.return_value = {
+            "spreadsheetId": "s-1"
+        }
+
+    def test_data_is_written_as_user_entered(self):
+        """The sheet is created via Sheets and rows are parsed as if typed."""
+        data = [["Item", "Cost"], ["Rent", "$1,200"], ["Due", "2024-01-01"]]
+
+        result = self.client.create_sheet("Budget", data)
+
+        assert result == "Sheet created successfully. ID: s-1"
+        self.client.drive_service.files.assert_not_called()
+        assert self.spreadsheets.create.call_args.kwargs["body"] == {
+            "properties": {"title": "Budget"}
+        }
+        self.spreadsheets.values.return_value.update.assert_called_once_with(
+            spreadsheetId="s-1",
+            range="A1",
+            valueInputOption="USER_ENTERED",
+            body={"values": data},
+        )
+
+    def test_empty_data_skips_the_write(self):
+        """Without data only the spreadsheet is created."""
+        self.client.create_sheet("Empty", [])
+
+        self.spreadsheets.values.assert_not_called()
+
+
+class TestFormatSheetRange:
+    """Tests for range formatting requests."""
+
+    def cell_format(self, **kwargs):
+        client = make_client()
+        client.format_sheet_range("s-1", 0, 0, 1, 0, 1, **kwargs)
+        batch_update = client.sheets_service.spreadsheets.return_value.batchUpdate
+        request = batch_update.call_args.kwargs["body"]["requests"][0]
+        return request["repeatCell"]["cell"]["userEnteredFormat"]
+
+    def test_hex_color_is_converted(self):
+        """Each hex channel becomes a 0..1 float."""
+        assert self.cell_format(background_color="#FF8000")["backgroundColor"] == {
+            "red": 1.0,
+            "green": 128 / 255.0,
+            "blue": 0.0,
+        }
+
+    def test_rgb_tuple_is_used_as_is(self):
+        """Pre-converted colors skip parsing."""
+        color = self.cell_format(background_color=(0.5, 0.25, 0.0))
+        assert color["backgroundColor"] == {"red": 0.5, "green": 0.25, "blue": 0.0}
+
+    def test_malformed_hex_is_rejected(self):
+        """Colors that are not six hex digits raise ValueError."""
+        with pytest.raises(ValueError):
+            self.cell_format(background_color="#FFF")
+
+
+class TestSheetsBatch:
+    """Tests for coalescing sheet edits into one batchUpdate."""
+
+    def test_queued_edits_are_sent_together(self):
+        """Edits made inside the block go out as a single request."""
+        client = make_client()
+        batch_update = client.sheets_service.spreadsheets.return_value.batchUpdate
+        batch_update.return_value.execute.return_value = {
+            "replies": [{"addSheet": {"properties": {"sheetId": 7}}}, {}, {}]
+        }
+
+        with client.sheets_batch("s-1") as batch:
+            assert client.add_sheet_tab("s-1", "Totals", batch=batch) == (
+                "Queued tab 'Totals'."
+            )
+            client.format_sheet_range("s-1", 7, 0, 1, 0, 3, bold=True, batch=batch)
+            client.protect_sheet_range("s-1", 7, 0, 1, 0, 3, batch=batch)
+            batch_update.assert_not_called()
+
+        batch_update.assert_called_once()
+        requests = batch_update.call_args.kwargs["body"]["requests"]
+        assert [next(iter(r)) for r in requests] == [
+            "addSheet",
+            "repeatCell",
+            "addProtectedRange",
+        ]
+        assert batch.replies[0]["addSheet"]["properties"]["sheetId"] == 7
+
+    def test_nothing_is_sent_when_the_block_fails(self):
+        """An exception inside the block discards the queued edits."""
+        client = make_client()
+        batch_update = client.sheets_service.spreadsheets.return_value.batchUpdate
+
+        with pytest.raises(RuntimeError):
+            with client.sheets_batch("s-1") as batch:
+                client.insert_sheet_rows("s-1", 0, 0, 2, batch=batch)
+                raise RuntimeError("stop")
+
+        batch_update.assert_not_called()
+
+    def test_batch_for_another_spreadsheet_is_rejected(self):
+        """Requests cannot be queued against a different spreadsheet."""
+        client = make_client()
+
+        with client.sheets_batch("s-1") as batch:
+            with pytest.raises(ValueError):
+                client.insert_sheet_rows("s-2", 0, 0, 2, batch=batch)
+
+
+class TestUploadFile:
+    """Tests for choosing the upload mode by file size."""
+
+    def upload(self, path):
+        client = make_client()
+        files = client.drive_service.files.return_value
+        files.create.return_value.execute.return_value = {"id": "file-1"}
+        client.upload_file(str(path), chunksize=256 * 1024)
+        return files.create.call_args.kwargs["media_body"]
+
+    def test_small_file_is_sent_in_one_request(self, tmp_path):
+        """Small files skip the resumable session."""
+        path = tmp_path / "notes.txt"
+        path.write_text("hello")
+
+        media = self.upload(path)
+
+        assert not media.resumable()
+        assert media.mimetype() == "text/plain"
+
+    def test_large_file_is_resumable(self, tmp_path):
+        """Files at the threshold upload in chunks of the requested size."""
+        path = tmp_path / "data.bin"
+        path.write_bytes(b"\0" * (5 * 1024 * 1024))
+
+        media = self.upload(path)
+
+        assert media.resumable()
+        assert media.chunksize() == 256 * 1024
+
+
+class TestRevokeAccess:
+    """Tests for removing a single user's access."""
+
+    def setup_method(self):
+        self.client = make_client()
+        self.permissions = self.client.drive_service.permissions.return_value
+
+    def test_shared_permission_is_revoked_without_listing(self):
+        """The ID returned when sharing is reused to revoke."""
+        self.permissions.create.return_value.execute.return_value = {"id": "perm-1"}
+        self.client.share_file("file-1", "u@example.com")
+
+        self.client.revoke_access("file-1", "u@example.com")
+
+        self.permissions.list.assert_not_called()
+        self.permissions.delete.assert_called_once_with(
+            fileId="file-1", permissionId="perm-1"
+        )
+
+    def test_lookup_stops_at_the_matching_page(self):
+        """Pages are requested until the user's permission is found."""
+        self.permissions.list.return_value.execute.side_effect = [
+            {"permissions": [{"id": "other", "emailAddress": "x@example.com"}],
+             "nextPageToken": "next"},
+            {"permissions": [{"id": "perm-1", "emailAddress": "u@example.com"}],
+             "nextPageToken": "more"},
+        ]
+
+        assert self.client.revoke_access("file-1", "u@example.com") == (
+            "Revoked access for u@example.com"
+        )
+        assert self.permissions.list.call_args.kwargs["pageToken"] == "next"
+        self.permissions.delete.assert_called_once_with(
+            fileId="file-1", permissionId="perm-1"
+        )
+
+    def test_stale_cached_permission_falls_back_to_lookup(self):
+        """A cached ID that no longer exists is looked up again."""
+        from googleapiclient.errors import HttpError
+
+        self.client._permission_ids[("file-1", "u@example.com")] = "gone"
+        self.permissions.delete.return_value.execute.side_effect = [
+            HttpError(MagicMock(status=404), b""),
+            {},
+        ]
+        self.permissions.list.return_value.execute.return_value = {
+            "permissions": [{"id": "perm-1", "emailAddress": "u@example.com"}]
+        }
+
+        self.client.revoke_access("file-1", "u@example.com")
+
+        assert self.permissions.delete.call_args.kwargs["permissionId"] == "perm-1"
+
+
+class TestBatchedSharing:
+    """Tests for sharing changes sent as batch requests."""
+
+    def setup_method(self):
+        self.client = make_client()
+        self.batches = []
+        self.permissions = self.client.drive_service.permissions.return_value
+
+        def new_batch(callback):
+            self.batches.append(FakeBatch(callback, lambda request: request()))
+            return self.batches[-1]
+
+        self.client.drive_service.new_batch_http_request.side_effect = new_batch
+
+    def test_share_files_bulk_reports_per_file_errors(self):
+        """All shares go in one batch; a failure is returned for its file."""
+        def denied():
+            raise RuntimeError("denied")
+
+        def create(fileId, body, sendNotificationEmail):
+            return denied if fileId == "bad" else lambda: {"id": f"perm-{fileId}"}
+
+        self.permissions.create.side_effect = create
+
+        errors = self.client.share_files_bulk(["a", "bad", "b"], "u@example.com")
+
+        assert [str(e) if e else None for e in errors] == [None, "denied", None]
+        assert len(self.batches) == 1
+        assert self.client._permission_ids == {
+            ("a", "u@example.com"): "perm-a",
+            ("b", "u@example.com"): "perm-b",
+        }
+
+    def test_revoke_access_bulk_lists_then_deletes(self):
+        """Permissions are listed in one batch and deleted in another."""
+        self.permissions.list.side_effect = lambda fileId, fields: lambda: {
+            "permissions": [{"id": f"p-{fileId}", "emailAddress": "u@example.com"}]
+            if fileId != "none"
+            else []
+        }
+        self.permissions.delete.side_effect = lambda fileId, permissionId: lambda: {}
+
+        errors = self.client.revoke_access_bulk(["a", "none"], "u@example.com")
+
+        assert errors[0] is None
+        assert isinstance(errors[1], LookupError)
+        assert [len(batch.requests) for batch in self.batches] == [2, 1]
+        self.permissions.delete.assert_called_once_with(fileId="a", permissionId="p-a")
+
+    def test_make_file_public_uses_one_batch(self):
+        """Creating the permission and fetching the link share a batch."""
+        self.permissions.create.side_effect = lambda fileId, body: lambda: {}
+        self.client.drive_service.files.return_value.get.side_effect = (
+            lambda fileId, fields: lambda: {"webViewLink": "https://link"}
+        )
+
+        assert self.client.make_file_public("a") == "Public link: https://link"
+        assert len(self.batches) == 1
+
+
+class TestBatchGetSnippets:
+    """Tests for concurrent snippet downloads."""
+
+    def setup_method(self):
+        import httpx
+
+        self.requests = []
+
+        def handler(request):
+            self.requests.append(request)
+            if request.url.path.endswith("/broken/export"):
+                return httpx.Response(500)
+            if request.url.path.endswith("/export"):
+                return httpx.Response(200, content="line one\r\nline\ttwo".encode())
+            return httpx.Response(
+                200, json={"mimeType": "application/vnd.google-apps.document"}
+            )
+
+        self.handler = handler
+        transport = httpx.MockTransport(lambda request: self.handler(request))
+        real_client = httpx.AsyncClient
+        self.patch = patch(
+            "httpx.AsyncClient",
+            lambda **kwargs: real_client(transport=transport, **kwargs),
+        )
+        self.patch.start()
+        self.client = make_client()
+        self.client.creds.token = "token"
+
+    def teardown_method(self):
+        self.patch.stop()
+
+    def test_snippets_are_exported_with_the_bearer_token(self):
+        """Each file is exported once; failures yield an empty snippet."""
+        files = [
+            {"id": "doc", "mimeType": "application/vnd.google-apps.document"},
+            {"id": "unknown"},
+            {"id": "broken", "mimeType": "application/vnd.google-apps.spreadsheet"},
+            {"id": "pdf", "mimeType": "application/pdf"},
+        ]
+
+        snippets = self.client.batch_get_snippets(files)
+
+        assert snippets == {
+            "doc": "line one  line two",
+            "unknown": "line one  line two",
+            "broken": "",
+            "pdf": "[UNSUPPORTED MIME TYPE: application/pdf]",
+        }
+        assert {r.headers["authorization"] for r in self.requests} == {"Bearer token"}
+        assert len(self.requests) == 4
+
+    def test_expired_token_is_refreshed_outside_the_event_loop(self):
+        """The blocking refresh runs before the event loop is started."""
+        self.client.creds.valid = False
+
+        def refresh(creds):
+            with pytest.raises(RuntimeError):
+                asyncio.get_running_loop()
+            creds.valid = True
+
+        with patch(
+            "drive_synapsis.client.search.refresh_credentials", side_effect=refresh
+        ) as refresh_credentials:
+            self.client.batch_get_snippets(
+                [{"id": "doc", "mimeType": "application/vnd.google-apps.document"}]
+            )
+
+        refresh_credentials.assert_called_once_with(self.client.creds)
+
+    def test_works_from_inside_a_running_event_loop(self):
+        """The sync wrapper can be called from async code."""
+        async def call():
+            return self.client.batch_get_snippets(
+                [{"id": "doc", "mimeType": "application/vnd.google-apps.document"}]
+            )
+
+        assert asyncio.run(call()) == {"doc": "line one  line two"}
+
+    def test_long_exports_are_truncated_while_streaming(self):
+        """Only a prefix of a long export is read, and the snippet is marked."""
+        import httpx
+
+        read = []
+
+        async def body():
+            for _ in range(100):
+                read.append(1)
+                yield ("é" * 50).encode()
+
+        def handler(request):
+            if not request.url.path.endswith("/export"):
+                return httpx.Response(
+                    200, json={"mimeType": "application/vnd.google-apps.document"}
+                )
+            return httpx.Response(200, content=body())
+
+        self.handler = handler
+        snippets = self.client.batch_get_snippets([{"id": "doc"}], length=10)
+
+        assert snippets == {"doc": "é" * 10 + "..."}
+        assert len(read) < 100
+
+
+class TestGetFileSnippet:
+    """Tests for the single-file snippet path."""
+
+    def setup_method(self):
+        self.client = make_client()
+        self.files = self.client.drive_service.files.return_value
+
+    def test_export_is_read_through_the_drive_service(self):
+        """One file uses the sync service, not the async pipeline."""
+        self.files.get.return_value.execute.return_value = {
+            "mimeType": "application/vnd.google-apps.document"
+        }
+        self.files.export_media.return_value.execute.return_value = (
+            "line one\r\nline\ttwo " + "é" * 50
+        ).encode()
+
+        with patch.object(GDriveClient, "batch_get_snippets") as batch:
+            snippet = self.client.get_file_snippet("doc", length=20)
+
+        batch.assert_not_called()
+        assert snippet == "line one  line two é..."
+        self.files.export_media.assert_called_once_with(
+            fileId="doc", mimeType="text/markdown"
+        )
+
+    def test_unsupported_type_skips_export(self):
+        """Files that cannot be exported as text are labelled."""
+        self.files.get.return_value.execute.return_value = {"mimeType": "application/pdf"}
+
+        snippet = self.client.get_file_snippet("pdf")
+
+        assert snippet == "[UNSUPPORTED MIME TYPE: application/pdf]"
+        self.files.export_media.assert_not_called()
+
+    def test_errors_yield_an_empty_snippet(self):
+        """A failed request gives an empty snippet, as in the batch path."""
+        self.files.get.return_value.execute.side_effect = RuntimeError("boom")
+
+        assert self.client.get_file_snippet("doc") == ""
+
+
+class TestListFolderContents:
+    """Tests for paging through a folder's children."""
+
+    def test_pages_are_followed_at_maximum_size(self):
+        """All pages are collected, each requested with pageSize=1000."""
+        client = make_client()
+        files = client.drive_service.files.return_value
+        files.list.return_value.execute.side_effect = [
+            {"files": [{"id": "a"}], "nextPageToken": "next"},
+            {"files": [{"id": "b"}]},
+        ]
+
+        items = client.list_folder_contents("folder", fields="id")
+
+        assert items == [{"id": "a"}, {"id": "b"}]
+        assert files.list.call_args.kwargs["pageSize"] == 1000
+        assert files.list.call_args.kwargs["fields"] == "nextPageToken, files(id)"
+
+
+class TestSearchFilesAdvanced:
+    """Tests for building advanced search queries."""
+
+    def query_for(self, **kwargs):
+        client = make_client()
+        files = client.drive_service.files.return_value
+        files.list.return_value.execute.return_value = {"files": []}
+        client.search_files_advanced("plan", **kwargs)
+        return files.list.call_args.kwargs["q"]
+
+    def test_file_type_adds_mime_clause(self):
+        """Known types filter by exact MIME type, images by prefix."""
+        assert "mimeType = 'application/vnd.google-apps.document'" in self.query_for(
+            file_type="doc"
+        )
+        assert "mimeType contains 'image/'" in self.query_for(file_type="image")
+
+    def test_unknown_file_type_is_ignored(self):
+        """An unrecognised type does not restrict the search."""
+        assert "mimeType" not in self.query_for(file_type="video")
+
+    def test_quotes_in_query_are_escaped(self):
+        """User text cannot terminate the quoted literal early."""
+        client = make_client()
+        files = client.drive_service.files.return_value
+        files.list.return_value.execute.return_value = {"files": []}
+        client.search_files("O'Brien \\ notes")
+
+        assert "name contains 'O\\'Brien \\\\ notes'" in files.list.call_args.kwargs["q"]
+
+    def test_equal_filters_build_identical_queries(self):
+        """Clause order is fixed regardless of which filters are set."""
+        assert self.query_for(owner="me", file_type="doc") == (
+            "(name contains 'plan' or fullText contains 'plan') and "
+            "mimeType = 'application/vnd.google-apps.document' and "
+            "'me' in owners and trashed = false"
+        )
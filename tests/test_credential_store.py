@@ -0,0 +1,124 @@
+"""Unit tests for the local credential store."""
+
+import sys
+import os
+import shutil
+import tempfile
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../src"))
+
+from google.oauth2.credentials import Credentials
+
+from drive_synapsis.auth.credential_store import (
+    LocalDirectoryCredentialStore,
+    _parse_expiry,
+)
+
+
+def make_credentials(token: str = "access-token") -> Credentials:
+    return Credentials(
+        token=token,
+        refresh_token="refresh-token",
+        token_uri="https://oauth2.googleapis.com/token",
+        client_id="client-id",
+        client_secret="client-secret",
+        scopes=["https://www.googleapis.com/auth/drive"],
+        expiry=datetime(2030, 1, 1, 12, 0, 0),
+    )
+
+
+class TestLocalDirectoryCredentialStore:
+    """Tests for LocalDirectoryCredentialStore."""
+
+    def setup_method(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.store = LocalDirectoryCredentialStore(self.temp_dir)
+
+    def teardown_method(self):
+        if os.path.exists(self.temp_dir):
+            shutil.rmtree(self.temp_dir)
+
+    def test_round_trip(self):
+        """Stored credentials can be loaded back unchanged."""
+        assert self.store.store_credential("john_doe@example.com", make_credentials())
+
+        loaded = self.store.get_credential("john_doe@example.com")
+
+        assert loaded is not None
+        assert loaded.token == "access-token"
+        assert loaded.refresh_token == "refresh-token"
+        assert loaded.scopes == ["https://www.googleapis.com/auth/drive"]
+        assert loaded.expiry == datetime(2030, 1, 1, 12, 0, 0)
+
+    def test_missing_user_returns_none(self):
+        """Unknown users have no credentials."""
+        assert self.store.get_credential("nobody@example.com") is None
+
+    def test_repeated_reads_are_cached(self):
+        """Warm lookups return the cached Credentials object."""
+        self.store.store_credential("user@example.com", make_credentials())
+
+        first = self.store.get_credential("user@example.com")
+        second = self.store.get_credential("user@example.com")
+
+        assert first is second
+
+    def test_store_invalidates_cache(self):
+        """Re-storing credentials is visible to the next read."""
+        self.store.store_credential("user@example.com", make_credentials("old"))
+        assert self.store.get_credential("user@example.com").token == "old"
+
+        self.store.store_credential("user@example.com", make_credentials("new"))
+
+        assert self.store.get_credential("user@example.com").token == "new"
+
+    def test_delete_removes_credentials(self):
+        """Deleted credentials are no longer returned."""
+        self.store.store_credential("user@example.com", make_credentials())
+        self.store.get_credential("user@example.com")
+
+        assert self.store.delete_credential("user@example.com")
+
+        assert self.store.get_credential("user@example.com") is None
+        assert self.store.list_users() == []
+
+    def test_legacy_base64_files_are_migrated(self):
+        """Files named with the old base64 scheme are renamed on startup."""
+        self.store.store_credential("john_doe@example.com", make_credentials())
+        current_name = os.listdir(self.temp_dir)[0]
+        legacy_name = "am9obl9kb2VAZXhhbXBsZS5jb20.json"
+        os.rename(
+            os.path.join(self.temp_dir, current_name),
+            os.path.join(self.temp_dir, legacy_name),
+        )
+
+        store = LocalDirectoryCredentialStore(self.temp_dir)
+
+        assert os.listdir(self.temp_dir) == [current_name]
+        assert store.list_users() == ["john_doe@example.com"]
+        assert store.get_credential("john_doe@example.com").token == "access-token"
+
+    def test_list_users_decodes_filenames(self):
+        """list_users returns the original, sorted email addresses."""
+        self.store.store_credential("b_user@example.com", make_credentials())
+        self.store.store_credential("a.user@example.com", make_credentials())
+
+        assert self.store.list_users() == ["a.user@example.com", "b_user@example.com"]
+
+
+class TestParseExpiry:
+    """Tests for stored expiry parsing."""
+
+    def test_fixed_layout(self):
+        assert _parse_expiry("2030-01-01T12:30:45") == datetime(2030, 1, 1, 12, 30, 45)
+
+    def test_fixed_layout_with_microseconds(self):
+        assert _parse_expiry("2030-01-01T12:30:45.000123") == datetime(
+            2030, 1, 1, 12, 30, 45, 123
+        )
+
+    def test_timezone_suffix_is_dropped(self):
+        parsed = _parse_expiry("2030-01-01T12:30:45+00:00")
+        assert parsed == datetime(2030, 1, 1, 12, 30, 45)
+        assert parsed.tzinfo is None
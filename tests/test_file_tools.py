@@ -0,0 +1,62 @@
+"""Unit tests for file_tools module."""
+
+import sys
+import os
+from unittest.mock import Mock, patch
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../src"))
+
+from googleapiclient.errors import HttpError
+
+from drive_synapsis.server import file_tools
+
+
+class TestMoveAliasedFile:
+    """Tests for moves that reuse parents from a search result."""
+
+    def setup_method(self):
+        self.client = Mock()
+        self.search_manager = Mock()
+        self.search_manager.get_parents.return_value = ["old-folder"]
+        self.patches = [
+            patch.object(file_tools, "get_client", return_value=self.client),
+            patch.object(file_tools, "search_manager", self.search_manager),
+        ]
+        for p in self.patches:
+            p.start()
+
+    def teardown_method(self):
+        for p in self.patches:
+            p.stop()
+
+    def test_cached_parents_are_used(self):
+        """A fresh cache moves the file in one call."""
+        self.client.move_file.return_value = "Moved"
+
+        assert file_tools._move_aliased_file("A", "file-1", "dest") == "Moved"
+
+        self.client.move_file.assert_called_once_with("file-1", "dest", ["old-folder"])
+        self.search_manager.set_parents.assert_called_once_with("A", ["dest"])
+
+    def test_stale_parents_fall_back_to_lookup(self):
+        """A rejected move is retried with the parents looked up again."""
+        self.client.move_file.side_effect = [
+            HttpError(Mock(status=403), b"Increasing the number of parents is not allowed"),
+            "Moved",
+        ]
+
+        assert file_tools._move_aliased_file("A", "file-1", "dest") == "Moved"
+
+        assert self.client.move_file.call_args.args == ("file-1", "dest")
+        self.search_manager.set_parents.assert_called_once_with("A", ["dest"])
+
+    def test_other_errors_are_not_retried(self):
+        """Errors unrelated to stale parents propagate."""
+        self.client.move_file.side_effect = HttpError(Mock(status=404), b"")
+
+        with pytest.raises(HttpError):
+            file_tools._move_aliased_file("A", "file-1", "dest")
+
+        self.client.move_file.assert_called_once()
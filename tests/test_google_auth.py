@@ -0,0 +1,206 @@
+"""Unit tests for google_auth credential resolution."""
+
+import sys
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+from unittest.mock import Mock, patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../src"))
+
+from google.oauth2.credentials import Credentials
+
+from drive_synapsis.auth import google_auth
+
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def make_credentials(expires_in: timedelta) -> Credentials:
+    return Credentials(
+        token="access-token",
+        refresh_token="refresh-token",
+        token_uri="https://oauth2.googleapis.com/token",
+        client_id="client-id",
+        client_secret="client-secret",
+        scopes=list(google_auth.SCOPES),
+        expiry=utcnow() + expires_in,
+    )
+
+
+class TestIsStale:
+    """Tests for the pre-emptive refresh window check."""
+
+    def test_far_from_expiry_is_fresh(self):
+        assert not google_auth._is_stale(make_credentials(timedelta(hours=1)))
+
+    def test_close_to_expiry_is_stale(self):
+        assert google_auth._is_stale(make_credentials(timedelta(minutes=5)))
+
+    def test_no_expiry_is_fresh(self):
+        credentials = make_credentials(timedelta(hours=1))
+        credentials.expiry = None
+        assert not google_auth._is_stale(credentials)
+
+
+class TestPreemptiveRefresh:
+    """Tests for background refresh of stale credentials."""
+
+    def setup_method(self):
+        self.session_store = Mock()
+        self.credential_store = Mock()
+        self.patches = [
+            patch.object(
+                google_auth,
+                "get_oauth21_session_store",
+                return_value=self.session_store,
+            ),
+            patch.object(
+                google_auth,
+                "get_credential_store",
+                return_value=self.credential_store,
+            ),
+        ]
+        for p in self.patches:
+            p.start()
+
+    def teardown_method(self):
+        for p in self.patches:
+            p.stop()
+        google_auth._refresh_futures.clear()
+        google_auth._refresh_locks.clear()
+
+    def test_stale_credentials_are_returned_and_refreshed_once(self):
+        """Stale tokens are served immediately with a single background refresh."""
+        credentials = make_credentials(timedelta(minutes=5))
+        self.session_store.get_credentials.return_value = credentials
+
+        release = threading.Event()
+        refresh = Mock(side_effect=lambda *args: release.wait(5))
+
+        with patch.object(google_auth, "_refresh_and_store", refresh):
+            first = google_auth.get_credentials(user_email="user@example.com")
+            second = google_auth.get_credentials(user_email="user@example.com")
+            future = google_auth._get_inflight_refresh("user@example.com")
+            release.set()
+            future.result(timeout=5)
+
+        assert first is credentials
+        assert second is credentials
+        refresh.assert_called_once_with(credentials, "user@example.com", None)
+
+    def test_fresh_credentials_skip_refresh(self):
+        """Tokens far from expiry are returned without scheduling a refresh."""
+        credentials = make_credentials(timedelta(hours=1))
+        self.session_store.get_credentials.return_value = credentials
+
+        with patch.object(google_auth, "_refresh_and_store") as refresh:
+            result = google_auth.get_credentials(user_email="user@example.com")
+
+        assert result is credentials
+        refresh.assert_not_called()
+
+    def test_concurrent_expired_lookups_refresh_once(self):
+        """Only one of several callers with an expired token refreshes it."""
+        expired = make_credentials(timedelta(minutes=-5))
+        refreshed = make_credentials(timedelta(hours=1))
+        self.session_store.get_credentials.return_value = expired
+
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow_refresh(*args):
+            started.set()
+            release.wait(5)
+            self.session_store.get_credentials.return_value = refreshed
+            return refreshed
+
+        refresh = Mock(side_effect=slow_refresh)
+        results = []
+
+        def lookup():
+            results.append(google_auth.get_credentials(user_email="user@example.com"))
+
+        with patch.object(google_auth, "_refresh_and_store", refresh):
+            first = threading.Thread(target=lookup)
+            first.start()
+            started.wait(5)
+            second = threading.Thread(target=lookup)
+            second.start()
+            release.set()
+            first.join(5)
+            second.join(5)
+
+        assert results == [refreshed, refreshed]
+        refresh.assert_called_once_with(expired, "user@example.com", None)
+
+
+class TestPersistRefreshed:
+    """Tests for coalesced credential writes after refresh."""
+
+    def test_pending_writes_are_coalesced(self):
+        """Only the latest credentials are written when refreshes pile up."""
+        credential_store = Mock()
+        executor = Mock()
+        older = make_credentials(timedelta(hours=1))
+        newer = make_credentials(timedelta(hours=1))
+
+        with (
+            patch.object(google_auth, "_refresh_executor", executor),
+            patch.object(
+                google_auth, "get_credential_store", return_value=credential_store
+            ),
+        ):
+            google_auth._persist_refreshed(older, "user@example.com")
+            google_auth._persist_refreshed(newer, "user@example.com")
+            google_auth._flush_persist("user@example.com")
+
+        executor.submit.assert_called_once_with(
+            google_auth._flush_persist, "user@example.com"
+        )
+        credential_store.store_credential.assert_called_once_with(
+            "user@example.com", newer
+        )
+
+
+class TestClientSecretsFromEnv:
+    """Tests for client secrets supplied through the environment."""
+
+    def teardown_method(self):
+        google_auth._invalidate_env_cache()
+
+    def test_rotated_secret_file_is_picked_up(self, tmp_path):
+        """A mounted secret that changes on disk is re-read."""
+        secret_file = tmp_path / "client_secret"
+        secret_file.write_text("old-secret\n")
+        env = {
+            "GOOGLE_OAUTH_CLIENT_ID": "client-id",
+            "GOOGLE_OAUTH_CLIENT_SECRET": "",
+            "GOOGLE_OAUTH_CLIENT_SECRET_FILE": str(secret_file),
+        }
+
+        with patch.dict(os.environ, env):
+            first = google_auth.load_client_secrets_from_env()
+            assert google_auth.load_client_secrets_from_env() is first
+
+            secret_file.write_text("new-secret\n")
+            stat = secret_file.stat()
+            os.utime(secret_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+            second = google_auth.load_client_secrets_from_env()
+
+        assert first["web"]["client_secret"] == "old-secret"
+        assert second["web"]["client_secret"] == "new-secret"
+
+    def test_secrets_set_after_a_miss_are_found(self):
+        """A missing secret is not remembered."""
+        unset = {"GOOGLE_OAUTH_CLIENT_ID": "", "GOOGLE_OAUTH_CLIENT_SECRET": ""}
+        with patch.dict(os.environ, unset):
+            assert google_auth.load_client_secrets_from_env() is None
+
+        env = {
+            "GOOGLE_OAUTH_CLIENT_ID": "client-id",
+            "GOOGLE_OAUTH_CLIENT_SECRET": "secret",
+        }
+        with patch.dict(os.environ, env):
+            assert google_auth.load_client_secrets_from_env() is not None
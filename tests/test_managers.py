@@ -87,6 +87,22 @@ class TestSearchManager:
         manager.cache_results([{'id': 'new_file'}])
         assert manager.search_cache['A'] == 'new_file'
 
+    def test_parents_are_tracked_per_alias(self):
+        """Parents from search results are known until a move updates them."""
+        manager = SearchManager()
+        manager.cache_results([
+            {'id': 'file1', 'name': 'One', 'parents': ['folder1']},
+            {'id': 'file2', 'name': 'Two'},
+        ])
+        
+        assert manager.get_parents('a') == ['folder1']
+        assert manager.get_parents('B') is None
+        assert manager.get_parents('file1') is None
+        
+        manager.set_parents('A', ['folder2'])
+        
+        assert manager.get_parents('A') == ['folder2']
+
 
 class TestSyncManager:
     """Tests for SyncManager class."""
@@ -0,0 +1,63 @@
+"""Unit tests for the minimal OAuth callback server."""
+
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../src"))
+
+from starlette.testclient import TestClient
+
+from drive_synapsis.auth.oauth_callback_server import (
+    MinimalOAuthServer,
+    find_available_port,
+)
+
+
+class TestOAuthCallbackRoute:
+    """Tests for the /oauth2callback route."""
+
+    def setup_method(self):
+        self.server = MinimalOAuthServer(port=9877)
+        self.client = TestClient(self.server.app)
+
+    def test_google_error_is_reported(self):
+        """An error returned by Google renders the failure page."""
+        response = self.client.get("/oauth2callback?error=access_denied")
+
+        assert response.status_code == 400
+        assert "access_denied" in response.text
+
+    def test_missing_code_is_rejected(self):
+        """A callback without an authorization code is rejected."""
+        response = self.client.get("/oauth2callback?state=abc")
+
+        assert response.status_code == 400
+        assert "No authorization code" in response.text
+
+    def test_only_get_is_routed(self):
+        """The callback only answers GET requests."""
+        response = self.client.post("/oauth2callback")
+
+        assert response.status_code == 405
+
+    def test_error_text_is_html_escaped(self):
+        """Values echoed into the page cannot inject markup."""
+        response = self.client.get("/oauth2callback?error=<script>x</script>")
+
+        assert "<script>x</script>" not in response.text
+        assert "&lt;script&gt;x&lt;/script&gt;" in response.text
+
+
+class TestServerLifecycle:
+    """Tests for starting and stopping the callback server."""
+
+    def test_start_reports_listening_server(self):
+        """start() returns once uvicorn is accepting connections."""
+        server = MinimalOAuthServer(port=find_available_port())
+        try:
+            assert server.start() == (True, "")
+            assert server.is_running
+        finally:
+            server.stop()
+
+        assert not server.is_running
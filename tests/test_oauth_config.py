@@ -0,0 +1,60 @@
+"""Unit tests for OAuth configuration accessors."""
+
+import sys
+import os
+import shutil
+import tempfile
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../src"))
+
+from drive_synapsis.auth.oauth_config import OAuthConfig
+
+
+class TestOAuthConfig:
+    """Tests for cached filesystem and environment lookups."""
+
+    def setup_method(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.env = patch.dict(
+            os.environ,
+            {
+                "DRIVE_SYNAPSIS_CREDENTIALS_DIR": os.path.join(self.temp_dir, "creds"),
+                "GOOGLE_OAUTH_CLIENT_ID": "",
+                "GOOGLE_OAUTH_CLIENT_SECRET": "",
+            },
+        )
+        self.env.start()
+        self.config = OAuthConfig()
+
+    def teardown_method(self):
+        self.env.stop()
+        shutil.rmtree(self.temp_dir)
+
+    def test_client_secrets_added_after_startup_are_found(self):
+        """A missing client_secret.json is re-checked until it appears."""
+        assert not self.config.is_configured()
+
+        self.config.ensure_credentials_dir()
+        open(self.config.client_secrets_path, "w").close()
+
+        assert self.config.is_configured()
+        with patch("os.path.exists") as exists:
+            assert self.config.is_configured()
+        exists.assert_not_called()
+
+    def test_credentials_dir_is_created_once(self):
+        """The directory is created on first use only."""
+        with patch("os.makedirs") as makedirs:
+            self.config.ensure_credentials_dir()
+            self.config.ensure_credentials_dir()
+
+        makedirs.assert_called_once_with(self.config.credentials_dir, exist_ok=True)
+
+    def test_custom_redirect_uris_are_deduplicated(self):
+        """Custom redirect URIs are appended once, in order."""
+        custom = f"{self.config.redirect_uri}, http://example.com/cb"
+        with patch.dict(os.environ, {"DRIVE_SYNAPSIS_CUSTOM_REDIRECT_URIS": custom}):
+            uris = OAuthConfig().get_redirect_uris()
+
+        assert uris == [self.config.redirect_uri, "http://example.com/cb"]
@@ -0,0 +1,320 @@
+"""Unit tests for the OAuth 2.1 session store."""
+
+import sys
+import os
+import json
+import shutil
+import stat
+import tempfile
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../src"))
+
+from drive_synapsis.auth import oauth21_session_store
+from drive_synapsis.auth.oauth21_session_store import OAuth21SessionStore
+
+
+class TestOAuthStatePersistence:
+    """Tests for persisting pending OAuth states across restarts."""
+
+    def setup_method(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.env = patch.dict(
+            os.environ, {"DRIVE_SYNAPSIS_CREDENTIALS_DIR": self.temp_dir}
+        )
+        self.env.start()
+        self.states_path = os.path.join(self.temp_dir, "oauth_states.json")
+        self.wal_path = self.states_path + ".log"
+        self.stores = []
+
+    def teardown_method(self):
+        for store in self.stores:
+            store.close()
+        self.env.stop()
+        if os.path.exists(self.temp_dir):
+            shutil.rmtree(self.temp_dir)
+
+    def open_store(self):
+        store = OAuth21SessionStore()
+        self.stores.append(store)
+        return store
+
+    def test_stored_state_survives_restart(self):
+        """A pending state can be consumed by a new store instance."""
+        store = self.open_store()
+        store.store_oauth_state("state-1", code_verifier="verifier")
+        store.flush()
+
+        restarted = self.open_store()
+        state_info = restarted.validate_and_consume_oauth_state("state-1")
+
+        assert state_info["code_verifier"] == "verifier"
+
+    def test_consumed_state_is_not_restored(self):
+        """Consumed states stay consumed after a restart."""
+        store = self.open_store()
+        store.store_oauth_state("state-1")
+        store.flush()
+        store.validate_and_consume_oauth_state("state-1")
+        store.flush()
+
+        restarted = self.open_store()
+
+        assert restarted.get_stats()["pending_oauth_states"] == 0
+
+    def test_log_is_private(self):
+        """The log is readable by its owner only, even if it already existed."""
+        with open(self.wal_path, "wb"):
+            pass
+        os.chmod(self.wal_path, 0o644)
+
+        self.open_store()
+
+        assert stat.S_IMODE(os.stat(self.wal_path).st_mode) == 0o600
+
+    def test_deleted_credentials_dir_is_recreated(self):
+        """A store built after the directory vanished recreates it."""
+        self.open_store().close()
+        shutil.rmtree(self.temp_dir)
+
+        store = self.open_store()
+        store.store_oauth_state("state-1")
+        store.flush()
+
+        assert os.path.getsize(self.wal_path) > 0
+
+    def test_unopenable_log_keeps_states_in_memory(self):
+        """If the log cannot be opened, states still work without persistence."""
+        with patch.object(
+            oauth21_session_store.os, "open", side_effect=PermissionError("denied")
+        ):
+            store = self.open_store()
+            store.store_oauth_state("state-1", code_verifier="verifier")
+            store.flush()
+
+        assert store.validate_and_consume_oauth_state("state-1")["code_verifier"] == (
+            "verifier"
+        )
+
+    def test_mutations_append_to_log(self):
+        """State changes are appended to the log, not rewritten as a snapshot."""
+        store = self.open_store()
+        store.store_oauth_state("state-1")
+        store.store_oauth_state("state-2")
+        store.flush()
+
+        with open(self.wal_path, "rb") as f:
+            assert len(f.read().splitlines()) == 2
+        assert not os.path.exists(self.states_path)
+
+    def test_state_consumed_before_flush_is_never_written(self):
+        """An add followed by a consume within the flush window cancels out."""
+        store = self.open_store()
+        store.store_oauth_state("state-1")
+        store.validate_and_consume_oauth_state("state-1")
+        store.flush()
+
+        assert os.path.getsize(self.wal_path) == 0
+
+    def test_log_is_compacted_past_threshold(self):
+        """A long log is folded into the snapshot file and truncated."""
+        with patch.object(oauth21_session_store, "_WAL_COMPACT_THRESHOLD", 2):
+            store = self.open_store()
+            for i in range(3):
+                store.store_oauth_state(f"state-{i}")
+            store.flush()
+
+        assert os.path.getsize(self.wal_path) == 0
+        with open(self.states_path) as f:
+            assert sorted(json.load(f)) == ["state-0", "state-1", "state-2"]
+        assert self.open_store().get_stats()["pending_oauth_states"] == 3
+
+    def test_legacy_iso_timestamps_are_loaded(self):
+        """Snapshots written with ISO 8601 timestamps still load."""
+        now = datetime.now(timezone.utc)
+        with open(self.states_path, "w") as f:
+            json.dump(
+                {
+                    "state-1": {
+                        "session_id": None,
+                        "expires_at": (now + timedelta(minutes=5)).isoformat(),
+                        "created_at": now.isoformat(),
+                        "code_verifier": "verifier",
+                    }
+                },
+                f,
+            )
+
+        store = self.open_store()
+
+        state_info = store.validate_and_consume_oauth_state("state-1")
+        assert state_info["created_at"] == now
+
+    def test_torn_log_entry_is_skipped(self):
+        """A partially written trailing log line does not break loading."""
+        store = self.open_store()
+        store.store_oauth_state("state-1")
+        store.flush()
+        with open(self.wal_path, "ab") as f:
+            f.write(b'{"op": "add", "sta')
+
+        restarted = self.open_store()
+
+        assert restarted.get_stats()["pending_oauth_states"] == 1
+
+    def test_close_releases_log_and_exit_hook(self):
+        """Closing flushes pending states and unregisters the exit flush."""
+        store = self.open_store()
+        store.store_oauth_state("state-1")
+
+        with patch.object(oauth21_session_store.atexit, "unregister") as unregister:
+            store.close()
+
+        assert store._wal_fh.closed
+        unregister.assert_called_once_with(store.flush)
+        assert self.open_store().get_stats()["pending_oauth_states"] == 1
+
+    def test_reset_closes_global_store(self):
+        """Replacing the global store closes the previous one."""
+        with patch.object(oauth21_session_store, "_global_store", None):
+            first = oauth21_session_store.get_oauth21_session_store()
+            oauth21_session_store.reset_oauth21_session_store()
+
+            assert first._wal_fh.closed
+            second = oauth21_session_store.get_oauth21_session_store()
+            self.stores.append(second)
+            assert second is not first
+
+    def test_expired_states_are_dropped(self):
+        """Expired states are removed while live ones are kept."""
+        store = self.open_store()
+        store.store_oauth_state("expired", expires_in_seconds=0)
+        store.store_oauth_state("live")
+
+        assert store.get_stats()["pending_oauth_states"] == 1
+        with pytest.raises(ValueError):
+            store.validate_and_consume_oauth_state("expired")
+        assert store.validate_and_consume_oauth_state("live") is not None
+
+    def write_expired_snapshot(self, *states):
+        expired = datetime.now(timezone.utc) - timedelta(minutes=1)
+        with open(self.states_path, "w") as f:
+            json.dump(
+                {
+                    state: {
+                        "session_id": None,
+                        "expires_at": expired.isoformat(),
+                        "created_at": expired.isoformat(),
+                    }
+                    for state in states
+                },
+                f,
+            )
+
+    def test_expiry_batch_size_limits_cleanup(self):
+        """Expired states beyond the batch size are kept but still rejected."""
+        self.write_expired_snapshot("expired-1", "expired-2")
+
+        with patch.dict(os.environ, {"DRIVE_SYNAPSIS_EXPIRY_BATCH_SIZE": "1"}):
+            store = self.open_store()
+
+        assert store.get_stats()["pending_oauth_states"] == 1
+        for state in ("expired-1", "expired-2"):
+            with pytest.raises(ValueError):
+                store.validate_and_consume_oauth_state(state)
+
+    def test_invalid_expiry_batch_size_falls_back(self):
+        """Unparseable values use the default instead of breaking the store."""
+        self.write_expired_snapshot("expired-1", "expired-2")
+
+        for raw in ("", "lots"):
+            with patch.dict(os.environ, {"DRIVE_SYNAPSIS_EXPIRY_BATCH_SIZE": raw}):
+                store = self.open_store()
+            assert store.get_stats()["pending_oauth_states"] == 0
+
+    def test_non_positive_expiry_batch_size_still_cleans_up(self):
+        """Zero or negative batch sizes are clamped so cleanup makes progress."""
+        self.write_expired_snapshot("expired-1", "expired-2")
+
+        with patch.dict(os.environ, {"DRIVE_SYNAPSIS_EXPIRY_BATCH_SIZE": "-5"}):
+            store = self.open_store()
+
+        assert store.get_stats()["pending_oauth_states"] == 1
+
+class TestSessions:
+    """Tests for in-memory OAuth sessions."""
+
+    def setup_method(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.env = patch.dict(
+            os.environ, {"DRIVE_SYNAPSIS_CREDENTIALS_DIR": self.temp_dir}
+        )
+        self.env.start()
+        self.store = OAuth21SessionStore()
+
+    def teardown_method(self):
+        self.store.close()
+        self.env.stop()
+        if os.path.exists(self.temp_dir):
+            shutil.rmtree(self.temp_dir)
+
+    def test_stored_session_yields_credentials(self):
+        """Stored tokens come back as Credentials, with expiry made naive UTC."""
+        expiry = datetime(2030, 1, 1, 12, 0, tzinfo=timezone.utc)
+        self.store.store_session(
+            user_email="user@example.com",
+            access_token="access-token",
+            refresh_token="refresh-token",
+            scopes=["scope-a"],
+            expiry=expiry,
+            session_id="session-1",
+        )
+
+        credentials = self.store.get_credentials_by_session("session-1")
+
+        assert credentials.token == "access-token"
+        assert credentials.refresh_token == "refresh-token"
+        assert credentials.scopes == ("scope-a",)
+        assert credentials.expiry == datetime(2030, 1, 1, 12, 0)
+
+    def test_remove_session_drops_mapping(self):
+        """Removing a user also forgets their session ID."""
+        self.store.store_session(
+            user_email="user@example.com",
+            access_token="access-token",
+            session_id="session-1",
+        )
+
+        self.store.remove_session("user@example.com")
+
+        assert not self.store.has_session("user@example.com")
+        assert self.store.get_user_by_session("session-1") is None
+
+    def test_sessions_share_scope_tuples(self):
+        """Sessions with the same scopes share one canonical tuple."""
+        for user in ("a@example.com", "b@example.com"):
+            self.store.store_session(
+                user_email=user,
+                access_token="access-token",
+                scopes=["scope-b", "scope-a"],
+            )
+
+        first = self.store.get_credentials("a@example.com")
+        second = self.store.get_credentials("b@example.com")
+
+        assert first.scopes == ("scope-a", "scope-b")
+        assert first.scopes is second.scopes
+
+    def test_credentials_are_reused_until_session_changes(self):
+        """Repeated lookups share one Credentials object until re-stored."""
+        self.store.store_session(user_email="user@example.com", access_token="old")
+        first = self.store.get_credentials("user@example.com")
+
+        assert self.store.get_credentials("user@example.com") is first
+
+        self.store.store_session(user_email="user@example.com", access_token="new")
+
+        assert self.store.get_credentials("user@example.com").token == "new"
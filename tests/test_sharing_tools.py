@@ -0,0 +1,50 @@
+"""Unit tests for sharing_tools module."""
+
+import sys
+import os
+from unittest.mock import Mock, patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../src"))
+
+from drive_synapsis.server import sharing_tools
+
+
+class TestBulkSharingTools:
+    """Tests for per-file error reporting in bulk sharing tools."""
+
+    def setup_method(self):
+        self.client = Mock()
+        self.search_manager = Mock()
+        self.search_manager.resolve_alias.side_effect = lambda fid: fid.lower()
+        self.patches = [
+            patch.object(sharing_tools, "get_client", return_value=self.client),
+            patch.object(sharing_tools, "search_manager", self.search_manager),
+        ]
+        for p in self.patches:
+            p.start()
+
+    def teardown_method(self):
+        for p in self.patches:
+            p.stop()
+
+    def test_bad_entry_in_bulk_share_fails_only_itself(self):
+        """A non-string ID is reported while the other files are shared."""
+        self.client.share_files_bulk.return_value = [None]
+
+        result = sharing_tools.bulk_share_files('[1, "A"]', "u@example.com")
+
+        self.client.share_files_bulk.assert_called_once_with(
+            ["a"], "u@example.com", "reader"
+        )
+        assert result.startswith("Shared 1/2 files")
+        assert "\n1: " in result
+
+    def test_bad_entry_in_bulk_revoke_fails_only_itself(self):
+        """Bulk revoke guards each entry the same way."""
+        self.client.revoke_access_bulk.return_value = [None]
+
+        result = sharing_tools.bulk_revoke_file_access('["A", 1]', "u@example.com")
+
+        self.client.revoke_access_bulk.assert_called_once_with(["a"], "u@example.com")
+        assert result.startswith("Revoked access for u@example.com on 1/2 files.")
+        assert "\n1: " in result